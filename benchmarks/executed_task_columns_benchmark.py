@@ -0,0 +1,66 @@
+"""ExecutedTaskColumnsによるタグごとの人時の集計の計測(タスクごとのループとの比較)
+
+実行例: python benchmarks/executed_task_columns_benchmark.py
+"""
+
+from datetime import datetime
+import random
+import time
+
+from notiontaskr.domain.executed_task import ExecutedTask
+from notiontaskr.domain.executed_task_columns import ExecutedTaskColumns
+from notiontaskr.domain.executed_tasks import ExecutedTasks
+from notiontaskr.domain.tags import Tags
+from notiontaskr.domain.task_name import TaskName
+from notiontaskr.domain.value_objects.man_hours import ManHours
+from notiontaskr.domain.value_objects.notion_date import NotionDate
+from notiontaskr.domain.value_objects.notion_id import NotionId
+from notiontaskr.domain.value_objects.page_id import PageId
+from notiontaskr.domain.value_objects.status import Status
+from notiontaskr.domain.value_objects.tag import Tag
+
+COUNT = 100_000
+ALL_TAGS = [Tag(f"tag{i}") for i in range(30)]
+
+
+def make_tasks(count: int) -> ExecutedTasks:
+    """タグを3つずつ持つ実績タスクの合成データを生成する"""
+    return ExecutedTasks.from_tasks(
+        [
+            ExecutedTask(
+                page_id=PageId(f"page_{i}"),
+                name=TaskName(f"タスク{i}"),
+                tags=Tags.from_tags(random.sample(ALL_TAGS, 3)),
+                id=NotionId(str(i)),
+                status=Status.COMPLETED,
+                man_hours=ManHours(random.random() * 3),
+                date=NotionDate(
+                    start=datetime(2025, random.randint(1, 12), random.randint(1, 28)),
+                    end=None,
+                ),
+            )
+            for i in range(count)
+        ]
+    )
+
+
+def main():
+    tasks = make_tasks(COUNT)
+
+    start = time.perf_counter()
+    _ = {
+        tag: t.get_total_man_hours()
+        for tag, t in tasks.get_tasks_by_tag(Tags.from_tags(ALL_TAGS)).items()
+    }
+    print(f"タスクごとのループ: {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    columns = ExecutedTaskColumns.from_tasks(tasks)
+    print(f"列の作成: {time.perf_counter() - start:.3f}s")
+    start = time.perf_counter()
+    _ = columns.sum_man_hours_by_tag(ALL_TAGS)
+    print(f"列での集計: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
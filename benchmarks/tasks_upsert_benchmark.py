@@ -0,0 +1,75 @@
+"""Tasks.upserted_by_idの計測(deepcopyしてから追加・更新する場合、1件ずつ追加・更新する場合との比較)
+
+実行例: python benchmarks/tasks_upsert_benchmark.py
+"""
+
+import copy
+import time
+
+COUNTS = (10_000, 100_000)
+
+from notiontaskr.domain.executed_task import ExecutedTask
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.domain.scheduled_tasks import ScheduledTasks
+from notiontaskr.domain.tags import Tags
+from notiontaskr.domain.task_name import TaskName
+from notiontaskr.domain.value_objects.notion_id import NotionId
+from notiontaskr.domain.value_objects.page_id import PageId
+from notiontaskr.domain.value_objects.status import Status
+from notiontaskr.domain.value_objects.tag import Tag
+
+
+def make_task(number: int) -> ScheduledTask:
+    task = ScheduledTask(
+        page_id=PageId(f"page_{number}"),
+        name=TaskName(f"タスク{number}"),
+        tags=Tags.from_tags([Tag("開発")]),
+        id=NotionId(str(number)),
+        status=Status.IN_PROGRESS,
+    )
+    task.executed_tasks.append(
+        ExecutedTask(
+            page_id=PageId(f"executed_page_{number}"),
+            name=TaskName(f"タスク{number}"),
+            tags=Tags.from_empty(),
+            id=NotionId(f"e{number}"),
+            status=Status.COMPLETED,
+        )
+    )
+    return task
+
+
+def main():
+    for count in COUNTS:
+        cache = ScheduledTasks.from_tasks([make_task(i) for i in range(count)])
+        # 既存のタスク5件の更新と新規のタスク5件
+        fetched = ScheduledTasks.from_tasks(
+            [make_task(i) for i in range(count - 5, count + 5)]
+        )
+
+        start = time.perf_counter()
+        deep_copied = copy.deepcopy(cache)
+        deep_copied.upsert_by_id(fetched)
+        deepcopy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        shared = cache.upserted_by_id(fetched)
+        shared_time = time.perf_counter() - start
+
+        # サービスでの紐づけと同様に、1件ずつ追加・更新する
+        linked = ScheduledTasks.from_empty()
+        start = time.perf_counter()
+        for task in cache:
+            linked.upsert_by_id(ScheduledTasks.from_tasks([task]))
+        linking_time = time.perf_counter() - start
+
+        assert len(deep_copied) == len(shared) == count + 5
+        print(
+            f"タスク数: {count:>7} deepcopy: {deepcopy_time:8.4f}s "
+            f"upserted_by_id: {shared_time:8.4f}s "
+            f"1件ずつupsert_by_id: {linking_time:8.4f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
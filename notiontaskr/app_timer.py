@@ -13,6 +13,8 @@ class AppTimer:
         self.previous_elapsed_time = 0.0
         # ロガー
         self.logger = logger
+        # 区間ごとの(メッセージ, 経過時間)
+        self.laps: list[tuple[str, float]] = []
 
     @classmethod
     def init_and_start(
@@ -22,11 +24,17 @@ class AppTimer:
     ) -> "AppTimer":
         """クラスメソッドでインスタンスを初期化し、開始時間を設定する"""
         instance = cls(logger)
-        instance.start_time = time.time()
-        if message:
-            logger.info(f"{message}")
+        instance.start(message)
         return instance
 
+    def start(self, message: str = "") -> None:
+        """開始時間を設定する"""
+        self.start_time = time.time()
+        self.previous_elapsed_time = 0.0
+        self.laps = []
+        if message:
+            self.logger.info(f"{message}")
+
     # 前回からの差分を取得
     def snap_delta(self, message: str) -> None:
         """経過時間を取得するメソッド
@@ -40,6 +48,7 @@ class AppTimer:
         elapsed_time = round(current_time - self.start_time, 2)
         diff = elapsed_time - self.previous_elapsed_time
         self.previous_elapsed_time = elapsed_time
+        self.laps.append((message, round(diff, 2)))
         self._log_time(message, diff)
 
     # 合計経過時間を取得
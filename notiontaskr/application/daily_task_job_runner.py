@@ -0,0 +1,112 @@
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+import logging
+from typing import Optional
+from uuid import uuid4
+
+from notiontaskr import config
+from notiontaskr.app_logger import AppLogger
+from notiontaskr.app_timer import AppTimer
+from notiontaskr.application.task_application_service import TaskApplicationService
+from notiontaskr.util.traceback_converter import TracebackConverter
+
+
+class DailyTaskJobStatus(Enum):
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    def __str__(self):
+        return self.value
+
+
+@dataclass
+class DailyTaskJob:
+    """バックグラウンドで実行するデイリータスクのジョブ"""
+
+    id: str
+    timer: AppTimer
+    status: DailyTaskJobStatus = DailyTaskJobStatus.RUNNING
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    def is_running(self) -> bool:
+        return self.status == DailyTaskJobStatus.RUNNING
+
+    def to_dict(self) -> dict:
+        """状態をJSONに変換できる辞書で取得する(処理ごとの経過時間を含む)"""
+        return {
+            "job_id": self.id,
+            "status": str(self.status),
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "phases": [
+                {"name": name, "seconds": seconds} for name, seconds in self.timer.laps
+            ],
+            "error": self.error,
+        }
+
+
+class DailyTaskJobRunner:
+    """デイリータスクをバックグラウンドで実行し、ジョブの状態を保持するクラス
+
+    - 実行を要求するとすぐにジョブを返し、デイリータスクは実行中のイベントループで実行する
+    - 実行中に再度要求された場合は新たに実行せず、実行中のジョブを返す(同時に1つのみ実行する)
+    - 状態は直近のジョブのみ保持する
+    """
+
+    def __init__(
+        self,
+        service: TaskApplicationService,
+        max_history: int = config.DAILY_TASK_JOB_HISTORY,
+        logger: logging.Logger = AppLogger().get(),
+    ):
+        self.service = service
+        self.max_history = max_history
+        self.logger = logger
+        # ジョブID -> ジョブ(開始順)
+        self._jobs: dict[str, DailyTaskJob] = {}
+        # 実行中のasyncio.Task(ガベージコレクションで破棄されないよう保持する)
+        self._running_task: Optional[asyncio.Task] = None
+
+    def start(self) -> DailyTaskJob:
+        """デイリータスクの実行を開始し、ジョブを返す
+
+        実行中のジョブがある場合は、そのジョブを返す
+
+        :raise RuntimeError: イベントループ外で呼び出された場合
+        """
+        latest_job = self.get_latest()
+        if latest_job is not None and latest_job.is_running():
+            return latest_job
+
+        job = DailyTaskJob(id=uuid4().hex, timer=AppTimer(logger=self.logger))
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_history:
+            del self._jobs[next(iter(self._jobs))]
+        self._running_task = asyncio.get_running_loop().create_task(self._run(job))
+        return job
+
+    async def _run(self, job: DailyTaskJob) -> None:
+        try:
+            await self.service.daily_task(timer=job.timer)
+            job.status = DailyTaskJobStatus.SUCCEEDED
+        except Exception as e:
+            job.status = DailyTaskJobStatus.FAILED
+            job.error = str(e)
+            self.logger.error(
+                f"デイリータスク[{job.id}]の実行に失敗。エラー内容: {TracebackConverter(e).get_all()}"
+            )
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+
+    def get(self, job_id: str) -> Optional[DailyTaskJob]:
+        """ジョブを取得する(破棄されたジョブはNone)"""
+        return self._jobs.get(job_id)
+
+    def get_latest(self) -> Optional[DailyTaskJob]:
+        """最後に開始したジョブを取得する"""
+        return next(reversed(self._jobs.values()), None)
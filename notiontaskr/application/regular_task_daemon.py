@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+
+from notiontaskr import config
+from notiontaskr.app_logger import AppLogger
+from notiontaskr.application.task_application_service import TaskApplicationService
+from notiontaskr.util.traceback_converter import TracebackConverter
+
+
+class RegularTaskDaemon:
+    """レギュラータスクを1つのプロセスで一定間隔ごとに実行するクラス
+
+    - 実行ごとにプロセスを起動せず、タスクストア・Notionのコネクションプール・GCSクライアントを
+      メモリに保持したまま使い回す
+    - 保持している状態は一定間隔ごと、および停止時にGCSへ保存する(チェックポイント)
+    - 実行が間隔より長引いた場合は、遅れた回を詰めて実行せずに次の間隔から再開する
+    - リマインドは、レギュラータスクの実行間隔とは別にスケジューラーで通知日時に通知する
+    """
+
+    def __init__(
+        self,
+        service: TaskApplicationService,
+        interval_seconds: float = config.REGULAR_TASK_INTERVAL_SECONDS,
+        checkpoint_seconds: float = config.REGULAR_TASK_CHECKPOINT_SECONDS,
+        logger: logging.Logger = AppLogger().get(),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.service = service
+        self.interval_seconds = interval_seconds
+        self.checkpoint_seconds = checkpoint_seconds
+        self.logger = logger
+        self.clock = clock
+        self._stop_event = asyncio.Event()
+
+    def stop(self) -> None:
+        """実行中のレギュラータスクの完了後に停止する"""
+        self._stop_event.set()
+
+    async def run(self, max_ticks: Optional[int] = None) -> None:
+        """停止するまでレギュラータスクを一定間隔ごとに実行する
+
+        :param max_ticks: 指定した場合は、この回数だけ実行して停止する
+        """
+        next_run_at = self.clock()
+        checkpointed_at = self.clock()
+        tick_count = 0
+        reminder_scheduler = self.service.reminder_scheduler
+        reminder_task = asyncio.ensure_future(
+            reminder_scheduler.run(
+                on_success=lambda task: self.logger.info(
+                    f"Slack通知送信(タスクID: {task.name.get_remind_message()})"
+                ),
+                on_error=lambda e, task: self.logger.error(
+                    f"Slack通知失敗(タスクID: {task.name.get_remind_message()}) エラー内容: {TracebackConverter(e).get_all()}"
+                ),
+            )
+        )
+        try:
+            while not self._stop_event.is_set():
+                await self.tick()
+                tick_count += 1
+                if max_ticks is not None and tick_count >= max_ticks:
+                    break
+
+                if self.clock() - checkpointed_at >= self.checkpoint_seconds:
+                    await self.checkpoint()
+                    checkpointed_at = self.clock()
+
+                next_run_at += self.interval_seconds
+                if next_run_at < self.clock():
+                    self.logger.warning(
+                        "レギュラータスクが実行間隔を超えたため、次の間隔から再開します。"
+                    )
+                    next_run_at = self.clock()
+                await self._wait(next_run_at - self.clock())
+        finally:
+            reminder_scheduler.stop()
+            await reminder_task
+            await self.checkpoint()
+
+    async def tick(self) -> None:
+        """レギュラータスクを1回実行する(失敗しても停止しない)"""
+        try:
+            await self.service.regular_task(keeps_state=True)
+        except Exception as e:
+            self.logger.error(
+                f"レギュラータスクの実行に失敗。エラー内容: {TracebackConverter(e).get_all()}"
+            )
+
+    async def checkpoint(self) -> None:
+        """保持している状態をGCSに保存する(失敗しても停止しない)"""
+        try:
+            await self.service.checkpoint()
+        except Exception as e:
+            self.logger.error(
+                f"チェックポイントの保存に失敗。エラー内容: {TracebackConverter(e).get_all()}"
+            )
+
+    async def _wait(self, seconds: float) -> None:
+        """指定した秒数、もしくは停止するまで待つ"""
+        if seconds <= 0:
+            return
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
@@ -1,10 +1,12 @@
 import asyncio
 from datetime import datetime, timedelta, timezone
+import itertools
 import logging
+import time
 from typing import Optional, cast
 
 import notiontaskr.config as config
-from notiontaskr.infrastructure.pickle_handler import PickleHandler
+from notiontaskr.notifier.reminder_scheduler import ReminderScheduler
 from notiontaskr.notifier.task_reminder import TaskReminder
 from notiontaskr.util.converter import to_isoformat
 from notiontaskr.app_logger import AppLogger
@@ -14,58 +16,119 @@ from notiontaskr.domain.executed_task_service import ExecutedTaskService
 from notiontaskr.domain.scheduled_task_service import ScheduledTaskService
 from notiontaskr.infrastructure.executed_task_repository import ExecutedTaskRepository
 from notiontaskr.infrastructure.scheduled_task_repository import ScheduledTaskRepository
+from notiontaskr.infrastructure.task_repository import TaskRepository
+from notiontaskr.infrastructure.task_store import TaskStore
+from notiontaskr.infrastructure.task_store_journal import TaskStoreJournal
+from notiontaskr.infrastructure.notion_client_pool import NotionClientPool
+from notiontaskr.infrastructure.notion_rate_limiter import NotionRateLimiter
+from notiontaskr.infrastructure.dead_letter_store import DeadLetter, DeadLetterStore
+from notiontaskr.infrastructure.retry_policy import RetryPolicy
+from notiontaskr.infrastructure.written_property_store import WrittenPropertyStore
+from notiontaskr.infrastructure.remind_progress_store import RemindProgressStore
 from notiontaskr.infrastructure.operator import *
 from notiontaskr.infrastructure.task_search_condition import TaskSearchCondition
 from notiontaskr.application.dto.uptime_data import UptimeData, UptimeDataByTag
+from notiontaskr.application.uptime_cache import UptimeCache
 from notiontaskr.domain.tags import Tags
+from notiontaskr.domain.value_objects.tag import Tag
 from notiontaskr.domain.scheduled_tasks import ScheduledTasks
 from notiontaskr.domain.executed_tasks import ExecutedTasks
+from notiontaskr.domain.executed_task_columns import ExecutedTaskColumns
+from notiontaskr.domain.task_dependency_graph import TaskDependencyGraph
+from notiontaskr.domain.task_identity_map import TaskIdentityMap
+from notiontaskr.domain.value_objects.man_hours import ManHours
 from notiontaskr.util.traceback_converter import TracebackConverter
 
 
 class TaskApplicationService:
     def __init__(self, logger: logging.Logger = AppLogger().get()):
         self.logger = logger
+        # 予定・実績リポジトリでNotionのコネクションプールとレート制限を共有する
+        self.notion_client_pool = NotionClientPool(config.NOTION_TOKEN)
+        self.notion_rate_limiter = NotionRateLimiter()
+        # 更新に失敗したページ更新内容の退避先(次回のレギュラータスクで再送する)
+        self.dead_letter_store = DeadLetterStore(
+            save_path=config.LOCAL_DEAD_LETTER_PATH
+        )
+        # 前回書き込んだ内容と同じ更新を省略するための記録
+        self.written_property_store = WrittenPropertyStore(
+            save_path=config.LOCAL_WRITTEN_PROPERTY_PATH
+        )
+        # レギュラージョブでリマインドを通知し終えた日時(次回の実行で続きから通知する)
+        self.remind_progress_store = RemindProgressStore(
+            save_path=config.LOCAL_REMIND_PROGRESS_PATH
+        )
         self.executed_task_repo = ExecutedTaskRepository(
             config.NOTION_TOKEN,
             config.TASK_DB_ID,
+            client_pool=self.notion_client_pool,
+            rate_limiter=self.notion_rate_limiter,
+            dead_letter_store=self.dead_letter_store,
+            written_property_store=self.written_property_store,
         )
         self.scheduled_task_repo = ScheduledTaskRepository(
             config.NOTION_TOKEN,
             config.TASK_DB_ID,
+            client_pool=self.notion_client_pool,
+            rate_limiter=self.notion_rate_limiter,
+            dead_letter_store=self.dead_letter_store,
+            written_property_store=self.written_property_store,
         )
-        self.scheduled_task_cache = PickleHandler(
-            save_path=config.LOCAL_SCHEDULED_PICKLE_PATH
-        )
-        self.executed_task_cache = PickleHandler(
-            save_path=config.LOCAL_EXECUTED_PICKLE_PATH
+        # 予定・実績をまとめて取得する場合に使用する
+        self.task_repo = TaskRepository(
+            config.NOTION_TOKEN,
+            config.TASK_DB_ID,
+            client_pool=self.notion_client_pool,
+            rate_limiter=self.notion_rate_limiter,
+            written_property_store=self.written_property_store,
         )
+        self.task_store = TaskStore(save_path=config.LOCAL_TASK_STORE_PATH)
+        # タスクストアとGCSの同期(読み込み・書き込み)を1つずつ実行するためのロック
+        # (同じプロセスで実行するデイリータスクと稼働実績用の読み込みの競合を防ぐ)
+        self._task_store_lock = asyncio.Lock()
+        # 稼働実績の集計に使用するタスクストアを最後に読み込んだ時刻(time.monotonic)
+        self._uptime_task_store_loaded_at: Optional[float] = None
+        # 稼働実績の集計に使用するタスクストアを最後に読み込んだ時点のGCS上の世代
+        self._uptime_task_store_generation: Optional[tuple] = None
+        # 使い回すGCSハンドラー(_get_gcs_handlerで初期化する)
+        self._gcs_handler: Optional[GCSHandler] = None
+        # 常駐プロセスでレギュラータスクの実行間に保持するタスクストアの保存先
+        # (Noneの場合は、前回の実行の状態を読み込んでいない)
+        self._regular_task_journal: Optional[TaskStoreJournal] = None
+        # 稼働実績の集計結果(同じ条件のリクエストで集計を共有する)
+        self.uptime_cache = UptimeCache()
         self.scheduled_task_service = ScheduledTaskService()
         self.executed_task_service = ExecutedTaskService()
         self.reminder = TaskReminder(
             notifier=config.NOTIFIER,
         )
+        # 常駐プロセスでリマインドを通知日時に通知する(runは常駐プロセスで実行する)
+        self.reminder_scheduler = ReminderScheduler(reminder=self.reminder)
 
-    async def daily_task(self):
-        """毎日0時に実行されるタスク"""
+    async def daily_task(self, timer: Optional[AppTimer] = None):
+        """毎日0時に実行されるタスク
 
-        timer = AppTimer.init_and_start(
-            logger=self.logger,
-            message="デイリータスクの開始",
-        )
+        :param timer: 指定した場合は、このタイマーに各処理の経過時間を記録する
+        """
+
+        if timer is None:
+            timer = AppTimer(logger=self.logger)
+        timer.start("デイリータスクの開始")
 
         # ========== GCSハンドラーの初期化 ==========
-        gcs_handler = None
-        if not config.DEBUG_MODE:
-            gcs_handler = GCSHandler(
-                bucket_name=config.BUCKET_NAME,
-                on_error=lambda e: self.logger.error(
-                    f"GCSの初期化に失敗。エラー内容: {TracebackConverter(e).get_all()}",
-                ),
-            )
-            timer.snap_delta("GCSハンドラーの初期化完了")
+        gcs_handler = self._get_gcs_handler()
+        timer.snap_delta("GCSハンドラーの初期化完了")
+
+        # ========== 書き込み済みプロパティの読み込み ==========
+        await self._load_written_properties(gcs_handler=gcs_handler)
+
+        # ========== デッドレターの読み込み ==========
+        # 保存時にGCSの未送信のデッドレターを上書きしないよう、先に読み込んでおく
+        await self._load_dead_letters(gcs_handler=gcs_handler)
 
         # ========== 過去一年分のタスクを取得 ==========
+        # 取得開始日時(これより前に作成された差分ファイルはスナップショットに含まれる)
+        fetched_at = datetime.now(timezone.utc)
         # 条件作成(最終更新日が過去1年~未来)
         condition = TaskSearchCondition().or_(
             TaskSearchCondition().where_last_edited_time(
@@ -77,20 +140,13 @@ class TaskApplicationService:
             ),
         )
 
-        # 予定タスクの取得
-        scheduled_tasks = await self.scheduled_task_repo.find_all_by_condition(
+        # 予定タスクと実績タスクを1回の検索でまとめて取得
+        scheduled_tasks, executed_tasks = await self.task_repo.find_by_condition(
             condition=condition,
             on_error=lambda e, data: self.logger.error(
-                f"予定タスク[{data['properties']['ID']['unique_id']['number']}]の取得に失敗。エラー内容: {TracebackConverter(e).get_all()}"
-            ),
-        )
-
-        # 実績タスクの取得
-        executed_tasks = await self.executed_task_repo.find_all_by_condition(
-            condition=condition,
-            on_error=lambda e, data: self.logger.error(
-                f"実績タスク[{data['properties']['ID']['unique_id']['number']}]の取得に失敗。エラー内容: {TracebackConverter(e).get_all()}"
+                f"タスク[{data['properties']['ID']['unique_id']['number']}]の取得に失敗。エラー内容: {TracebackConverter(e).get_all()}"
             ),
+            on_page_fetched=lambda metric: self.logger.debug(f"タスク取得 {metric}"),
         )
 
         timer.snap_delta("Notionからタスクの取得完了")
@@ -123,7 +179,11 @@ class TaskApplicationService:
         )
 
         # タスクのプロパティを更新
-        scheduled_tasks.update_tasks_properties()
+        scheduled_tasks.update_tasks_properties(
+            on_error=lambda e, task: self.logger.error(
+                f"予定タスク[{task.id.number}]のプロパティの集計に失敗。エラー内容: {e}"
+            ),
+        )
 
         # 更新
         tasks = []
@@ -134,48 +194,67 @@ class TaskApplicationService:
 
         await asyncio.gather(*tasks)
 
-        # ========== pickleの保存 ==========
-        tasks = []
-        # 予定タスク
-        tasks.append(
-            self._save_pickle(
-                obj=scheduled_tasks,
-                gcs_handler=gcs_handler,
-                bucket_path=config.BUCKET_SCHEDULED_PICKLE_PATH,
-                cache=self.scheduled_task_cache,
-            )
-        )
-        # 実績タスク
-        tasks.append(
-            self._save_pickle(
-                obj=executed_tasks,
-                gcs_handler=gcs_handler,
-                bucket_path=config.BUCKET_EXECUTED_PICKLE_PATH,
-                cache=self.executed_task_cache,
-            )
+        # ========== タスクストアの保存 ==========
+        await self._save_task_store(
+            journal=TaskStoreJournal(store=self.task_store, gcs_handler=gcs_handler),
+            scheduled_tasks=scheduled_tasks,
+            executed_tasks=executed_tasks,
+            fetched_at=fetched_at,
+            # 最終更新日が過去1年以内のタスクのみを取得したため、
+            # 開始日が1年より前の実績タスクは漏れている可能性がある
+            covered_from=fetched_at - timedelta(days=365),
         )
+        # タスクストアを作り直したため、全ての稼働実績の集計結果を破棄する
+        self.uptime_cache.clear()
 
-        await asyncio.gather(*tasks)
+        timer.snap_delta("タスクストアの保存完了")
+
+        # ========== デッドレターの保存 ==========
+        await self._save_dead_letters(gcs_handler=gcs_handler, has_drained=False)
+
+        # ========== 書き込み済みプロパティの保存 ==========
+        await self._save_written_properties(gcs_handler=gcs_handler)
 
-        timer.snap_delta("Pickleの保存完了")
         timer.snap_total("処理完了")
 
-    async def regular_task(self):
-        """予定タスクのIDを持つ実績タスクにIDを付与する"""
+    async def regular_task(self, keeps_state: bool = False):
+        """予定タスクのIDを持つ実績タスクにIDを付与する
+
+        :param keeps_state: Trueの場合は、タスクストア・書き込み済みプロパティ・デッドレターを
+            初回のみGCSから読み込み、以降の実行ではメモリとローカルファイルの状態を使い回す。
+            GCSへの保存はcheckpointで行う(常駐プロセス用)
+        """
         timer = AppTimer.init_and_start(
             logger=self.logger,
             message="レギュラータスクの開始",
         )
 
         # ========== GCSハンドラーの初期化 ==========
-        gcs_handler: Optional[GCSHandler] = None
-        if not config.DEBUG_MODE:
-            gcs_handler = GCSHandler(
-                bucket_name=config.BUCKET_NAME,
-                on_error=lambda e: self.logger.error(
-                    f"GCSの初期化に失敗。エラー内容: {TracebackConverter(e).get_all()}",
-                ),
-            )
+        gcs_handler = self._get_gcs_handler()
+
+        # 前回の実行の状態を使い回すかどうか
+        is_warm = keeps_state and self._regular_task_journal is not None
+
+        if not is_warm:
+            # ========== 書き込み済みプロパティの読み込み ==========
+            await self._load_written_properties(gcs_handler=gcs_handler)
+
+            # ========== デッドレターの読み込み ==========
+            await self._load_dead_letters(gcs_handler=gcs_handler)
+
+        # ========== リマインドを通知する期間の決定 ==========
+        # 前回の実行で通知し終えた日時から現在までのリマインドを通知する
+        # (常駐プロセスでは、リマインドをスケジューラーで通知日時に通知する)
+        remind_to = datetime.now(timezone.utc)
+        remind_from = remind_to
+        if not keeps_state:
+            await self._load_remind_progress(gcs_handler=gcs_handler)
+            remind_from = self._get_remind_from(remind_to)
+
+        # ========== 前回までに失敗した更新の再送 ==========
+        drained_count = await self._drain_dead_letters()
+        if drained_count > 0:
+            timer.snap_delta("デッドレターの再送完了")
 
         # ========== Notionからタスクの取得 ==========
         # 条件作成(最終更新日が1分前~現在)
@@ -223,88 +302,91 @@ class TaskApplicationService:
         )
 
         # タスクの取得
-        results = await asyncio.gather(
-            # タスクの取得
-            self.scheduled_task_repo.find_by_condition(
+        find_tasks = [
+            # タスクの取得(予定・実績を1回の検索でまとめて取得)
+            self.task_repo.find_by_condition(
                 condition=condition,
                 on_error=lambda e, data: self.logger.error(
-                    f"予定タスク[{data['properties']['ID']['unique_id']['number']}]の取得に失敗。エラー内容: {TracebackConverter(e).get_all()}"
+                    f"タスク[{data['properties']['ID']['unique_id']['number']}]の取得に失敗。エラー内容: {TracebackConverter(e).get_all()}"
                 ),
             ),
-            self.executed_task_repo.find_by_condition(
-                condition=condition,
-                on_error=lambda e, data: self.logger.error(
-                    f"実績タスク[{data['properties']['ID']['unique_id']['number']}]の取得に失敗。エラー内容: {TracebackConverter(e).get_all()}"
-                ),
-            ),
-            # リマインド用タスクの取得
-            self.executed_task_repo.find_by_condition(
-                condition=before_start_remind_condition,
-                on_error=lambda e, data: self.logger.error(
-                    f"実績タスク[{data['properties']['ID']['unique_id']['number']}]の取得に失敗。エラー内容: {TracebackConverter(e).get_all()}"
+        ]
+        # 常駐プロセスでは、リマインドをスケジューラーで通知日時に通知するため取得しない
+        if not keeps_state:
+            find_tasks += [
+                # リマインド用タスクの取得
+                self.executed_task_repo.find_by_condition(
+                    condition=before_start_remind_condition,
+                    on_error=lambda e, data: self.logger.error(
+                        f"実績タスク[{data['properties']['ID']['unique_id']['number']}]の取得に失敗。エラー内容: {TracebackConverter(e).get_all()}"
+                    ),
                 ),
-            ),
-            self.executed_task_repo.find_by_condition(
-                condition=before_end_remind_condition,
-                on_error=lambda e, data: self.logger.error(
-                    f"実績タスク[{data['properties']['ID']['unique_id']['number']}]の取得に失敗。エラー内容: {TracebackConverter(e).get_all()}"
+                self.executed_task_repo.find_by_condition(
+                    condition=before_end_remind_condition,
+                    on_error=lambda e, data: self.logger.error(
+                        f"実績タスク[{data['properties']['ID']['unique_id']['number']}]の取得に失敗。エラー内容: {TracebackConverter(e).get_all()}"
+                    ),
                 ),
-            ),
-        )
+            ]
+        results = await asyncio.gather(*find_tasks)
 
         # 更新用タスクの取得
-        fetched_scheduled_tasks, fetched_executed_tasks = results[0], results[1]
+        fetched_scheduled_tasks, fetched_executed_tasks = results[0]
         timer.snap_delta("Notionからタスクの取得完了")
         self.logger.info(f"取得した予定タスクの数: {len(fetched_scheduled_tasks)}")
         self.logger.info(f"取得した実績タスクの数: {len(fetched_executed_tasks)}")
 
         # リマインド用タスクの取得
-        fetched_remind_tasks = results[2].upserted_by_id(results[3])
-        cast(ExecutedTasks, fetched_remind_tasks)
-        self.logger.info(f"取得したリマインド用タスクの数: {len(fetched_remind_tasks)}")
+        fetched_remind_tasks = ExecutedTasks.from_empty()
+        if not keeps_state:
+            fetched_remind_tasks = results[1].upserted_by_id(results[2])
+            self.logger.info(
+                f"取得したリマインド用タスクの数: {len(fetched_remind_tasks)}"
+            )
         has_fetched_remind_tasks = len(fetched_remind_tasks) > 0
 
-        # ========== pickleからタスクを取得 ==========
-        # 予定タスク
-        cache_scheduled_tasks = await self._load_pickle(
-            gcs_handler=gcs_handler,
-            bucket_path=config.BUCKET_SCHEDULED_PICKLE_PATH,
-            cache=self.scheduled_task_cache,
-        )
-        # 実績タスク
-        cache_executed_tasks = await self._load_pickle(
-            gcs_handler=gcs_handler,
-            bucket_path=config.BUCKET_EXECUTED_PICKLE_PATH,
-            cache=self.executed_task_cache,
-        )
-        if cache_scheduled_tasks is None or cache_executed_tasks is None:
+        # ========== タスクストアから関連タスクを取得 ==========
+        if is_warm:
+            task_store_journal = cast(TaskStoreJournal, self._regular_task_journal)
+            has_task_store = self._has_scheduled_tasks_in_task_store()
+        else:
+            task_store_journal = TaskStoreJournal(
+                store=self.task_store, gcs_handler=gcs_handler
+            )
+            has_task_store = await self._load_task_store(journal=task_store_journal)
+            if keeps_state and has_task_store:
+                self._regular_task_journal = task_store_journal
+                self._schedule_reminders_from_task_store()
+        if not has_task_store:
             self.logger.critical("キャッシュが空です。処理を終了します。")
             return
 
-        # 取得したタスクをキャスト
-        cache_scheduled_tasks = cast(ScheduledTasks, cache_scheduled_tasks)
-        cache_executed_tasks = cast(ExecutedTasks, cache_executed_tasks)
+        # 取得したタスクの更新に必要な予定タスクのみを読み込む
+        identity_map = TaskIdentityMap()
+        cache_scheduled_tasks = self._find_related_scheduled_tasks(
+            fetched_scheduled_tasks=fetched_scheduled_tasks,
+            fetched_executed_tasks=fetched_executed_tasks,
+            identity_map=identity_map,
+        )
+        self.logger.info(f"読み込んだ関連予定タスクの数: {len(cache_scheduled_tasks)}")
 
-        timer.snap_delta("Pickleからタスクの取得完了")
+        timer.snap_delta("タスクストアから関連タスクの取得完了")
 
         # 取得したタスクとキャッシュのマージ
-        merged_scheduled_tasks = cache_scheduled_tasks.upserted_by_id(
-            fetched_scheduled_tasks
-        )
-        merged_executed_tasks = cache_executed_tasks.upserted_by_id(
-            fetched_executed_tasks
-        )
+        # (同じIDのタスクは取得したタスクに置き換え、サブアイテム・実績タスクとの関連は引き継ぐ)
+        identity_map.put_scheduled_tasks(fetched_scheduled_tasks)
+        identity_map.put_executed_tasks(fetched_executed_tasks)
+        merged_scheduled_tasks = identity_map.get_scheduled_tasks()
         has_fetched_scheduled_tasks = len(fetched_scheduled_tasks) > 0
         has_fetched_executed_tasks = len(fetched_executed_tasks) > 0
         if has_fetched_scheduled_tasks or has_fetched_executed_tasks:
             # ========== タスクの更新 ==========
 
-            # 更新対象タスクの初期化
-            scheduled_tasks_to_update = ScheduledTasks.from_empty()
-            scheduled_tasks_to_update.upsert_by_id(fetched_scheduled_tasks)
+            # 紐づけで変更された予定タスク
+            linked_scheduled_tasks = ScheduledTasks.from_empty()
 
             # 実績タスクID付与 + 付与された予定タスク取得
-            scheduled_tasks_to_update.upsert_by_id(
+            linked_scheduled_tasks.upsert_by_id(
                 self.executed_task_service.get_scheduled_tasks_added_executed_id(
                     to=fetched_executed_tasks,
                     source=merged_scheduled_tasks,
@@ -312,7 +394,7 @@ class TaskApplicationService:
             )
 
             # 実績タスクの紐づけ
-            scheduled_tasks_to_update.upsert_by_id(
+            linked_scheduled_tasks.upsert_by_id(
                 self.scheduled_task_service.get_tasks_upserted_executed_tasks(
                     to=merged_scheduled_tasks,
                     source=fetched_executed_tasks,
@@ -323,7 +405,7 @@ class TaskApplicationService:
             )
 
             # 取得予定タスクにサブアイテムを紐づける
-            scheduled_tasks_to_update.upsert_by_id(
+            linked_scheduled_tasks.upsert_by_id(
                 self.scheduled_task_service.get_parent_tasks_appended_sub_tasks(
                     sub_tasks=merged_scheduled_tasks,
                     parent_tasks=fetched_scheduled_tasks,
@@ -334,7 +416,7 @@ class TaskApplicationService:
             )
 
             # 取得サブアイテムに親タスクを紐づける
-            scheduled_tasks_to_update.upsert_by_id(
+            linked_scheduled_tasks.upsert_by_id(
                 self.scheduled_task_service.get_parent_tasks_appended_sub_tasks(
                     sub_tasks=fetched_scheduled_tasks,
                     parent_tasks=merged_scheduled_tasks,
@@ -344,31 +426,55 @@ class TaskApplicationService:
                 )
             )
 
-            # タスクのプロパティ更新
-            scheduled_tasks_to_update.update_tasks_properties()
+            # 変更されたタスクとその祖先のみを再集計の対象にする
+            dependency_graph = TaskDependencyGraph.from_scheduled_tasks(
+                merged_scheduled_tasks
+            )
+            dependency_graph.mark_scheduled_tasks_dirty(fetched_scheduled_tasks)
+            dependency_graph.mark_scheduled_tasks_dirty(linked_scheduled_tasks)
+            dependency_graph.mark_executed_tasks_dirty(fetched_executed_tasks)
+            scheduled_tasks_to_update = dependency_graph.get_dirty_tasks()
+            self.logger.info(
+                f"再集計する予定タスクの数: {len(scheduled_tasks_to_update)}"
+            )
+
+            # タスクのプロパティ更新(対象外のサブアイテムは集計済みの値を使う)
+            scheduled_tasks_to_update.update_tasks_properties(
+                on_error=lambda e, task: self.logger.error(
+                    f"予定タスク[{task.id.number}]のプロパティの集計に失敗。エラー内容: {e}"
+                ),
+                updates_sub_tasks=False,
+            )
 
             # Notionの更新
+            executed_tasks_to_update = fetched_executed_tasks.upserted_by_id(
+                scheduled_tasks_to_update.get_executed_tasks()
+            )
             tasks = []
             tasks.append(self._update_scheduled_tasks(scheduled_tasks_to_update))
-            tasks.append(
-                self._update_executed_tasks(
-                    fetched_executed_tasks.upserted_by_id(
-                        scheduled_tasks_to_update.get_executed_tasks()
-                    )
-                )
-            )
+            tasks.append(self._update_executed_tasks(executed_tasks_to_update))
             await asyncio.gather(*tasks)
 
             timer.snap_delta("タスクの更新完了")
+
+            if keeps_state:
+                # 変更された実績タスクのリマインドのみ登録し直す
+                self._schedule_reminders(executed_tasks_to_update)
         else:
             self.logger.info("取得したタスクがありません。更新処理をスキップします。")
 
         # ========== Slackリマインド通知 ==========
-        if has_fetched_remind_tasks:
+        if keeps_state:
+            self.logger.info(
+                f"スケジュール済みのリマインドの数: {len(self.reminder_scheduler)}"
+            )
+        elif has_fetched_remind_tasks:
             # 非同期でリマインド通知を実行
             asyncio.create_task(
-                self.reminder.remind(
-                    tasks=fetched_remind_tasks.get_remind_tasks(),
+                self.reminder.remind_between(
+                    tasks=fetched_remind_tasks,
+                    from_=remind_from,
+                    to=remind_to,
                     on_success=lambda task: self.logger.info(
                         f"Slack通知送信(タスクID: {task.name.get_remind_message()})"
                     ),
@@ -383,59 +489,182 @@ class TaskApplicationService:
             self.logger.info(
                 "リマインド対象のタスクがありません。Slack通知をスキップします。"
             )
+        if not keeps_state:
+            await self._save_remind_progress(
+                gcs_handler=gcs_handler, reminded_until=remind_to
+            )
 
-        # ========== Pickleの保存 ==========
-        tasks = []
-        if has_fetched_scheduled_tasks:
-            # 予定タスク
-            tasks.append(
-                self._save_pickle(
-                    obj=merged_scheduled_tasks,
-                    gcs_handler=gcs_handler,
-                    bucket_path=config.BUCKET_SCHEDULED_PICKLE_PATH,
-                    cache=self.scheduled_task_cache,
-                )
+        # ========== タスクストアの保存 ==========
+        if has_fetched_scheduled_tasks or has_fetched_executed_tasks:
+            # 再集計したタスクと、ラベル等が変更されたタスクのみを書き込む
+            await self._save_task_store(
+                journal=task_store_journal,
+                scheduled_tasks=scheduled_tasks_to_update.upserted_by_id(
+                    merged_scheduled_tasks.get_updated_tasks()
+                ),
+                executed_tasks=fetched_executed_tasks,
+                uploads=not keeps_state,
             )
+            timer.snap_delta("タスクストアの保存処理完了")
         else:
             self.logger.info(
-                "取得した予定タスクがありません。Pickleの保存をスキップします。"
+                "取得したタスクがありません。タスクストアの保存をスキップします。"
             )
-        if has_fetched_executed_tasks:
-            # 実績タスク
-            tasks.append(
-                self._save_pickle(
-                    obj=merged_executed_tasks,
-                    gcs_handler=gcs_handler,
-                    bucket_path=config.BUCKET_EXECUTED_PICKLE_PATH,
-                    cache=self.executed_task_cache,
-                )
+
+        if not keeps_state:
+            # ========== デッドレターの保存 ==========
+            await self._save_dead_letters(
+                gcs_handler=gcs_handler, has_drained=drained_count > 0
             )
-        else:
-            self.logger.info(
-                "取得した実績タスクがありません。Pickleの保存をスキップします。"
+
+            # ========== 書き込み済みプロパティの保存 ==========
+            await self._save_written_properties(gcs_handler=gcs_handler)
+
+        timer.snap_total("処理完了")
+
+    async def checkpoint(self):
+        """常駐プロセスで保持しているレギュラータスクの状態をGCSに保存する
+
+        - 前回の保存以降に更新したタスクを1つの差分ファイルとしてアップロードする
+        - デッドレターと書き込み済みプロパティを保存する
+        - 他の実行(デイリータスク等)の変更を取り込むため、タスクストアをGCSから読み込み直す
+        """
+        journal = self._regular_task_journal
+        if journal is None:
+            return
+        timer = AppTimer.init_and_start(
+            logger=self.logger,
+            message="チェックポイントの開始",
+        )
+        gcs_handler = self._get_gcs_handler()
+
+        # ========== タスクストアの差分の保存 ==========
+        try:
+            async with self._task_store_lock:
+                flushed_count = await asyncio.to_thread(journal.flush)
+            self.logger.info(f"タスクストアの差分を保存(タスク数: {flushed_count})")
+        except Exception as e:
+            self.logger.error(
+                f"タスクストアの差分の保存に失敗。エラー内容: {TracebackConverter(e).get_all()}"
             )
 
-        await asyncio.gather(*tasks)
+        # ========== デッドレターの保存 ==========
+        await self._save_dead_letters(gcs_handler=gcs_handler, has_drained=True)
 
-        timer.snap_delta("Pickleの保存処理完了")
+        # ========== 書き込み済みプロパティの保存 ==========
+        await self._save_written_properties(gcs_handler=gcs_handler)
 
-        timer.snap_total("処理完了")
+        # ========== タスクストアの読み込み直し ==========
+        # (保存できなかった差分は、読み込み後にローカルのタスクストアへ再度書き込まれる)
+        await self._load_task_store(journal=journal)
+        self._schedule_reminders_from_task_store()
+
+        timer.snap_total("チェックポイント完了")
 
     async def get_uptime(
         self, tags: Tags, from_: datetime, to: datetime
     ) -> "UptimeDataByTag":
         """指定したタグの稼働実績を取得する
 
+        タスクストアの稼働実績の集計表(タグ×日)から集計し、Notionには問い合わせない。
+        期間の開始日時がタスクストアに実績タスクを漏れなく保存している期間より前の場合
+        (もしくはその期間が不明な場合)のみ、Notionから実績タスクを取得して集計する。
+        集計結果は一定時間キャッシュし、同じ条件で実行中の集計がある場合はその結果を待つ。
+        他の実行(レギュラータスク等)によりタスクストアが更新された場合は、キャッシュを破棄する
+
         :param tags: タグのリスト
-        :return: 稼働実績DTO
+        :return: 稼働実績DTO(複数の呼び出し元で共有するため、変更しないこと)
         """
+        await self._refresh_uptime_task_store()
+        return await self.uptime_cache.get_or_compute(
+            tags,
+            from_=from_,
+            to=to,
+            compute=lambda: self._compute_uptime(tags, from_=from_, to=to),
+        )
+
+    async def _compute_uptime(
+        self, tags: Tags, from_: datetime, to: datetime
+    ) -> "UptimeDataByTag":
+        """指定したタグの稼働実績を集計する"""
 
         timer = AppTimer.init_and_start(
             logger=self.logger,
             message="稼働実績の取得を開始",
         )
 
-        # ========== タスクの取得 ==========
+        # ========== 稼働実績を計算 ==========
+        if self._is_covered_by_task_store(from_):
+            uptimes = self.task_store.sum_uptime_by_tag(tags, from_=from_, to=to)
+            timer.snap_delta("タスクストアから稼働実績の集計完了")
+        else:
+            uptimes = await self._get_uptimes_from_notion(tags, from_=from_, to=to)
+            timer.snap_delta("Notionから稼働実績の集計完了")
+
+        # タグごとの稼働実績DTOを作成する
+        uptime_data_by_tag = UptimeDataByTag.from_empty()
+        for tag, uptime in uptimes.items():
+            uptime_data_by_tag.insert_data(
+                data=UptimeData.from_domain(
+                    tag=tag,
+                    uptime=uptime,
+                    from_=from_,
+                    to=to,
+                )
+            )
+        timer.snap_total("処理完了")
+
+        # ========== タグごとの稼働実績を返す ==========
+        return uptime_data_by_tag
+
+    async def _refresh_uptime_task_store(self) -> None:
+        """稼働実績の集計に使用するタスクストアを読み込み直す
+
+        前回の読み込みから一定時間(config.UPTIME_TASK_STORE_REFRESH_SECONDS)が経過するまでは
+        読み込まずにローカルのタスクストアを使用する。
+        GCS上のスナップショットもしくは差分ファイルが変わっていた場合は、全ての集計結果を破棄する
+        """
+        now = time.monotonic()
+        if (
+            self._uptime_task_store_loaded_at is not None
+            and now - self._uptime_task_store_loaded_at
+            < config.UPTIME_TASK_STORE_REFRESH_SECONDS
+        ):
+            return
+
+        # 読み込み中に届いたリクエストは、読み込み済みのタスクストアで集計する
+        self._uptime_task_store_loaded_at = now
+        journal = TaskStoreJournal(
+            store=self.task_store, gcs_handler=self._get_gcs_handler()
+        )
+        await self._load_task_store(journal=journal)
+        if journal.generation != self._uptime_task_store_generation:
+            self._uptime_task_store_generation = journal.generation
+            self.uptime_cache.clear()
+            self.logger.info("タスクストアが更新されたため、稼働実績の集計結果を破棄")
+
+    def _is_covered_by_task_store(self, from_: datetime) -> bool:
+        """指定日時以降の実績タスクをタスクストアに漏れなく保存しているかどうか
+
+        タスクストアはデイリータスクで取得した期間(最終更新日が過去1年以内)の実績タスクのみを保存している
+        """
+        try:
+            covered_from = self.task_store.get_covered_from()
+            if covered_from is None:
+                return False
+            if from_.tzinfo is None:
+                from_ = from_.replace(tzinfo=timezone.utc)
+            return from_ >= covered_from
+        except Exception as e:
+            self.logger.error(
+                f"タスクストアの読み込みに失敗。エラー内容: {TracebackConverter(e).get_all()}"
+            )
+            return False
+
+    async def _get_uptimes_from_notion(
+        self, tags: Tags, from_: datetime, to: datetime
+    ) -> dict[Tag, ManHours]:
+        """Notionから実績タスクを取得し、タグごとの人時の合計を集計する"""
         condition = TaskSearchCondition().and_(
             TaskSearchCondition().where_date(
                 operator=DateOperator.ON_OR_AFTER,
@@ -453,93 +682,361 @@ class TaskApplicationService:
                 f"実績タスク[{data['properties']['ID']['unique_id']['number']}]の取得に失敗。エラー内容: {TracebackConverter(e).get_all()}"
             ),
         )
-        timer.snap_delta("Notionから実績タスクの取得完了")
 
         # ========== 稼働実績を計算 ==========
-        # 指定タグ配列に一致する予定タスクを辞書型で取得する
-        executed_tasks_by_tag = fetched_executed_tasks.get_tasks_by_tag(
-            tags=tags,
+        # 列形式でタグごとの人時をまとめて集計する
+        return {
+            tag: ManHours(hours)
+            for tag, hours in ExecutedTaskColumns.from_tasks(fetched_executed_tasks)
+            .sum_man_hours_by_tag(tags)
+            .items()
+        }
+
+    def _schedule_reminders_from_task_store(self) -> None:
+        """タスクストアから開始日時が一定範囲内の実績タスクを読み込み、リマインドを登録する"""
+        now = datetime.now(timezone.utc)
+        try:
+            executed_tasks = self.task_store.find_executed_tasks_by_date_range(
+                from_=now - timedelta(hours=config.REMINDER_LOOKBACK_HOURS),
+                to=now + timedelta(hours=config.REMINDER_LOOKAHEAD_HOURS),
+            )
+        except Exception as e:
+            self.logger.error(
+                f"リマインド対象の実績タスクの読み込みに失敗。エラー内容: {TracebackConverter(e).get_all()}"
+            )
+            return
+        self._schedule_reminders(executed_tasks)
+
+    def _schedule_reminders(self, executed_tasks: ExecutedTasks) -> None:
+        """実績タスクのリマインドを登録し直す"""
+        self.reminder_scheduler.update_tasks(
+            executed_tasks,
+            on_error=lambda e, task: self.logger.error(
+                f"実績タスク[{task.id.number}]のリマインドの登録に失敗。エラー内容: {TracebackConverter(e).get_all()}"
+            ),
         )
 
-        # タグごとの稼働実績を計算する
-        uptime_data_by_tag = UptimeDataByTag.from_empty()
-        for tag, tasks in executed_tasks_by_tag.items():
-            uptime_data_by_tag.insert_data(
-                data=UptimeData.from_domain(
-                    tag=tag,
-                    uptime=tasks.get_total_man_hours(),
-                    from_=from_,
-                    to=to,
-                )
+    async def _load_task_store(self, journal: TaskStoreJournal) -> bool:
+        """GCSからタスクストアのスナップショットと差分ファイルを読み込む
+
+        :return: タスクストアに予定タスクが保存されている場合True
+        """
+        try:
+            # GCSとの通信中も、同じイベントループの他の処理(リクエスト)を止めない
+            async with self._task_store_lock:
+                applied_count = await asyncio.to_thread(journal.load)
+            self.logger.info(
+                f"タスクストアをGCSから読み込み成功(差分ファイル数: {applied_count})"
+            )
+        except Exception as e:
+            self.logger.info(
+                f"タスクストアをGCSから読み込み失敗。エラー内容: {TracebackConverter(e).get_all()}"
             )
-        timer.snap_delta("稼働実績を計算完了")
-        timer.snap_total("処理完了")
 
-        # ========== タグごとの稼働実績を返す ==========
-        return uptime_data_by_tag
+        return self._has_scheduled_tasks_in_task_store()
+
+    def _has_scheduled_tasks_in_task_store(self) -> bool:
+        """タスクストアに予定タスクが保存されているかどうか"""
+        try:
+            return self.task_store.count(TaskStore.SCHEDULED) > 0
+        except Exception as e:
+            self.logger.critical(
+                f"タスクストアの読み込みに失敗。エラー内容: {TracebackConverter(e).get_all()}"
+            )
+            return False
 
-    async def _load_pickle(
+    def _find_related_scheduled_tasks(
         self,
-        gcs_handler: Optional[GCSHandler],
-        bucket_path: str,
-        cache: PickleHandler,
-    ) -> object | None:
-        """GCSからPickleをダウンロードし、読み込むメソッド"""
+        fetched_scheduled_tasks: ScheduledTasks,
+        fetched_executed_tasks: ExecutedTasks,
+        identity_map: TaskIdentityMap,
+    ) -> ScheduledTasks:
+        """取得したタスクの紐づけに必要な予定タスクをタスクストアから取得する
+
+        - IDラベルが無い実績タスクと同じ名前の予定タスク
+        - 実績タスクが紐づく予定タスク
+        - 取得した予定タスクのサブアイテム
+        - 取得した予定タスクと上記の予定タスクの祖先(再集計に必要な親タスクを根まで辿る)
+
+        :param identity_map: 読み込んだタスクを登録する識別マップ(同じタスクは1度だけ読み込む)
+        """
+        related_tasks = ScheduledTasks.from_empty()
+        related_tasks.upsert_by_id(
+            self.task_store.find_scheduled_tasks_by_names(
+                (
+                    task.name.task_name
+                    for task in fetched_executed_tasks
+                    if task.name.id_label is None
+                ),
+                identity_map=identity_map,
+            )
+        )
+        related_tasks.upsert_by_id(
+            self.task_store.find_scheduled_tasks_by_ids(
+                (
+                    task.scheduled_task_id
+                    for task in fetched_executed_tasks
+                    if task.scheduled_task_id is not None
+                ),
+                identity_map=identity_map,
+            )
+        )
+        related_tasks.upsert_by_id(
+            self.task_store.find_scheduled_tasks_by_parent_page_ids(
+                (task.page_id for task in fetched_scheduled_tasks),
+                identity_map=identity_map,
+            )
+        )
+        related_tasks.upsert_by_id(
+            self.task_store.find_ancestor_scheduled_tasks_by_page_ids(
+                (
+                    task.parent_task_page_id
+                    for task in itertools.chain(fetched_scheduled_tasks, related_tasks)
+                    if task.parent_task_page_id is not None
+                ),
+                identity_map=identity_map,
+            )
+        )
+        return related_tasks
+
+    def _get_gcs_handler(self) -> Optional[GCSHandler]:
+        """実行間で使い回すGCSハンドラーを取得する
+
+        デバッグモードの場合、もしくは初期化に失敗した場合はNoneを返す
+        (初期化に失敗した場合は次回の呼び出しで作り直す)
+        """
+        if config.DEBUG_MODE:
+            return None
+        if self._gcs_handler is None:
+            gcs_handler = GCSHandler(
+                bucket_name=config.BUCKET_NAME,
+                on_error=lambda e: self.logger.error(
+                    f"GCSの初期化に失敗。エラー内容: {TracebackConverter(e).get_all()}",
+                ),
+            )
+            if not gcs_handler.is_available:
+                return None
+            self._gcs_handler = gcs_handler
+        return self._gcs_handler
+
+    async def _save_task_store(
+        self,
+        journal: TaskStoreJournal,
+        scheduled_tasks: ScheduledTasks,
+        executed_tasks: ExecutedTasks,
+        fetched_at: Optional[datetime] = None,
+        covered_from: Optional[datetime] = None,
+        uploads: bool = True,
+    ):
+        """タスクストアに書き込み、GCSにアップロードする
+
+        :param fetched_at: 指定した場合は全てのタスクを置き換えてスナップショットを作り直す。
+            指定しない場合は差分ファイルとしてアップロードする
+        :param covered_from: 全てのタスクを置き換える場合に、実績タスクを漏れなく取得した期間の開始日時
+        :param uploads: Falseの場合は差分ファイルをアップロードせず、次回のflushでまとめてアップロードする
+        """
+        try:
+            # GCSとの通信中も、同じイベントループの他の処理(リクエスト)を止めない
+            async with self._task_store_lock:
+                if fetched_at is not None:
+                    await asyncio.to_thread(
+                        journal.replace_all,
+                        scheduled_tasks,
+                        executed_tasks,
+                        fetched_at,
+                        covered_from,
+                    )
+                    self.logger.info("タスクストアのスナップショットを保存")
+                else:
+                    await asyncio.to_thread(
+                        journal.append, scheduled_tasks, executed_tasks, uploads=uploads
+                    )
+                    self.logger.info("タスクストアの差分を保存")
+        except Exception as e:
+            self.logger.critical(
+                f"タスクストアの保存に失敗。エラー内容: {TracebackConverter(e).get_all()}"
+            )
+
+    async def _load_dead_letters(self, gcs_handler: Optional[GCSHandler]) -> None:
+        """デッドレターをGCSからダウンロードして読み込む"""
         try:
             if not config.DEBUG_MODE and gcs_handler is not None:
                 gcs_handler.download(
-                    from_=bucket_path,
-                    to=cache.save_path,
+                    from_=config.BUCKET_DEAD_LETTER_PATH,
+                    to=self.dead_letter_store.save_path,
                 )
-                self.logger.info("PickleをGCSからダウンロード成功")
         except Exception as e:
             self.logger.info(
-                f"PickleをGCSからダウンロード失敗。エラー内容: {TracebackConverter(e).get_all()}"
+                f"デッドレターをGCSからダウンロード失敗。エラー内容: {TracebackConverter(e).get_all()}"
             )
 
         try:
-            # Pickleから予定タスクを読み込む
-            obj = cache.load()
-            self.logger.info(f"Pickleの読み込みに成功: {cache.save_path}")
-            return obj
+            self.dead_letter_store.load()
         except Exception as e:
-            self.logger.critical(
-                f"Pickleの読み込みに失敗。エラー内容: {TracebackConverter(e).get_all()}"
+            self.logger.error(
+                f"デッドレターの読み込みに失敗。エラー内容: {TracebackConverter(e).get_all()}"
             )
-            return None
 
-    async def _save_pickle(
-        self,
-        obj: object,
-        gcs_handler: Optional[GCSHandler],
-        bucket_path: str,
-        cache: PickleHandler,
-    ):
-        """GCSにPickleをアップロードするメソッド"""
+    async def _drain_dead_letters(self) -> int:
+        """読み込み済みのデッドレターの、退避していたページ更新を再送する
+
+        :return: 再送を試みたデッドレターの件数
+        """
+        dead_letters = self.dead_letter_store.pop_all()
+        if not dead_letters:
+            return 0
+
+        self.logger.info(f"デッドレターの再送件数: {len(dead_letters)}")
+        await asyncio.gather(
+            *[self._resend_dead_letter(dead_letter) for dead_letter in dead_letters]
+        )
+        return len(dead_letters)
+
+    async def _resend_dead_letter(self, dead_letter: DeadLetter) -> None:
+        """デッドレターのページ更新を再送し、失敗した場合は再度退避する
+
+        退避後にページが編集されている場合は、古い更新内容で上書きしないよう破棄する
+        (編集後の内容は、編集を取得したレギュラータスクもしくはデイリータスクで更新される)
+        """
+        repo = (
+            self.scheduled_task_repo
+            if dead_letter.kind == DeadLetterStore.SCHEDULED
+            else self.executed_task_repo
+        )
         try:
-            cache.save(
-                tasks=obj,
+            page = await repo.retrieve_page(page_id=dead_letter.page_id)
+            if dead_letter.is_outdated(page["last_edited_time"]):
+                self.logger.info(
+                    f"タスク[{dead_letter.task_number}]は退避後に編集されたため、更新の再送を破棄します"
+                )
+                return
+            await repo.update_page(
+                page_id=dead_letter.page_id,
+                properties=dead_letter.properties,
             )
-            self.logger.info(f"Pickleの保存に成功: {cache.save_path}")
+            self.logger.info(f"タスク[{dead_letter.task_number}]の更新を再送")
+        except Exception as e:
+            if not RetryPolicy.is_transient_error(e):
+                self.logger.error(
+                    f"タスク[{dead_letter.task_number}]の更新の再送に失敗したため破棄します。エラー内容: {TracebackConverter(e).get_all()}"
+                )
+                return
+            dead_letter.attempts += 1
+            dead_letter.error = str(e)
+            self.dead_letter_store.append(dead_letter)
+            self.logger.error(
+                f"タスク[{dead_letter.task_number}]の更新の再送に失敗({dead_letter.attempts}回目)。エラー内容: {TracebackConverter(e).get_all()}"
+            )
+
+    async def _save_dead_letters(
+        self, gcs_handler: Optional[GCSHandler], has_drained: bool
+    ) -> None:
+        """デッドレターを保存し、GCSへアップロードする
 
+        退避中のデッドレターがなく、再送もしていない場合はスキップする
+        """
+        if len(self.dead_letter_store) == 0 and not has_drained:
+            return
+
+        self.logger.info(f"未送信のデッドレター件数: {len(self.dead_letter_store)}")
+        try:
+            self.dead_letter_store.save()
+            if not config.DEBUG_MODE and gcs_handler is not None:
+                gcs_handler.upload(
+                    from_=self.dead_letter_store.save_path,
+                    to=config.BUCKET_DEAD_LETTER_PATH,
+                )
         except Exception as e:
-            self.logger.critical(
-                f"Pickleの保存に失敗。エラー内容: {TracebackConverter(e).get_all()}"
+            self.logger.error(
+                f"デッドレターの保存に失敗。エラー内容: {TracebackConverter(e).get_all()}"
+            )
+
+    async def _load_written_properties(self, gcs_handler: Optional[GCSHandler]) -> None:
+        """書き込み済みプロパティの記録をGCSからダウンロードして読み込む"""
+        try:
+            if not config.DEBUG_MODE and gcs_handler is not None:
+                gcs_handler.download(
+                    from_=config.BUCKET_WRITTEN_PROPERTY_PATH,
+                    to=self.written_property_store.save_path,
+                )
+        except Exception as e:
+            self.logger.info(
+                f"書き込み済みプロパティをGCSからダウンロード失敗。エラー内容: {TracebackConverter(e).get_all()}"
+            )
+
+        try:
+            self.written_property_store.load()
+        except Exception as e:
+            self.logger.error(
+                f"書き込み済みプロパティの読み込みに失敗。エラー内容: {TracebackConverter(e).get_all()}"
             )
 
+    async def _save_written_properties(self, gcs_handler: Optional[GCSHandler]) -> None:
+        """書き込み済みプロパティの記録を保存し、GCSへアップロードする"""
+        self.logger.info(
+            f"前回と同じ内容のため省略した更新数: {self.written_property_store.skipped_count}"
+        )
         try:
+            self.written_property_store.save()
             if not config.DEBUG_MODE and gcs_handler is not None:
-                # pickleをGCSにアップロードする
                 gcs_handler.upload(
-                    from_=cache.save_path,
-                    to=bucket_path,
+                    from_=self.written_property_store.save_path,
+                    to=config.BUCKET_WRITTEN_PROPERTY_PATH,
                 )
-                self.logger.info("PickleをGCSへアップロード成功")
         except Exception as e:
             self.logger.error(
-                f"PickleをGCSへアップロード失敗。エラー内容: {TracebackConverter(e).get_all()}"
+                f"書き込み済みプロパティの保存に失敗。エラー内容: {TracebackConverter(e).get_all()}"
             )
 
+    async def _load_remind_progress(self, gcs_handler: Optional[GCSHandler]) -> None:
+        """リマインドを通知し終えた日時をGCSからダウンロードして読み込む"""
+        try:
+            if not config.DEBUG_MODE and gcs_handler is not None:
+                gcs_handler.download(
+                    from_=config.BUCKET_REMIND_PROGRESS_PATH,
+                    to=self.remind_progress_store.save_path,
+                )
+        except Exception as e:
+            self.logger.info(
+                f"リマインドの通知済み日時をGCSからダウンロード失敗。エラー内容: {TracebackConverter(e).get_all()}"
+            )
+
+        try:
+            self.remind_progress_store.load()
+        except Exception as e:
+            self.logger.error(
+                f"リマインドの通知済み日時の読み込みに失敗。エラー内容: {TracebackConverter(e).get_all()}"
+            )
+
+    async def _save_remind_progress(
+        self, gcs_handler: Optional[GCSHandler], reminded_until: datetime
+    ) -> None:
+        """リマインドを通知し終えた日時を保存し、GCSへアップロードする"""
+        try:
+            self.remind_progress_store.reminded_until = reminded_until
+            self.remind_progress_store.save()
+            if not config.DEBUG_MODE and gcs_handler is not None:
+                gcs_handler.upload(
+                    from_=self.remind_progress_store.save_path,
+                    to=config.BUCKET_REMIND_PROGRESS_PATH,
+                )
+        except Exception as e:
+            self.logger.error(
+                f"リマインドの通知済み日時の保存に失敗。エラー内容: {TracebackConverter(e).get_all()}"
+            )
+
+    def _get_remind_from(self, now: datetime) -> datetime:
+        """リマインドを通知する期間の開始日時(この日時より後のリマインドを通知する)を取得する
+
+        前回の実行で通知し終えた日時とする。記録が無い場合は1分前とし、
+        猶予時間(config.REMINDER_GRACE_MINUTES)より前のリマインドは通知しない
+        """
+        reminded_until = self.remind_progress_store.reminded_until
+        if reminded_until is None:
+            return now - timedelta(minutes=1)
+        earliest = now - timedelta(minutes=config.REMINDER_GRACE_MINUTES)
+        return min(max(reminded_until, earliest), now)
+
     async def _update_scheduled_tasks(
         self,
         scheduled_tasks: ScheduledTasks,
@@ -0,0 +1,87 @@
+import asyncio
+from datetime import datetime
+import time
+from typing import Awaitable, Callable
+
+from cachetools import TTLCache
+
+import notiontaskr.config as config
+from notiontaskr.application.dto.uptime_data import UptimeDataByTag
+from notiontaskr.domain.tags import Tags
+
+# (ソート済みのタグ, 開始日時, 終了日時)
+UptimeCacheKey = tuple[tuple[str, ...], datetime, datetime]
+
+
+class UptimeCache:
+    """稼働実績の集計結果をキャッシュし、同じ条件の集計を1回にまとめるクラス
+
+    - 集計結果は(ソート済みのタグ, 開始日時, 終了日時)ごとに、有効期間と件数の上限付きで保持する
+      (上限を超えた場合は最も使われていない結果から破棄する)
+    - 同じ条件の集計が実行中の場合は、新たに集計せずに実行中の集計結果を待つ
+    - タスクストアが更新された場合は、呼び出し元がclearで全ての集計結果を破棄する
+    - 返した集計結果は複数の呼び出し元で共有するため、変更しないこと
+    """
+
+    def __init__(
+        self,
+        maxsize: int = config.UPTIME_CACHE_MAXSIZE,
+        ttl: float = config.UPTIME_CACHE_TTL_SECONDS,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self._cache: TTLCache[UptimeCacheKey, UptimeDataByTag] = TTLCache(
+            maxsize=maxsize, ttl=ttl, timer=timer
+        )
+        # 実行中の集計
+        self._in_flight: dict[UptimeCacheKey, asyncio.Future] = {}
+
+    async def get_or_compute(
+        self,
+        tags: Tags,
+        from_: datetime,
+        to: datetime,
+        compute: Callable[[], Awaitable[UptimeDataByTag]],
+    ) -> UptimeDataByTag:
+        """キャッシュした集計結果を取得する。無い場合はcomputeで集計する
+
+        :param compute: 集計する関数。同じ条件の集計が実行中の場合は呼び出さない
+        """
+        key = self._get_key(tags, from_, to)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(compute())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda f: self._on_computed(key, f))
+        # 呼び出し元がキャンセルされても、待っている他の呼び出し元の集計は止めない
+        return await asyncio.shield(future)
+
+    def _on_computed(self, key: UptimeCacheKey, future: asyncio.Future) -> None:
+        """集計が完了した場合に、成功した集計結果をキャッシュする
+
+        集計中に破棄された条件の集計結果はキャッシュしない
+        """
+        if self._in_flight.get(key) is not future:
+            return
+        del self._in_flight[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        self._cache[key] = future.result()
+
+    def clear(self) -> None:
+        """全ての集計結果を破棄する
+
+        実行中の集計は完了してもキャッシュせず、以降の呼び出しで集計し直す
+        """
+        self._cache.clear()
+        self._in_flight.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @staticmethod
+    def _get_key(tags: Tags, from_: datetime, to: datetime) -> UptimeCacheKey:
+        return tuple(sorted({str(tag) for tag in tags})), from_, to
@@ -0,0 +1,233 @@
+from datetime import datetime
+import json
+import os
+from typing import Awaitable, Callable, Optional
+from urllib.parse import parse_qs
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from notiontaskr.app_logger import AppLogger
+from notiontaskr.application.daily_task_job_runner import DailyTaskJobRunner
+from notiontaskr.application.task_application_service import TaskApplicationService
+from notiontaskr.domain.tags import Tags
+from notiontaskr.domain.value_objects.tag import Tag
+from notiontaskr.util.converter import dt_to_month_start_end
+from notiontaskr.util.traceback_converter import TracebackConverter
+
+# (ステータスコード, Content-Type, 本文)
+Response = tuple[int, str, str]
+
+
+class AsgiApp:
+    """Webサービスのエンドポイントを提供するASGIアプリケーション
+
+    - ワーカー(プロセス)ごとに1つのイベントループで全てのリクエストを処理する
+      (リクエストごとにasyncio.runでイベントループを作り直さない)
+    - TaskApplicationServiceとNotionのコネクションプールをリクエスト間で共有する
+    - Notionへの問い合わせを待つ間も、同じワーカーで他のリクエストを並行して処理する
+
+    起動例: uvicorn notiontaskr.asgi:app --host 0.0.0.0 --port 8080 --workers 2
+    """
+
+    TEXT = "text/plain; charset=utf-8"
+    HTML = "text/html; charset=utf-8"
+    JSON = "application/json; charset=utf-8"
+
+    def __init__(
+        self,
+        service_factory: Callable[[], TaskApplicationService] = TaskApplicationService,
+        template_dir: str = os.path.join(os.path.dirname(__file__), "templates"),
+    ):
+        """
+        :param service_factory: ワーカーで共有するTaskApplicationServiceを生成する。
+            最初のリクエストもしくは起動時に1度だけ呼び出す
+        """
+        self.service_factory = service_factory
+        self._service: Optional[TaskApplicationService] = None
+        self._daily_task_job_runner: Optional[DailyTaskJobRunner] = None
+        self.logger = AppLogger().get()
+        self.templates = Environment(
+            loader=FileSystemLoader(template_dir),
+            autoescape=select_autoescape(),
+        )
+        self.routes: dict[
+            str, Callable[[dict[str, list[str]]], Awaitable[Response]]
+        ] = {
+            "/": self.index,
+            "/run-daily-task": self.run_daily_task,
+            "/daily-task-status": self.get_daily_task_status,
+            "/uptime_from_start_end": self.get_uptime_from_start_end,
+            "/uptime_from_month": self.get_uptime_from_month,
+        }
+
+    @property
+    def service(self) -> TaskApplicationService:
+        if self._service is None:
+            self._service = self.service_factory()
+        return self._service
+
+    @property
+    def daily_task_job_runner(self) -> DailyTaskJobRunner:
+        if self._daily_task_job_runner is None:
+            self._daily_task_job_runner = DailyTaskJobRunner(service=self.service)
+        return self._daily_task_job_runner
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] == "lifespan":
+            await self._handle_lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        handler = self.routes.get(scope["path"])
+        if handler is None:
+            response: Response = (404, self.TEXT, "Not Found")
+        elif scope["method"] not in ("GET", "HEAD"):
+            response = (405, self.TEXT, "Method Not Allowed")
+        else:
+            query = parse_qs(scope.get("query_string", b"").decode("utf-8"))
+            try:
+                response = await handler(query)
+            except Exception as e:
+                self.logger.error(
+                    f"リクエスト[{scope['path']}]の処理に失敗。エラー内容: {TracebackConverter(e).get_all()}"
+                )
+                response = (500, self.TEXT, "Internal Server Error")
+        await self._send_response(send, response, is_head=scope["method"] == "HEAD")
+
+    async def _handle_lifespan(self, receive: Callable, send: Callable) -> None:
+        """起動時にサービスを生成し、終了時にNotionのコネクションを解放する"""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                _ = self.service
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._service is not None:
+                    await self._service.notion_client_pool.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _send_response(send: Callable, response: Response, is_head: bool):
+        status, content_type, body = response
+        data = body.encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", content_type.encode("ascii")),
+                    (b"content-length", str(len(data)).encode("ascii")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"" if is_head else data})
+
+    async def index(self, query: dict[str, list[str]]) -> Response:
+        return 200, self.HTML, self.templates.get_template("index.html").render()
+
+    async def run_daily_task(self, query: dict[str, list[str]]) -> Response:
+        """dayly_taskをバックグラウンドで実行するエンドポイント
+
+        完了を待たずにジョブIDを返す。実行中の場合は実行中のジョブIDを返す
+        """
+        job = self.daily_task_job_runner.start()
+        return (
+            202,
+            self.JSON,
+            json.dumps(
+                {
+                    "job_id": job.id,
+                    "status": str(job.status),
+                    "status_url": f"/daily-task-status?job_id={job.id}",
+                }
+            ),
+        )
+
+    async def get_daily_task_status(self, query: dict[str, list[str]]) -> Response:
+        """dayly_taskのジョブの状態と、処理ごとの経過時間を取得するエンドポイント
+
+        例: https://example.com/daily-task-status?job_id=xxx
+        job_idを省略した場合は最後に開始したジョブの状態を返す
+        """
+        job_id = self._get_param(query, "job_id")
+        job = (
+            self.daily_task_job_runner.get(job_id)
+            if job_id
+            else self.daily_task_job_runner.get_latest()
+        )
+        if job is None:
+            return 404, self.TEXT, "Job not found"
+        return 200, self.JSON, json.dumps(job.to_dict(), ensure_ascii=False)
+
+    async def get_uptime_from_start_end(self, query: dict[str, list[str]]) -> Response:
+        """uptimeを取得するエンドポイント
+
+        タグ配列、開始日、終了日をクエリパラメータとして受け取る
+        例: https://example.com/uptime_from_start_end?tags=tag1&start_year=2024&start_month=12&end_year=2025&end_month=1
+        """
+        tags = query.get("tags", [])
+        start_year = self._get_param(query, "start_year")
+        start_month = self._get_param(query, "start_month")
+        end_year = self._get_param(query, "end_year")
+        end_month = self._get_param(query, "end_month")
+
+        if (
+            not tags
+            or not start_year
+            or not start_month
+            or not end_year
+            or not end_month
+        ):
+            return 400, self.TEXT, "Invalid parameters"
+
+        start_of_month = datetime(year=int(start_year), month=int(start_month), day=1)
+        end_dt = datetime(year=int(end_year), month=int(end_month), day=1)
+        _, end_of_month = dt_to_month_start_end(end_dt)
+
+        return await self._get_uptime(tags, from_=start_of_month, to=end_of_month)
+
+    async def get_uptime_from_month(self, query: dict[str, list[str]]) -> Response:
+        """uptimeを取得するエンドポイント
+
+        タグ配列、年月をクエリパラメータとして受け取る
+        例: https://example.com/uptime_from_month?tags=tag1&year=2024&month=12
+        """
+        tags = query.get("tags", [])
+        year = self._get_param(query, "year")
+        month = self._get_param(query, "month")
+
+        if not tags or not year or not month:
+            return 400, self.TEXT, "Invalid parameters"
+
+        start, end = dt_to_month_start_end(
+            datetime(year=int(year), month=int(month), day=1)
+        )
+        return await self._get_uptime(tags, from_=start, to=end)
+
+    async def _get_uptime(
+        self, tags: list[str], from_: datetime, to: datetime
+    ) -> Response:
+        uptime_data_by_tag = await self.service.get_uptime(
+            from_=from_,
+            to=to,
+            tags=Tags.from_tags([Tag(tag.strip()) for tag in tags]),
+        )
+        return 200, self.JSON, uptime_data_by_tag.to_json()
+
+    @staticmethod
+    def _get_param(query: dict[str, list[str]], key: str) -> Optional[str]:
+        """クエリパラメータの最初の値を取得する"""
+        values = query.get(key)
+        return values[0] if values else None
+
+
+app = AsgiApp()
+
+
+# 動作確認用
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=5000)
@@ -28,6 +28,17 @@ LOG_PATH = os.path.join(LOG_DIR, "app.log")  # ログファイルの出力先
 # ==================== Notion API設定 ====================
 NOTION_TOKEN = os.getenv("NOTION_TOKEN")
 TASK_DB_ID = os.getenv("TASK_DB_ID")
+NOTION_MAX_CONNECTIONS = 10  # Notion APIへの最大同時接続数
+NOTION_MAX_KEEPALIVE_CONNECTIONS = 10  # 維持するkeep-alive接続数
+NOTION_RATE_LIMIT_PER_SECOND = 3.0  # 秒間リクエスト数の上限（Notionの平均レート制限）
+NOTION_RATE_LIMIT_BURST = 3  # 瞬間的に許容するリクエスト数
+NOTION_INITIAL_CONCURRENCY = 3  # 同時実行数の初期値
+NOTION_MAX_CONCURRENCY = NOTION_MAX_CONNECTIONS  # 同時実行数の上限
+NOTION_MAX_RATE_LIMITED_RETRIES = 5  # 429応答時の再送回数の上限
+NOTION_RETRY_MAX_ATTEMPTS = 4  # 一時的なエラー時の最大試行回数
+NOTION_RETRY_BASE_DELAY = 0.5  # 再試行の基準待機時間（秒）
+NOTION_RETRY_MAX_DELAY = 8.0  # 再試行の最大待機時間（秒）
+NOTION_PREFETCH_PAGES = 2  # 検索結果の変換を待たずに先読みするページ数
 
 # ==================== Slack API設定 ====================
 SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL")  # SlackのWebhook URL
@@ -35,18 +46,55 @@ NOTIFIER = SlackNotifier(webhook_url=SLACK_WEBHOOK_URL)  # type: ignore
 DEFAULT_BEFORE_START_MINUTES = 5  # 開始前通知のデフォルト時間（分）
 DEFAULT_BEFORE_END_MINUTES = 5  # 終了前通知のデフォルト時間（分）
 
-# ==================== pickleファイル設定 ====================
+# ==================== タスクの紐づけ設定 ====================
+# IDラベルの無い実績タスクと予定タスクを、全角・半角や空白の違いを無視した名前で照合する
+NORMALIZE_TASK_NAME_MATCHING = True
+
+# ==================== タスクストア設定 ====================
 BUCKET_NAME = "notion-api-bucket"  # GCSバケット名
-# ローカルのpickleファイルの保存先
-LOCAL_SCHEDULED_PICKLE_PATH = os.path.join(CACHE_DIR, "scheduled_task.pkl")
-# ローカルの実績タスクpickleファイルの保存先
-LOCAL_EXECUTED_PICKLE_PATH = os.path.join(CACHE_DIR, "executed_task.pkl")
-BUCKET_SCHEDULED_PICKLE_PATH = (
-    "/notion-api/cache/scheduled_task.pkl"  # GCSのpickleファイルの保存先
-)
-BUCKET_EXECUTED_PICKLE_PATH = (
-    "/notion-api/cache/executed_task.pkl"  # GCSの実績タスクpickleファイルの保存先
-)
+# ローカルのタスクストア(SQLite)の保存先
+LOCAL_TASK_STORE_PATH = os.path.join(CACHE_DIR, "tasks.sqlite3")
+BUCKET_TASK_STORE_PATH = "/notion-api/cache/tasks.sqlite3"  # GCSのタスクストアの保存先
+# GCSからダウンロードしたスナップショットの保存先(ローカルでは書き換えず、条件付きダウンロードに使用する)
+LOCAL_TASK_STORE_SNAPSHOT_PATH = os.path.join(CACHE_DIR, "tasks.snapshot.sqlite3")
+# レギュラータスクで更新したタスクの差分ファイルの保存先
+LOCAL_TASK_STORE_DELTA_DIR = os.path.join(CACHE_DIR, "task_deltas")
+BUCKET_TASK_STORE_DELTA_DIR = "/notion-api/cache/task_deltas/"
+# 差分ファイルがこの数に達したらスナップショットに統合する
+TASK_STORE_COMPACTION_DELTAS = 60
+# 稼働実績の集計時にタスクストアをGCSから読み込み直す間隔(秒)
+UPTIME_TASK_STORE_REFRESH_SECONDS = 60
+# 稼働実績の集計結果をキャッシュする件数と有効期間(秒)
+UPTIME_CACHE_MAXSIZE = 256
+UPTIME_CACHE_TTL_SECONDS = 60
+
+# ==================== デッドレター設定 ====================
+# 再試行しても更新できなかったページ更新内容の保存先
+LOCAL_DEAD_LETTER_PATH = os.path.join(CACHE_DIR, "dead_letters.json")
+BUCKET_DEAD_LETTER_PATH = "/notion-api/cache/dead_letters.json"
+
+# ==================== 書き込み済みプロパティ設定 ====================
+# 最後に書き込みに成功したページプロパティのハッシュの保存先
+LOCAL_WRITTEN_PROPERTY_PATH = os.path.join(CACHE_DIR, "written_properties.json")
+BUCKET_WRITTEN_PROPERTY_PATH = "/notion-api/cache/written_properties.json"
+
+# ==================== バックグラウンドジョブ設定 ====================
+# 状態を取得できるデイリータスクのジョブ数(古いジョブから破棄する)
+DAILY_TASK_JOB_HISTORY = 10
+# 常駐プロセスでレギュラータスクを実行する間隔(秒)
+REGULAR_TASK_INTERVAL_SECONDS = 60
+# 常駐プロセスで保持している状態をGCSに保存する間隔(秒)
+REGULAR_TASK_CHECKPOINT_SECONDS = 600
+
+# ==================== リマインド設定 ====================
+# リマインド日時を過ぎてもこの時間(分)以内であれば通知する(これより古いリマインドは破棄する)
+REMINDER_GRACE_MINUTES = 15
+# 常駐プロセスでタスクストアから読み込むリマインド対象の実績タスクの開始日時の範囲(時間)
+REMINDER_LOOKBACK_HOURS = 24
+REMINDER_LOOKAHEAD_HOURS = 48
+# レギュラージョブでリマインドを通知し終えた日時の保存先(前回の実行以降のリマインドを通知する)
+LOCAL_REMIND_PROGRESS_PATH = os.path.join(CACHE_DIR, "remind_progress.json")
+BUCKET_REMIND_PROGRESS_PATH = "/notion-api/cache/remind_progress.json"
 
 # ==================== タスク名ラベル設定 ====================
 # 名前ラベルの絵文字（例: [⏱️0/2]）
@@ -67,6 +67,7 @@ class ExecutedTask(Task):
                 # 開始前通知時間と終了前通知時間が設定されていない場合はデフォルト値で更新
                 instance.update_remind_info(instance.remind_info.get_default_self())
 
+            instance.last_edited_time = data.get("last_edited_time")
             return instance
 
         except KeyError as e:
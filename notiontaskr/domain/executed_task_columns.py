@@ -0,0 +1,78 @@
+from typing import Iterable
+
+import numpy as np
+
+from notiontaskr.domain.executed_tasks import ExecutedTasks
+from notiontaskr.domain.value_objects.tag import Tag
+
+
+class ExecutedTaskColumns:
+    """実績タスクを列(NumPy配列)ごとに保持し、工数をベクトル演算で集計するクラス
+
+    - 人時とタグのビットマップを保持する
+    - タグごとの集計を、タスクごとのループではなく配列演算で行う
+    - タスクストアの実績タスクは集計表(uptime_cube)で集計するため、
+      Notionから取得した実績タスクの集計にのみ使用する
+    """
+
+    def __init__(
+        self,
+        hours: np.ndarray,
+        tag_bitmaps: np.ndarray,
+        tags: list[Tag],
+    ):
+        """
+        :param tag_bitmaps: タスクごとのタグのビットマップ(np.packbitsで詰めたもの)
+        :param tags: ビットマップの各ビットに対応するタグ
+        """
+        self.hours = hours
+        self.tag_bitmaps = tag_bitmaps
+        self.tags = tags
+        self._tag_indexes = {tag: i for i, tag in enumerate(tags)}
+
+    @classmethod
+    def from_tasks(cls, tasks: ExecutedTasks) -> "ExecutedTaskColumns":
+        """実績タスクから列を作成する"""
+        tag_indexes: dict[Tag, int] = {}
+        for task in tasks:
+            for tag in task.tags:
+                tag_indexes.setdefault(tag, len(tag_indexes))
+
+        count = len(tasks)
+        hours = np.zeros(count)
+        tag_matrix = np.zeros((count, len(tag_indexes)), dtype=bool)
+        for i, task in enumerate(tasks):
+            hours[i] = task.man_hours.value
+            for tag in task.tags:
+                tag_matrix[i, tag_indexes[tag]] = True
+
+        return cls(
+            hours=hours,
+            tag_bitmaps=np.packbits(tag_matrix, axis=1),
+            tags=list(tag_indexes),
+        )
+
+    def __len__(self) -> int:
+        return len(self.hours)
+
+    def get_tag_matrix(self, tags: Iterable[Tag]) -> np.ndarray:
+        """指定したタグを持つかどうかの行列(タスク数×タグ数の真偽値)を取得する
+
+        存在しないタグの列は全てFalseになる
+        """
+        tags = list(tags)
+        matrix = np.zeros((len(self), len(tags)), dtype=bool)
+        for column, tag in enumerate(tags):
+            index = self._tag_indexes.get(tag)
+            if index is None:
+                continue
+            matrix[:, column] = (
+                self.tag_bitmaps[:, index >> 3] >> (7 - (index & 7))
+            ) & 1
+        return matrix
+
+    def sum_man_hours_by_tag(self, tags: Iterable[Tag]) -> dict[Tag, float]:
+        """タグごとの人時の合計を取得する"""
+        tags = list(tags)
+        totals = self.hours @ self.get_tag_matrix(tags)
+        return {tag: float(total) for tag, total in zip(tags, totals)}
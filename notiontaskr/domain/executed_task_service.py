@@ -1,28 +1,62 @@
+from notiontaskr import config
 from notiontaskr.domain.executed_task import ExecutedTask
 from notiontaskr.domain.executed_tasks import ExecutedTasks
 
 from notiontaskr.domain.value_objects.man_hours import ManHours
 
 from notiontaskr.domain.scheduled_tasks import ScheduledTasks
+from notiontaskr.util.converter import normalize_task_name
 
 
 class ExecutedTaskService:
 
+    def __init__(
+        self, normalizes_task_name: bool = config.NORMALIZE_TASK_NAME_MATCHING
+    ):
+        """
+        :param normalizes_task_name: Trueの場合、全角・半角や空白の違いを無視してタスク名を照合する
+        """
+        self.normalizes_task_name = normalizes_task_name
+
     def get_scheduled_tasks_added_executed_id(
         self, to: ExecutedTasks, source: ScheduledTasks
     ) -> ScheduledTasks:
         """予定タスクと同じ名前を持つ実績タスクに同じIDを付与し、
-        新たにIDが付与された予定タスクのみを返却する"""
+        新たにIDが付与された予定タスクのみを返却する
+
+        同じ名前の予定タスクが複数ある場合は、先に見つかった予定タスクのIDを付与する"""
+        # タスク名 -> 予定タスクの索引(IDラベルの無い実績タスクがある場合のみ、1度だけ作成する)
+        scheduled_tasks_by_name = None
+
         updated_tasks = ScheduledTasks.from_empty()
         for executed_task in to:
             if executed_task.name.id_label is not None:
                 continue
-            for scheduled_task in source:
-                if executed_task.name.task_name == scheduled_task.name.task_name:
-                    executed_task.update_id_label(scheduled_task.name.id_label)  # type: ignore (予定タスクのIDがNoneになることはない)
-                    executed_task.update_scheduled_task_id(scheduled_task.id)
-                    updated_tasks.append(scheduled_task)
-                    break
+            if scheduled_tasks_by_name is None:
+                scheduled_tasks_by_name = self._get_scheduled_tasks_by_name(source)
+            scheduled_task = scheduled_tasks_by_name.get(
+                self._get_matching_key(executed_task.name.task_name)
+            )
+            if scheduled_task is None:
+                continue
+            executed_task.update_id_label(scheduled_task.name.id_label)  # type: ignore (予定タスクのIDがNoneになることはない)
+            executed_task.update_scheduled_task_id(scheduled_task.id)
+            updated_tasks.append(scheduled_task)
 
         # 更新した予定タスクを取得する(重複除去)
         return updated_tasks.get_unique_tasks_by_id()
+
+    def _get_scheduled_tasks_by_name(self, source: ScheduledTasks) -> dict:
+        """照合に使用するタスク名ごとの予定タスクの辞書を作成する(先に見つかった予定タスクを優先)"""
+        scheduled_tasks_by_name = {}
+        for scheduled_task in source:
+            scheduled_tasks_by_name.setdefault(
+                self._get_matching_key(scheduled_task.name.task_name), scheduled_task
+            )
+        return scheduled_tasks_by_name
+
+    def _get_matching_key(self, task_name: str) -> str:
+        """照合に使用するタスク名を取得する"""
+        if self.normalizes_task_name:
+            return normalize_task_name(task_name)
+        return task_name
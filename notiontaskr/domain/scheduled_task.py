@@ -98,6 +98,7 @@ class ScheduledTask(Task):
                 # 開始前通知時間と終了前通知時間が設定されていない場合はデフォルト値で更新
                 instance.update_remind_info(instance.remind_info.get_default_self())
 
+            instance.last_edited_time = data.get("last_edited_time")
             return instance
         except KeyError as e:
             raise ValueError(f"In ScheduledTask[{task_number}] initialize error, {e}")
@@ -134,11 +135,18 @@ class ScheduledTask(Task):
         ):
             self.update_status(Status.NOT_STARTED)
 
-    def _update_status_by_checking_sub_tasks(self):
+    def _update_status_by_checking_sub_tasks(
+        self, sub_tasks: "ScheduledTasks", updates_sub_tasks: bool = True
+    ):
+        """サブアイテムのステータスを集計し、ステータスを更新する
+
+        :param updates_sub_tasks: Falseの場合はサブアイテムのステータスを更新済みとみなす
+        """
         # サブアイテムのステータスを更新し、ステータスを集計する
         statuses = []
-        for sub_task in self.sub_tasks:
-            sub_task.update_status_by_checking_properties()
+        for sub_task in sub_tasks:
+            if updates_sub_tasks:
+                sub_task.update_status_by_checking_properties()
             statuses.append(sub_task.status)
 
         if all(status == Status.COMPLETED for status in statuses):
@@ -154,8 +162,20 @@ class ScheduledTask(Task):
             self.update_status(Status.NOT_STARTED)
 
     def update_status_by_checking_properties(self):
-        """タスクのプロパティに応じてステータスを更新する"""
+        """タスクのプロパティに応じてステータスを更新する(サブアイテムも再帰的に更新する)"""
+        self._update_status_by_checking_properties(
+            sub_tasks=self.sub_tasks, updates_sub_tasks=True
+        )
 
+    def update_status_by_rolled_up_sub_tasks(self, sub_tasks: "ScheduledTasks"):
+        """ステータスを更新済みのサブアイテムから、自身のステータスのみを更新する"""
+        self._update_status_by_checking_properties(
+            sub_tasks=sub_tasks, updates_sub_tasks=False
+        )
+
+    def _update_status_by_checking_properties(
+        self, sub_tasks: "ScheduledTasks", updates_sub_tasks: bool
+    ):
         if self.status == Status.CANCELED:
             # ステータスが中止の場合は、何もしない
             return
@@ -168,9 +188,11 @@ class ScheduledTask(Task):
             # 実績タスクの進捗を確認し、ステータスを更新する
             self._update_status_by_checking_executed_tasks()
 
-        if self.sub_tasks and len(self.sub_tasks) != 0:
+        if sub_tasks and len(sub_tasks) != 0:
             # サブアイテムのステータスを確認し、ステータスを更新する
-            self._update_status_by_checking_sub_tasks()
+            self._update_status_by_checking_sub_tasks(
+                sub_tasks, updates_sub_tasks=updates_sub_tasks
+            )
 
         if self.is_delayed():
             # タスクが遅延している場合は、ステータスを遅延にする
@@ -204,17 +226,21 @@ class ScheduledTask(Task):
             [task for task in self.sub_tasks if task.status == Status.COMPLETED]
         )
 
-        # サブアイテムの予定人時合計を取得する
-        sub_tasks_properties = self.sub_tasks.sum_properties()
-        total_scheduled_hours = sub_tasks_properties.scheduled_man_hours
+        self._update_progress_rate_by_man_hours(
+            # サブアイテムの予定人時合計
+            total_scheduled_hours=self.sub_tasks.sum_properties().scheduled_man_hours,
+            # 完了済みサブアイテムの予定人時合計
+            done_scheduled_hours=done_tasks.sum_properties().scheduled_man_hours,
+        )
+
+    def _update_progress_rate_by_man_hours(
+        self, total_scheduled_hours: ManHours, done_scheduled_hours: ManHours
+    ):
+        """完了済みサブアイテムの予定人時合計 / 全サブアイテムの予定人時合計 で進捗率を更新する"""
         if total_scheduled_hours == ManHours(0):
             self.update_progress_rate(ProgressRate(0.0))
             return
 
-        # 完了済みサブアイテムの予定人時合計を取得する
-        done_tasks_properties = done_tasks.sum_properties()
-        done_scheduled_hours = done_tasks_properties.scheduled_man_hours
-
         # 進捗率を計算する
         self.update_progress_rate(
             ProgressRate.from_man_hours(
@@ -268,6 +294,44 @@ class ScheduledTask(Task):
             sub_executed_man_hours + executed_tasks_properties.man_hours
         )
 
+    def rollup_properties(self, sub_tasks: "ScheduledTasks"):
+        """集計済みのサブアイテムから、工数・ステータス・進捗率をまとめて更新する
+
+        サブアイテムのプロパティは更新済みであること(ScheduledTaskRollupを参照)。
+        サブアイテムは再帰的に更新せず、1度の走査で集計する
+
+        :param sub_tasks: 集計するサブアイテム(循環する関連を除いたもの)
+        """
+        scheduled_man_hours = ManHours(0)
+        executed_man_hours = ManHours(0)
+        done_scheduled_man_hours = ManHours(0)
+        for sub_task in sub_tasks:
+            scheduled_man_hours += sub_task.scheduled_man_hours
+            executed_man_hours += sub_task.executed_man_hours
+            if sub_task.status == Status.COMPLETED:
+                done_scheduled_man_hours += sub_task.scheduled_man_hours
+
+        # 工数を更新する
+        if len(sub_tasks) > 0:
+            self.update_scheduled_man_hours(scheduled_man_hours)
+        self.update_executed_man_hours(
+            executed_man_hours + self.executed_tasks.sum_properties().man_hours
+        )
+
+        # ステータスを更新する
+        self.update_status_by_rolled_up_sub_tasks(sub_tasks)
+
+        # 進捗率を更新する
+        if self.status == Status.COMPLETED:
+            self.update_progress_rate(ProgressRate(1.0))
+        elif len(sub_tasks) == 0:
+            self.update_progress_rate(ProgressRate(0.0))
+        else:
+            self._update_progress_rate_by_man_hours(
+                total_scheduled_hours=scheduled_man_hours,
+                done_scheduled_hours=done_scheduled_man_hours,
+            )
+
     def update_executed_man_hours(self, executed_man_hours: ManHours):
         """実績人時を更新する"""
         if self.executed_man_hours != executed_man_hours:
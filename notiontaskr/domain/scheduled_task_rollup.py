@@ -0,0 +1,108 @@
+from typing import Callable, Iterator, Optional
+
+from notiontaskr.domain.name_labels.man_hours_label import ManHoursLabel
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.domain.scheduled_tasks import ScheduledTasks
+
+
+class ScheduledTaskRollup:
+    """サブアイテムの階層を葉から親に向かって1度ずつ辿り、予定タスクのプロパティを集計するクラス
+
+    - 対象タスクとその子孫をトポロジカル順(サブアイテムが親タスクより先)に並べる
+    - 各タスクの工数・ステータス・進捗率を、集計済みのサブアイテムから1度の走査で更新する
+    - サブアイテムの関連が循環している場合は、循環を作る関連を無視して集計する
+    """
+
+    # 走査中のタスク(この状態のタスクへの関連は循環になる)
+    _VISITING = 1
+    # 走査済みのタスク
+    _VISITED = 2
+
+    def __init__(
+        self,
+        tasks: ScheduledTasks,
+        on_error: Optional[Callable[[Exception, ScheduledTask], None]] = None,
+        updates_sub_tasks: bool = True,
+    ):
+        """
+        :param tasks: プロパティを更新するタスク。子孫のタスクはステータスのみ更新する
+        :param on_error: サブアイテムの循環を検出した場合に、循環を作る関連の親タスクと共に呼び出す
+        :param updates_sub_tasks: Falseの場合、対象外のサブアイテムは集計済みとみなして辿らない
+        """
+        self.tasks = tasks
+        self.on_error = on_error
+        self.updates_sub_tasks = updates_sub_tasks
+
+    def get_order(self) -> list[tuple[ScheduledTask, ScheduledTasks]]:
+        """対象タスクとその子孫を、サブアイテムが親タスクより先になる順に取得する
+
+        再帰の深さに依存しないよう、明示的なスタックで深さ優先探索する
+
+        :return: (タスク, 循環する関連を除いたサブアイテム)のリスト
+        """
+        order: list[tuple[ScheduledTask, ScheduledTasks]] = []
+        # タスクのインスタンスのid -> 走査状態
+        states: dict[int, int] = {}
+        targets = {id(task) for task in self.tasks}
+
+        for root in self.tasks:
+            if id(root) in states:
+                continue
+            states[id(root)] = self._VISITING
+            stack: list[tuple[ScheduledTask, Iterator[ScheduledTask], list]] = [
+                (root, iter(root.sub_tasks), [])
+            ]
+            while stack:
+                task, sub_task_iter, sub_tasks = stack[-1]
+                sub_task = next(sub_task_iter, None)
+                if sub_task is None:
+                    # 全てのサブアイテムを走査済みのため、親タスクより先に並べる
+                    stack.pop()
+                    states[id(task)] = self._VISITED
+                    order.append((task, ScheduledTasks.from_tasks(sub_tasks)))
+                    continue
+
+                state = states.get(id(sub_task))
+                if state == self._VISITING:
+                    self._on_cycle_detected(task, sub_task)
+                    continue
+                sub_tasks.append(sub_task)
+                if not self.updates_sub_tasks and id(sub_task) not in targets:
+                    continue
+                if state is None:
+                    states[id(sub_task)] = self._VISITING
+                    stack.append((sub_task, iter(sub_task.sub_tasks), []))
+
+        return order
+
+    def run(self) -> None:
+        """サブアイテムから親タスクの順にプロパティを更新する"""
+        targets = {id(task) for task in self.tasks}
+        for task, sub_tasks in self.get_order():
+            if id(task) not in targets:
+                # 対象外の子孫タスクは、親タスクの集計に必要なステータスのみ更新する
+                task.update_status_by_rolled_up_sub_tasks(sub_tasks)
+                continue
+            # サブアイテムに親IDラベルを付与する
+            task.update_sub_tasks_properties()
+            # 工数・ステータス・進捗率を集計する
+            task.rollup_properties(sub_tasks)
+            # 実績人時ラベルを更新する
+            task.update_man_hours_label(
+                ManHoursLabel.from_man_hours(
+                    executed_man_hours=task.executed_man_hours,
+                    scheduled_man_hours=task.scheduled_man_hours,
+                )
+            )
+            # 予定タスクが持つ実績タスクのプロパティを更新する
+            task.update_executed_tasks_properties()
+
+    def _on_cycle_detected(self, task: ScheduledTask, sub_task: ScheduledTask):
+        if self.on_error is None:
+            return
+        self.on_error(
+            ValueError(
+                f"サブアイテムの関連が循環しています。予定タスク[{task.id.number}] -> サブアイテム[{sub_task.id.number}]"
+            ),
+            task,
+        )
@@ -22,10 +22,9 @@ class ScheduledTaskService:
         :return ScheduledTasks: 更新された予定タスク
         """
         scheduled_tasks_upserted_executed = ScheduledTasks.from_empty()
-        scheduled_tasks_by_id = to.get_tasks_by_id()
         for executed_task in source:
             try:
-                target_scheduled_task = scheduled_tasks_by_id.get((executed_task.scheduled_task_id))  # type: ignore (既にエラーハンドルしているため)
+                target_scheduled_task = to.get_by_id(executed_task.scheduled_task_id)
                 if target_scheduled_task is None:
                     continue
                 target_scheduled_task.executed_tasks.upsert_by_id(
@@ -49,11 +48,12 @@ class ScheduledTaskService:
         on_error: Callable[[Exception, ScheduledTask], None],
     ) -> ScheduledTasks:
         """新たにサブアイテムが付与された予定タスクのみを取得する"""
-        parent_tasks_by_page_id = parent_tasks.get_tasks_by_page_id()
         parent_tasks_appended_sub = ScheduledTasks.from_empty()
         for sub_task in sub_tasks:
             try:
-                target_parent_task = parent_tasks_by_page_id.get(sub_task.parent_task_page_id)  # type: ignore (既にエラーハンドルしているため)
+                target_parent_task = parent_tasks.get_by_page_id(
+                    sub_task.parent_task_page_id
+                )
                 if target_parent_task is None:
                     continue
                 target_parent_task.sub_tasks.upsert_by_id(
@@ -1,7 +1,6 @@
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Callable, List, Optional
 
-from notiontaskr.domain.name_labels.man_hours_label import ManHoursLabel
 from notiontaskr.domain.name_labels.parent_id_label import ParentIdLabel
 from notiontaskr.domain.value_objects.executed_man_hours import ExecutedManHours
 from notiontaskr.domain.value_objects.man_hours import ManHours
@@ -70,23 +69,20 @@ class ScheduledTasks(Tasks["ScheduledTask"]):
                 executed_tasks.extend(task.executed_tasks)
         return executed_tasks
 
-    def update_tasks_properties(self):
-        """スケジュールタスクのプロパティを更新する"""
-        for task in self._tasks:
-            # サブアイテムに親IDラベルを付与する
-            task.update_sub_tasks_properties()
-            # サブアイテムの工数を集計し、ラベルを更新する
-            task.aggregate_man_hours()
-            # 予定タスクのステータスを更新する
-            task.update_status_by_checking_properties()
-            # 進捗率を更新する
-            task.calc_progress_rate()
-            # 実績人時ラベルを更新する
-            task.update_man_hours_label(
-                ManHoursLabel.from_man_hours(
-                    executed_man_hours=task.executed_man_hours,
-                    scheduled_man_hours=task.scheduled_man_hours,
-                )
-            )
-            # 予定タスクが持つ実績タスクのプロパティを更新する
-            task.update_executed_tasks_properties()
+    def update_tasks_properties(
+        self,
+        on_error: Optional[Callable[[Exception, "ScheduledTask"], None]] = None,
+        updates_sub_tasks: bool = True,
+    ):
+        """スケジュールタスクのプロパティを更新する
+
+        サブアイテムから親タスクの順に、各タスクを1度ずつ集計する
+
+        :param on_error: サブアイテムの関連の循環を検出した場合に呼び出す
+        :param updates_sub_tasks: Falseの場合、含まれないサブアイテムは集計済みとみなして更新しない
+        """
+        from notiontaskr.domain.scheduled_task_rollup import ScheduledTaskRollup
+
+        ScheduledTaskRollup(
+            self, on_error=on_error, updates_sub_tasks=updates_sub_tasks
+        ).run()
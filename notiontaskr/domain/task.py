@@ -37,6 +37,8 @@ class Task:
         default_factory=UpdateContents
     )  # 更新内容のリスト
     date: Optional["NotionDate"] = None
+    # Notionから取得した時点のページの最終更新日時(タスクストアから読み込んだ場合はNone)
+    last_edited_time: Optional[str] = field(default=None, compare=False)
 
     def __init__(
         self,
@@ -0,0 +1,82 @@
+from notiontaskr.domain.executed_task import ExecutedTask
+from notiontaskr.domain.executed_tasks import ExecutedTasks
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.domain.scheduled_tasks import ScheduledTasks
+
+
+class TaskDependencyGraph:
+    """予定タスク・実績タスク・サブアイテムの関連から、再集計が必要な予定タスクを求めるクラス
+
+    - サブアイテム -> 親タスク、実績タスク -> 予定タスクの関連をIDで保持する
+    - 変更されたタスクとその祖先のみを再集計の対象(dirty)としてマークする
+    """
+
+    def __init__(self):
+        # 予定タスクID番号 -> 予定タスク
+        self._scheduled_tasks: dict[str, ScheduledTask] = {}
+        # 予定タスクID番号 -> 親タスクのID番号(順序付きの集合)
+        self._parent_ids: dict[str, dict[str, None]] = {}
+        # 実績タスクID番号 -> 紐づく予定タスクのID番号(順序付きの集合)
+        self._scheduled_task_ids: dict[str, dict[str, None]] = {}
+        # 再集計の対象の予定タスクID番号(マークした順)
+        self._dirty_ids: dict[str, None] = {}
+
+    @classmethod
+    def from_scheduled_tasks(cls, tasks: ScheduledTasks) -> "TaskDependencyGraph":
+        """紐づけ済みの予定タスクから関連を作成する"""
+        graph = cls()
+        for task in tasks:
+            graph.add_scheduled_task(task)
+        return graph
+
+    def add_scheduled_task(self, task: ScheduledTask) -> None:
+        """予定タスクと、そのサブアイテム・実績タスクとの関連を追加する"""
+        number = task.id.number
+        self._scheduled_tasks[number] = task
+        for sub_task in task.sub_tasks:
+            self._parent_ids.setdefault(sub_task.id.number, {})[number] = None
+        for executed_task in task.executed_tasks:
+            self._scheduled_task_ids.setdefault(executed_task.id.number, {})[
+                number
+            ] = None
+
+    def mark_scheduled_task_dirty(self, task: ScheduledTask) -> None:
+        """予定タスクとその祖先を再集計の対象にする
+
+        マーク済みのタスクの祖先はマーク済みのため辿らない(関連の循環でも停止する)
+        """
+        pending = [task.id.number]
+        while pending:
+            number = pending.pop()
+            if number in self._dirty_ids:
+                continue
+            self._dirty_ids[number] = None
+            pending.extend(self._parent_ids.get(number, {}))
+
+    def mark_executed_task_dirty(self, task: ExecutedTask) -> None:
+        """実績タスクが紐づく予定タスクとその祖先を再集計の対象にする"""
+        scheduled_task_ids = dict(self._scheduled_task_ids.get(task.id.number, {}))
+        if task.scheduled_task_id is not None:
+            scheduled_task_ids[task.scheduled_task_id.number] = None
+        for number in scheduled_task_ids:
+            scheduled_task = self._scheduled_tasks.get(number)
+            if scheduled_task is not None:
+                self.mark_scheduled_task_dirty(scheduled_task)
+
+    def mark_scheduled_tasks_dirty(self, tasks: ScheduledTasks) -> None:
+        for task in tasks:
+            self.mark_scheduled_task_dirty(task)
+
+    def mark_executed_tasks_dirty(self, tasks: ExecutedTasks) -> None:
+        for task in tasks:
+            self.mark_executed_task_dirty(task)
+
+    def get_dirty_tasks(self) -> ScheduledTasks:
+        """再集計の対象の予定タスクを取得する(関連に含まれないタスクは除く)"""
+        return ScheduledTasks.from_tasks(
+            [
+                self._scheduled_tasks[number]
+                for number in self._dirty_ids
+                if number in self._scheduled_tasks
+            ]
+        )
@@ -0,0 +1,116 @@
+from typing import Iterable, Optional
+
+from notiontaskr.domain.executed_task import ExecutedTask
+from notiontaskr.domain.executed_tasks import ExecutedTasks
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.domain.scheduled_tasks import ScheduledTasks
+
+
+class TaskIdentityMap:
+    """タスクIDごとに1つのインスタンスを保持し、タスク間の関連をIDで管理するクラス
+
+    - 同じIDのタスクを登録すると、インスタンスのみを置き換えて関連は引き継ぐ
+    - サブアイテム・実績タスクはIDで保持し、resolveで現在のインスタンスに紐づける
+    """
+
+    def __init__(self):
+        # タスクID番号 -> タスク
+        self._scheduled_tasks: dict[str, ScheduledTask] = {}
+        self._executed_tasks: dict[str, ExecutedTask] = {}
+        # 予定タスクID番号 -> サブアイテム・実績タスクのID番号(順序付きの集合)
+        self._sub_task_ids: dict[str, dict[str, None]] = {}
+        self._executed_task_ids: dict[str, dict[str, None]] = {}
+
+    def put_scheduled_task(
+        self,
+        task: ScheduledTask,
+        sub_task_ids: Iterable[object] = (),
+        executed_task_ids: Iterable[object] = (),
+    ) -> None:
+        """予定タスクを登録する(同じIDのタスクは置き換える)
+
+        埋め込まれているサブアイテム・実績タスクと、引数のIDを関連に追加する。
+        埋め込まれているタスクは、同じIDのタスクが未登録の場合のみ登録する
+        """
+        number = task.id.number
+        self._scheduled_tasks[number] = task
+        for sub_task in task.sub_tasks:
+            if sub_task.id.number not in self._scheduled_tasks:
+                self.put_scheduled_task(sub_task)
+            self.link_sub_task(number, sub_task.id)
+        for sub_task_id in sub_task_ids:
+            self.link_sub_task(number, sub_task_id)
+        for executed_task in task.executed_tasks:
+            self._executed_tasks.setdefault(executed_task.id.number, executed_task)
+            self.link_executed_task(number, executed_task.id)
+        for executed_task_id in executed_task_ids:
+            self.link_executed_task(number, executed_task_id)
+
+    def put_executed_task(self, task: ExecutedTask) -> None:
+        """実績タスクを登録する(同じIDのタスクは置き換える)"""
+        self._executed_tasks[task.id.number] = task
+
+    def put_scheduled_tasks(self, tasks: ScheduledTasks) -> None:
+        for task in tasks:
+            self.put_scheduled_task(task)
+
+    def put_executed_tasks(self, tasks: ExecutedTasks) -> None:
+        for task in tasks:
+            self.put_executed_task(task)
+
+    def link_sub_task(self, parent_id: object, sub_task_id: object) -> None:
+        """予定タスクにサブアイテムを関連付ける"""
+        self._sub_task_ids.setdefault(self._get_number(parent_id), {})[
+            self._get_number(sub_task_id)
+        ] = None
+
+    def link_executed_task(self, scheduled_task_id: object, executed_task_id: object):
+        """予定タスクに実績タスクを関連付ける"""
+        self._executed_task_ids.setdefault(self._get_number(scheduled_task_id), {})[
+            self._get_number(executed_task_id)
+        ] = None
+
+    def get_scheduled_task(self, id: object) -> Optional[ScheduledTask]:
+        return self._scheduled_tasks.get(self._get_number(id))
+
+    def get_executed_task(self, id: object) -> Optional[ExecutedTask]:
+        return self._executed_tasks.get(self._get_number(id))
+
+    def get_sub_tasks(self, id: object) -> ScheduledTasks:
+        """予定タスクのサブアイテムを取得する(未登録のタスクは含めない)"""
+        return ScheduledTasks.from_tasks(
+            [
+                self._scheduled_tasks[number]
+                for number in self._sub_task_ids.get(self._get_number(id), {})
+                if number in self._scheduled_tasks
+            ]
+        )
+
+    def get_executed_tasks(self, id: object) -> ExecutedTasks:
+        """予定タスクの実績タスクを取得する(未登録のタスクは含めない)"""
+        return ExecutedTasks.from_tasks(
+            [
+                self._executed_tasks[number]
+                for number in self._executed_task_ids.get(self._get_number(id), {})
+                if number in self._executed_tasks
+            ]
+        )
+
+    def resolve(self, task: ScheduledTask) -> None:
+        """予定タスクのサブアイテム・実績タスクを、登録されているインスタンスに置き換える"""
+        task.sub_tasks = self.get_sub_tasks(task.id)
+        task.executed_tasks = self.get_executed_tasks(task.id)
+
+    def get_scheduled_tasks(self) -> ScheduledTasks:
+        """登録されている全ての予定タスクを、関連を紐づけて取得する"""
+        for task in self._scheduled_tasks.values():
+            self.resolve(task)
+        return ScheduledTasks.from_tasks(list(self._scheduled_tasks.values()))
+
+    def __len__(self) -> int:
+        return len(self._scheduled_tasks) + len(self._executed_tasks)
+
+    @staticmethod
+    def _get_number(id: object) -> str:
+        """NotionIdもしくは文字列からID番号を取得する"""
+        return str(getattr(id, "number", id))
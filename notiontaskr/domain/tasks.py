@@ -1,6 +1,5 @@
 from abc import ABC, abstractmethod
-import copy
-from typing import Generic, Iterator, Type, TypeVar, List, Self
+from typing import Generic, Iterator, Optional, Type, TypeVar, List, Self
 from notiontaskr.domain.task import Task
 from notiontaskr.domain.tags import Tags
 from notiontaskr.domain.value_objects.tag import Tag
@@ -31,16 +30,41 @@ class Tasks(ABC, Generic[T]):
         pass
 
     def upserted_by_id(self, tasks: Self) -> Self:
-        """IDで重複を除去したタスクのリストを取得する"""
-        result_tasks = copy.deepcopy(self)
+        """IDで重複を除去したタスクのリストを取得する(自身は変更しない)
+
+        タスクは複製せずに元のリストと共有し、リストと索引のみを新しく作成する。
+        そのため、取得したリストのタスクを変更すると元のリストのタスクにも反映される
+        """
+        self._sync_index()
+        result_tasks = self.from_tasks(list(self._tasks))
+        result_tasks._positions_by_id = dict(self._positions_by_id)
+        result_tasks._positions_by_page_id = dict(self._positions_by_page_id)
+        result_tasks._has_duplicate_ids = self._has_duplicate_ids
+        result_tasks._indexed_tasks = result_tasks._tasks
+        result_tasks._indexed_count = self._indexed_count
         result_tasks.upsert_by_id(tasks)
         return result_tasks
 
     def upsert_by_id(self, tasks: Self) -> None:
-        """IDで重複を除去したタスクのリストを追加もしくは更新する"""
+        """IDで重複を除去したタスクのリストを追加もしくは更新する
+
+        同じIDのタスクは元の位置で置き換え、新しいIDのタスクは末尾に追加する
+        """
+        self._sync_index()
+        if self._has_duplicate_ids:
+            # appendで重複したIDがある場合のみ、リスト全体から重複を除去する
+            self._tasks = self.get_unique_tasks_by_id()._tasks
+            self._sync_index()
         for task in tasks._tasks:
-            self.append(task)
-        self._tasks = self.get_unique_tasks_by_id()._tasks
+            position = self._positions_by_id.get(task.id.number)
+            if position is None:
+                self.append(task)
+                continue
+            replaced_page_id = self._tasks[position].page_id.value
+            if self._positions_by_page_id.get(replaced_page_id) == position:
+                del self._positions_by_page_id[replaced_page_id]
+            self._tasks[position] = task
+            self._positions_by_page_id[task.page_id.value] = position
 
     def get_unique_tasks_by_id(self) -> Self:
         """IDで重複を除去したタスクのリストを取得する"""
@@ -54,6 +78,54 @@ class Tasks(ABC, Generic[T]):
         """ページID毎のタスク辞書を取得する"""
         return {task.page_id: task for task in self._tasks}
 
+    def get_by_id(self, id: object) -> Optional[T]:
+        """IDに一致するタスクを取得する(IDが重複している場合は後に追加したタスク)"""
+        if id is None:
+            return None
+        self._sync_index()
+        position = self._positions_by_id.get(str(getattr(id, "number", id)))
+        return None if position is None else self._tasks[position]
+
+    def get_by_page_id(self, page_id: object) -> Optional[T]:
+        """ページIDに一致するタスクを取得する(重複している場合は後に追加したタスク)"""
+        if page_id is None:
+            return None
+        self._sync_index()
+        position = self._positions_by_page_id.get(str(page_id))
+        return None if position is None else self._tasks[position]
+
+    def has_id(self, id: object) -> bool:
+        """IDに一致するタスクが含まれているか判定する"""
+        return self.get_by_id(id) is not None
+
+    def _sync_index(self) -> None:
+        """タスクID・ページIDからリスト上の位置を引く索引を、必要な場合のみ作り直す
+
+        索引は初めて使用する時に作成し、append・upsert_by_idでは差分のみ更新する。
+        リストが置き換えられた場合や、索引を経由せずに要素数が変わった場合は作り直す
+        """
+        if getattr(
+            self, "_indexed_tasks", None
+        ) is self._tasks and self._indexed_count == len(self._tasks):
+            return
+        self._positions_by_id: dict[str, int] = {}
+        self._positions_by_page_id: dict[str, int] = {}
+        self._has_duplicate_ids = False
+        self._indexed_tasks = self._tasks
+        self._indexed_count = 0
+        for task in self._tasks:
+            self._index_appended(task)
+
+    def _index_appended(self, task: T) -> None:
+        """末尾に追加したタスクを索引に追加する"""
+        position = self._indexed_count
+        number = task.id.number
+        if number in self._positions_by_id:
+            self._has_duplicate_ids = True
+        self._positions_by_id[number] = position
+        self._positions_by_page_id[task.page_id.value] = position
+        self._indexed_count = position + 1
+
     def get_tasks_by_tag(self, tags: "Tags") -> dict[Tag, "Self"]:
         """指定したタグを持つ予定タスクを取得する"""
         scheduled_tasks_by_tags = {tag: self.from_empty() for tag in tags}
@@ -91,9 +163,15 @@ class Tasks(ABC, Generic[T]):
     def append(self, task: "T"):
         """スケジュールタスクを追加する"""
 
+        is_indexed = getattr(
+            self, "_indexed_tasks", None
+        ) is self._tasks and self._indexed_count == len(self._tasks)
         self._tasks.append(task)
+        if is_indexed:
+            self._index_appended(task)
 
     def extend(self, tasks: "Self"):
         """スケジュールタスクを追加する"""
 
-        self._tasks.extend(tasks._tasks)
+        for task in tasks._tasks:
+            self.append(task)
@@ -11,6 +11,10 @@ class UpdateContents:
         """更新されたかどうかを判定する"""
         return any(content.is_updated() for content in self._contents)
 
+    def get_updated_keys(self) -> list[str]:
+        """実際に値が変わった更新内容のキーを取得する"""
+        return [content.key for content in self._contents if content.is_updated()]
+
     def upsert(self, content: UpdateContent):
         """更新内容を追加または変更する"""
         for existing_content in self._contents:
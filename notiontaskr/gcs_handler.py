@@ -1,17 +1,36 @@
 # gcs_manager.py
+import base64
+import hashlib
+import json
 import os
-from typing import Callable
+from typing import Callable, Optional
+from google.api_core.exceptions import NotModified
 from google.cloud import storage
 
 
 class GCSHandler:
+    """GCSのファイルを操作するクラス
+
+    ダウンロード・アップロードしたファイルのGCS上の世代(generation)とMD5ハッシュを
+    ローカルファイルの隣にマニフェスト(`<ファイル名>.gcs.json`)として記録し、
+    変更の無いファイルの再ダウンロードを省略する。
+    """
+
+    MANIFEST_SUFFIX = ".gcs.json"
+
     def __init__(
         self,
         bucket_name: str,
         on_error: Callable[[Exception], None],
     ):
+        """
+        :param on_error: 初期化に失敗した場合に呼び出す(is_availableはFalseになる)
+        """
+        # バケットを取得できたかどうか(Falseの場合はGCSを操作できない)
+        self.is_available = False
         try:
             self.bucket = storage.Client().bucket(bucket_name)
+            self.is_available = True
         except Exception as e:
             on_error(e)
 
@@ -19,11 +38,15 @@ class GCSHandler:
         self,
         from_: str,
         to: str,
+        if_generation_match: Optional[int] = None,
     ):
         """GCSにファイルをアップロード
 
         :param from_: アップロードするファイルのパス
         :param to: アップロード先のGCSのパス
+        :param if_generation_match: GCS上のファイルの世代がこの値と一致する場合のみアップロードする
+            (0の場合はファイルが存在しない場合のみ)。Noneの場合は常にアップロードする
+        :raise google.api_core.exceptions.PreconditionFailed: 世代が一致しなかった場合
         """
 
         # ファイルの存在確認
@@ -32,7 +55,8 @@ class GCSHandler:
 
         try:
             blob = self.bucket.blob(to)
-            blob.upload_from_filename(from_)
+            blob.upload_from_filename(from_, if_generation_match=if_generation_match)
+            self._save_manifest(local_path=from_, gcs_path=to, blob=blob)
         except Exception as e:
             raise e
 
@@ -40,16 +64,99 @@ class GCSHandler:
         self,
         from_: str,
         to: str,
-    ):
+    ) -> bool:
         """GCSからファイルをダウンロード
 
+        ローカルのファイルが前回ダウンロード(アップロード)した時点から変更されておらず、
+        GCS上の世代も変わっていない場合はダウンロードしない
+
         :param from_: ダウンロードするGCSのパス
         :param to: ダウンロード先のファイルのパス
+        :return: ダウンロードした場合True、ローカルのファイルが最新の場合False
         """
         # ディレクトリの作成
         os.makedirs(os.path.dirname(to), exist_ok=True)
+        generation = self.get_generation(local_path=to, gcs_path=from_)
+        # 条件付きダウンロードが失敗してもローカルのファイルが消えないよう、一時ファイルに保存する
+        temp_path = f"{to}.download"
         try:
             blob = self.bucket.blob(from_)
-            blob.download_to_filename(to)
+            blob.download_to_filename(temp_path, if_generation_not_match=generation)
+        except NotModified:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+        except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise e
+
+        os.replace(temp_path, to)
+        self._save_manifest(local_path=to, gcs_path=from_, blob=blob)
+        return True
+
+    def get_generation(self, local_path: str, gcs_path: str) -> Optional[int]:
+        """ローカルのファイルに対応するGCS上のファイルの世代を取得する
+
+        マニフェストが無い場合や、ローカルのファイルが変更されている場合はNoneを返す
+        """
+        manifest_path = f"{local_path}{self.MANIFEST_SUFFIX}"
+        if not os.path.exists(local_path) or not os.path.exists(manifest_path):
+            return None
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("gcs_path") != gcs_path:
+            return None
+        if manifest.get("md5_hash") != self.compute_md5_hash(local_path):
+            return None
+        return manifest.get("generation")
+
+    def _save_manifest(self, local_path: str, gcs_path: str, blob) -> None:
+        """ローカルのファイルに対応するGCS上のファイルの世代とMD5ハッシュを記録する"""
+        with open(f"{local_path}{self.MANIFEST_SUFFIX}", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "gcs_path": gcs_path,
+                    "generation": blob.generation,
+                    "md5_hash": blob.md5_hash,
+                },
+                f,
+            )
+
+    @staticmethod
+    def compute_md5_hash(path: str) -> str:
+        """GCSと同じ形式(Base64)でファイルのMD5ハッシュを計算する"""
+        md5 = hashlib.md5()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                md5.update(chunk)
+        return base64.b64encode(md5.digest()).decode("ascii")
+
+    def list(
+        self,
+        prefix: str,
+    ) -> list[str]:
+        """指定したプレフィックスを持つGCSのパスを名前順に取得
+
+        :param prefix: GCSのパスのプレフィックス
+        """
+        try:
+            return sorted(blob.name for blob in self.bucket.list_blobs(prefix=prefix))
+        except Exception as e:
+            raise e
+
+    def delete(
+        self,
+        path: str,
+    ):
+        """GCSのファイルを削除
+
+        :param path: 削除するGCSのパス
+        """
+        try:
+            self.bucket.blob(path).delete()
         except Exception as e:
             raise e
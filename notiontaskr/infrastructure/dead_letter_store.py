@@ -0,0 +1,92 @@
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+import json
+import os
+from typing import Optional
+
+
+@dataclass
+class DeadLetter:
+    """再試行しても更新できなかったページ更新内容"""
+
+    kind: str  # "scheduled" or "executed"
+    page_id: str
+    task_number: str
+    properties: dict
+    error: str = ""
+    attempts: int = 1
+    failed_at: str = field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+    # 更新内容を算出した時点のページの最終更新日時(不明な場合はNone)
+    last_edited_time: Optional[str] = None
+
+    def is_outdated(self, last_edited_time: str) -> bool:
+        """退避後にページが編集され、退避した更新内容が古くなったか判定する
+
+        更新内容を算出した時点のページの最終更新日時が不明な場合は、失敗した日時と比較する
+
+        :param last_edited_time: ページの現在の最終更新日時
+        """
+        based_at = datetime.fromisoformat(self.last_edited_time or self.failed_at)
+        return datetime.fromisoformat(last_edited_time) > based_at
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DeadLetter":
+        """辞書からインスタンスを生成する"""
+        try:
+            return cls(**data)
+        except TypeError as e:
+            raise ValueError(f"デッドレターの形式が不正です: {e}")
+
+
+class DeadLetterStore:
+    """失敗したページ更新をファイルに保存し、次回実行時に再送するためのクラス"""
+
+    SCHEDULED = "scheduled"
+    EXECUTED = "executed"
+
+    def __init__(self, save_path: str):
+        self.save_path = save_path
+        self._dead_letters: dict[str, DeadLetter] = {}
+
+    def append(self, dead_letter: DeadLetter) -> None:
+        """デッドレターを追加する
+
+        同じページの未送信の更新がある場合は、プロパティをマージし新しい値で上書きする
+        """
+        existing = self._dead_letters.get(dead_letter.page_id)
+        if existing is not None:
+            dead_letter.properties = {**existing.properties, **dead_letter.properties}
+            dead_letter.attempts = max(dead_letter.attempts, existing.attempts)
+        self._dead_letters[dead_letter.page_id] = dead_letter
+
+    def pop_all(self) -> list[DeadLetter]:
+        """保持している全てのデッドレターを取り出す"""
+        dead_letters = list(self._dead_letters.values())
+        self._dead_letters = {}
+        return dead_letters
+
+    def __len__(self) -> int:
+        return len(self._dead_letters)
+
+    def load(self) -> None:
+        """ファイルからデッドレターを読み込む
+
+        ファイルが存在しない場合は空とみなす
+        """
+        if not os.path.exists(self.save_path):
+            return
+        with open(self.save_path, "r", encoding="utf-8") as f:
+            for data in json.load(f):
+                self.append(DeadLetter.from_dict(data))
+
+    def save(self) -> None:
+        """デッドレターをファイルに保存する"""
+        os.makedirs(os.path.dirname(self.save_path), exist_ok=True)
+        with open(self.save_path, "w", encoding="utf-8") as f:
+            json.dump(
+                [asdict(dead_letter) for dead_letter in self._dead_letters.values()],
+                f,
+                ensure_ascii=False,
+            )
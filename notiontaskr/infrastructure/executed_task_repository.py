@@ -1,8 +1,18 @@
-from typing import Callable
+from typing import Callable, Optional
+
+from notion_client import AsyncClient
 from notiontaskr.infrastructure.executed_task_update_properties import (
     ExecutedTaskUpdateProperties,
 )
-from notion_client import Client
+from notiontaskr.infrastructure.notion_client_pool import NotionClientPool
+from notiontaskr.infrastructure.notion_rate_limiter import NotionRateLimiter
+from notiontaskr.infrastructure.notion_query_paginator import (
+    NotionQueryPaginator,
+    PageFetchMetric,
+)
+from notiontaskr.infrastructure.retry_policy import RetryPolicy
+from notiontaskr.infrastructure.dead_letter_store import DeadLetter, DeadLetterStore
+from notiontaskr.infrastructure.written_property_store import WrittenPropertyStore
 
 from notiontaskr.domain.executed_task import ExecutedTask
 from notiontaskr.infrastructure.operator import CheckboxOperator
@@ -12,122 +22,124 @@ from notiontaskr.domain.executed_tasks import ExecutedTasks
 
 
 class ExecutedTaskRepository:
-    def __init__(self, token, db_id):
-        self.client = Client(
-            auth=token,
-        )
+    def __init__(
+        self,
+        token,
+        db_id,
+        client_pool: Optional[NotionClientPool] = None,
+        rate_limiter: Optional[NotionRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        dead_letter_store: Optional[DeadLetterStore] = None,
+        written_property_store: Optional[WrittenPropertyStore] = None,
+    ):
+        # 予定・実績リポジトリ間でコネクションプールとレート制限を共有できるようにする
+        self.client_pool = client_pool or NotionClientPool(token)
+        self.rate_limiter = rate_limiter or NotionRateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        # 再試行しても更新できなかった内容の退避先(Noneの場合は破棄する)
+        self.dead_letter_store = dead_letter_store
+        # 前回書き込んだ内容と同じ場合に更新を省略するための記録(Noneの場合は常に更新する)
+        self.written_property_store = written_property_store
         self.db_id = db_id
         self.filter = TaskSearchCondition()
+        self.paginator = NotionQueryPaginator(query=self._query)
+
+    @property
+    def client(self) -> AsyncClient:
+        """実行中のイベントループに対応するNotionクライアントを取得する"""
+        return self.client_pool.get()
 
     async def find_all(
-        self, on_error: Callable[[Exception, dict], None]
+        self,
+        on_error: Callable[[Exception, dict], None],
+        max_pages: Optional[int] = None,
+        on_page_fetched: Optional[Callable[[PageFetchMetric], None]] = None,
     ) -> ExecutedTasks:
         """全ての実績を取得する"""
-        filter = (
-            TaskSearchCondition()
-            .and_(
-                TaskSearchCondition().where_scheduled_flag(
-                    operator=CheckboxOperator.EQUALS, is_scheduled=False
-                ),
-            )
-            .build()
-        )
-
-        response_data = self.client.databases.query(
-            **{"database_id": self.db_id, "filter": filter}
+        return await self._find_by_filter(
+            filter=self._build_filter(),
+            on_error=on_error,
+            max_pages=max_pages,
+            on_page_fetched=on_page_fetched,
         )
 
-        # response_dataをScheduledTaskのリストに変換する
-        executed_tasks = ExecutedTasks.from_empty()
-        for data in response_data["results"]:  # type: ignore
-            try:
-                executed_tasks.append(ExecutedTask.from_response_data(data))
-            except Exception as e:
-                on_error(e, data)
-        return executed_tasks
-
     async def find_by_condition(
         self,
         condition: TaskSearchCondition,
         on_error: Callable[[Exception, dict], None],
+        max_pages: Optional[int] = None,
+        on_page_fetched: Optional[Callable[[PageFetchMetric], None]] = None,
     ) -> ExecutedTasks:
-        """指定した実績を全て取得する"""
-
-        filter = (
-            TaskSearchCondition()
-            .and_(
-                TaskSearchCondition().where_scheduled_flag(
-                    operator=CheckboxOperator.EQUALS, is_scheduled=False
-                ),
-                condition,
-            )
-            .build()
+        """指定した条件に一致する実績タスクをページネーションを考慮して取得する
+
+        :param max_pages: 取得するページ数(1ページ100件)の上限。Noneの場合は全ページ
+        :param on_page_fetched: ページを受信するたびに取得時間の計測結果を受け取る関数
+        """
+        return await self._find_by_filter(
+            filter=self._build_filter(condition),
+            on_error=on_error,
+            max_pages=max_pages,
+            on_page_fetched=on_page_fetched,
         )
 
-        response_data = self.client.databases.query(
-            **{"database_id": self.db_id, "filter": filter}
-        )
-
-        # response_dataをScheduledTaskのリストに変換する
-        executed_tasks = ExecutedTasks.from_empty()
-        for data in response_data["results"]:  # type: ignore
-            try:
-                executed_tasks.append(ExecutedTask.from_response_data(data))
-            except Exception as e:
-                on_error(e, data)
-
-        return executed_tasks
-
     async def find_all_by_condition(
         self,
         condition: TaskSearchCondition,
         on_error: Callable[[Exception, dict], None],
+        max_pages: Optional[int] = None,
+        on_page_fetched: Optional[Callable[[PageFetchMetric], None]] = None,
     ) -> ExecutedTasks:
         """指定した条件に一致する全ての実績タスクをページネーションを考慮して取得する"""
-        all_tasks = ExecutedTasks.from_empty()
-        start_cursor = ""
-        has_more = True
-        while has_more:
-            tasks, next_cursor, has_more = await self._find_by_condition_with_cursor(
-                condition=condition,
-                on_error=on_error,
-                start_cursor=start_cursor,
-            )
-            all_tasks.extend(tasks)
-            start_cursor = next_cursor
-        return all_tasks
+        return await self.find_by_condition(
+            condition=condition,
+            on_error=on_error,
+            max_pages=max_pages,
+            on_page_fetched=on_page_fetched,
+        )
 
-    async def _find_by_condition_with_cursor(
+    async def _find_by_filter(
         self,
-        condition: TaskSearchCondition,
+        filter: dict,
         on_error: Callable[[Exception, dict], None],
-        start_cursor: str,
-    ) -> tuple[ExecutedTasks, str, bool]:
-        """タスクDBの指定タグの実績を全て取得する（ページネーション対応）"""
-        filter = (
-            TaskSearchCondition()
-            .and_(
-                TaskSearchCondition().where_scheduled_flag(
-                    operator=CheckboxOperator.EQUALS, is_scheduled=False
-                ),
-                condition,
-            )
-            .build()
-        )
-        query_params = {"database_id": self.db_id, "filter": filter}
-        if start_cursor:
-            query_params["start_cursor"] = start_cursor
+        max_pages: Optional[int],
+        on_page_fetched: Optional[Callable[[PageFetchMetric], None]],
+    ) -> ExecutedTasks:
+        """フィルターに一致する実績タスクを取得する
 
-        response_data = self.client.databases.query(**query_params)
+        次のページを先読みしながら、受信済みのページをExecutedTaskに変換する
+        """
         executed_tasks = ExecutedTasks.from_empty()
-        for data in response_data["results"]:  # type: ignore
-            try:
-                executed_tasks.append(ExecutedTask.from_response_data(data))
-            except Exception as e:
-                on_error(e, data)
-        next_cursor = response_data.get("next_cursor")  # type: ignore
-        has_more = response_data.get("has_more", False)  # type: ignore
-        return executed_tasks, next_cursor, has_more
+        async for response_data in self.paginator.iter_pages(
+            query_params={"database_id": self.db_id, "filter": filter},
+            max_pages=max_pages,
+            on_page_fetched=on_page_fetched,
+        ):
+            for data in response_data["results"]:
+                if self.written_property_store is not None:
+                    self.written_property_store.verify(data)
+                try:
+                    executed_tasks.append(ExecutedTask.from_response_data(data))
+                except Exception as e:
+                    # 名前が空のときにもスキップされる
+                    on_error(e, data)
+        return executed_tasks
+
+    def _build_filter(self, condition: Optional[TaskSearchCondition] = None) -> dict:
+        """実績フラグの条件を付与したフィルターを生成する"""
+        conditions = [
+            TaskSearchCondition().where_scheduled_flag(
+                operator=CheckboxOperator.EQUALS, is_scheduled=False
+            )
+        ]
+        if condition is not None:
+            conditions.append(condition)
+        return TaskSearchCondition().and_(*conditions).build()
+
+    async def _query(self, query_params: dict) -> dict:
+        """レート制限の下でデータベースを1ページ分検索する"""
+        return await self.rate_limiter.call(
+            lambda: self.client.databases.query(**query_params)
+        )
 
     async def update(
         self,
@@ -135,26 +147,72 @@ class ExecutedTaskRepository:
         on_success: Callable[[ExecutedTask], None],
         on_error: Callable[[Exception, ExecutedTask], None],
     ) -> None:
-        """実績タスクを更新する"""
+        """実績タスクを更新する
+
+        送信するプロパティが無い場合や、前回書き込んだ内容と同じ場合は更新しない
+        """
 
         try:
+            # 更新内容に記録された項目のみを送信する
             properties = (
                 ExecutedTaskUpdateProperties(task=executed_task)
-                .set_name()
-                .set_status()
-                .set_parent_task_page_id()
-                .set_scheduled_task_page_id()
-                .set_has_before_start()
-                .set_has_before_end()
-                .set_before_start_minutes()
-                .set_before_end_minutes()
+                .set_updated_contents()
                 .build()
             )
-
-            self.client.pages.update(
-                **{"page_id": str(executed_task.page_id), "properties": properties}
-            )
+            if not properties:
+                return
+
+            page_id = str(executed_task.page_id)
+            written_properties = None
+            if self.written_property_store is not None:
+                # 再計算で同じ値になっただけの場合は、前回の書き込み内容と一致するため省略する
+                written_properties = (
+                    ExecutedTaskUpdateProperties(task=executed_task).set_all().build()
+                )
+                if self.written_property_store.is_written(page_id, written_properties):
+                    self.written_property_store.skipped_count += 1
+                    return
+
+            response = await self.update_page(page_id=page_id, properties=properties)
+            if self.written_property_store is not None and written_properties:
+                self.written_property_store.record(
+                    page_id=page_id,
+                    properties=written_properties,
+                    last_edited_time=response.get("last_edited_time"),
+                )
             on_success(executed_task)
         except Exception as e:
+            if self.written_property_store is not None:
+                self.written_property_store.discard(str(executed_task.page_id))
+            if self.dead_letter_store is not None and RetryPolicy.is_transient_error(e):
+                self.dead_letter_store.append(
+                    DeadLetter(
+                        kind=DeadLetterStore.EXECUTED,
+                        page_id=str(executed_task.page_id),
+                        task_number=executed_task.id.number,
+                        properties=properties,
+                        error=str(e),
+                        last_edited_time=executed_task.last_edited_time,
+                    )
+                )
             on_error(e, executed_task)
-            return
+
+    async def retrieve_page(self, page_id: str) -> dict:
+        """レート制限の下でページを取得する"""
+        return await self.rate_limiter.call(
+            lambda: self.client.pages.retrieve(page_id=page_id)
+        )
+
+    async def update_page(self, page_id: str, properties: dict) -> dict:
+        """ページのプロパティを更新し、更新後のページを返す
+
+        429はレート制限でRetry-Afterに従って再送し、
+        それ以外の一時的なエラーはジッター付き指数バックオフで再試行する
+        """
+        return await self.retry_policy.run(
+            lambda: self.rate_limiter.call(
+                lambda: self.client.pages.update(
+                    **{"page_id": page_id, "properties": properties}
+                )
+            )
+        )
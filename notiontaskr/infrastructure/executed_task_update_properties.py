@@ -16,3 +16,9 @@ class ExecutedTaskUpdateProperties(TaskUpdateProperties):
                 "relation": [{"id": str(self.task.scheduled_task_page_id)}]
             }
         return self
+
+    SETTERS_BY_UPDATE_KEY = {
+        **TaskUpdateProperties.SETTERS_BY_UPDATE_KEY,
+        "親タスクID": (TaskUpdateProperties.set_parent_task_page_id,),
+        "予定タスクページID": (set_scheduled_task_page_id,),
+    }
@@ -0,0 +1,75 @@
+import asyncio
+from typing import AsyncGenerator, Optional
+from weakref import WeakKeyDictionary
+
+import httpx
+from notion_client import AsyncClient
+
+from notiontaskr import config
+
+
+class NotionClientPool:
+    """Notionの非同期クライアントを共有するクラス
+
+    httpxのコネクションはイベントループに紐づくため、
+    実行中のイベントループ毎にクライアントを生成し、同一ループ内では使い回す。
+    クライアントはイベントループの終了時(asyncio.runのshutdown_asyncgens)に閉じる。
+    """
+
+    def __init__(
+        self,
+        token: Optional[str],
+        max_connections: int = config.NOTION_MAX_CONNECTIONS,
+        max_keepalive_connections: int = config.NOTION_MAX_KEEPALIVE_CONNECTIONS,
+    ):
+        self.token = token
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        # イベントループ -> クライアント
+        self._clients: WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncClient] = (
+            WeakKeyDictionary()
+        )
+        # イベントループ -> (終了時にクライアントを閉じるasync generator, その開始処理)
+        self._closers: WeakKeyDictionary[
+            asyncio.AbstractEventLoop,
+            tuple[AsyncGenerator[None, None], asyncio.Future],
+        ] = WeakKeyDictionary()
+
+    def get(self) -> AsyncClient:
+        """実行中のイベントループに対応するクライアントを取得する
+
+        :raise RuntimeError: イベントループ外で呼び出された場合
+        """
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = AsyncClient(
+                auth=self.token,
+                client=httpx.AsyncClient(limits=self.limits),
+            )
+            self._clients[loop] = client
+            # 開始したasync generatorはイベントループに登録され、ループの終了時に閉じられる
+            closer = self._close_on_loop_shutdown(client)
+            self._closers[loop] = closer, asyncio.ensure_future(closer.__anext__())
+        return client
+
+    async def aclose(self) -> None:
+        """実行中のイベントループのクライアントのコネクションを解放する"""
+        loop = asyncio.get_running_loop()
+        self._clients.pop(loop, None)
+        closer = self._closers.pop(loop, None)
+        if closer is not None:
+            agen, started = closer
+            await started
+            await agen.aclose()
+
+    @staticmethod
+    async def _close_on_loop_shutdown(
+        client: AsyncClient,
+    ) -> AsyncGenerator[None, None]:
+        try:
+            yield
+        finally:
+            await client.aclose()
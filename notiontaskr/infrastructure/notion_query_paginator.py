@@ -0,0 +1,121 @@
+import asyncio
+from dataclasses import dataclass
+import time
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from notiontaskr import config
+
+
+@dataclass
+class PageFetchMetric:
+    """1ページ分の取得にかかった時間を表すクラス"""
+
+    page_number: int  # 1始まりのページ番号
+    latency: float  # リクエスト開始から応答までの秒数
+    result_count: int  # ページに含まれる件数
+
+    def __str__(self) -> str:
+        return f"ページ{self.page_number}: {self.result_count}件 ({self.latency:.2f}s)"
+
+
+class _EndOfPages:
+    """全ページの取得が完了したことを表す番兵"""
+
+
+class NotionQueryPaginator:
+    """Notionのデータベース検索結果をページ単位で取得するクラス
+
+    ネットワークからページを取得するプロデューサーと、ページを処理する呼び出し元を
+    上限付きキューでつなぎ、レスポンスの変換と次ページの通信を並行させる。
+    """
+
+    def __init__(
+        self,
+        query: Callable[[dict], Awaitable[dict]],
+        prefetch_pages: int = config.NOTION_PREFETCH_PAGES,
+    ):
+        """
+        :param query: 検索パラメータを受け取り、1ページ分のレスポンスを返す関数
+        :param prefetch_pages: 呼び出し元の処理を待たずに先読みするページ数の上限
+        """
+        if prefetch_pages < 1:
+            raise ValueError(
+                f"prefetch_pages`{prefetch_pages}`は1以上でなければなりません。"
+            )
+        self.query = query
+        self.prefetch_pages = prefetch_pages
+
+    async def iter_pages(
+        self,
+        query_params: dict,
+        max_pages: Optional[int] = None,
+        on_page_fetched: Optional[Callable[[PageFetchMetric], None]] = None,
+    ) -> AsyncIterator[dict]:
+        """検索結果をページ単位で順に返す
+
+        :param query_params: databases.queryに渡すパラメータ(start_cursorを除く)
+        :param max_pages: 取得するページ数の上限(Noneの場合は全ページ)
+        :param on_page_fetched: ページを受信するたびに計測結果を受け取る関数
+        """
+        if max_pages is not None and max_pages < 1:
+            raise ValueError(f"max_pages`{max_pages}`は1以上でなければなりません。")
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.prefetch_pages)
+        producer = asyncio.ensure_future(
+            self._produce(queue, query_params, max_pages, on_page_fetched)
+        )
+        try:
+            while True:
+                item = await queue.get()
+                if isinstance(item, _EndOfPages):
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # 呼び出し元が途中で中断した場合は先読みを取り消す
+            if not producer.done():
+                producer.cancel()
+
+    async def _produce(
+        self,
+        queue: asyncio.Queue,
+        query_params: dict,
+        max_pages: Optional[int],
+        on_page_fetched: Optional[Callable[[PageFetchMetric], None]],
+    ) -> None:
+        """ページを順に取得してキューに積む
+
+        キューが上限に達している間は、呼び出し元がページを取り出すまで待機する
+        """
+        try:
+            page_number = 0
+            start_cursor = None
+            while True:
+                params = dict(query_params)
+                if start_cursor:
+                    params["start_cursor"] = start_cursor
+
+                started_at = time.monotonic()
+                response_data = await self.query(params)
+                page_number += 1
+                if on_page_fetched is not None:
+                    on_page_fetched(
+                        PageFetchMetric(
+                            page_number=page_number,
+                            latency=time.monotonic() - started_at,
+                            result_count=len(response_data.get("results", [])),
+                        )
+                    )
+                await queue.put(response_data)
+
+                if not response_data.get("has_more") or (
+                    max_pages is not None and page_number >= max_pages
+                ):
+                    break
+                start_cursor = response_data.get("next_cursor")
+            await queue.put(_EndOfPages())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put(e)
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from notion_client.errors import HTTPResponseError
+
+from notiontaskr import config
+
+T = TypeVar("T")
+
+
+class NotionRateLimiter:
+    """Notion APIの呼び出し頻度と同時実行数を制御するクラス
+
+    - トークンバケットで秒間リクエスト数を制限する
+    - 同時実行数はAIMD(成功時に加算、429/5xx時に半減)で調整する
+    - 429応答のRetry-Afterヘッダを尊重し、待機後に再送する
+    """
+
+    def __init__(
+        self,
+        rate: float = config.NOTION_RATE_LIMIT_PER_SECOND,
+        burst: int = config.NOTION_RATE_LIMIT_BURST,
+        max_concurrency: int = config.NOTION_MAX_CONCURRENCY,
+        initial_concurrency: int = config.NOTION_INITIAL_CONCURRENCY,
+        min_concurrency: int = 1,
+        max_rate_limited_retries: int = config.NOTION_MAX_RATE_LIMITED_RETRIES,
+        default_retry_after: float = 1.0,
+    ):
+        if rate <= 0:
+            raise ValueError(f"rate`{rate}`は正の数でなければなりません。")
+        if not (1 <= min_concurrency <= initial_concurrency <= max_concurrency):
+            raise ValueError(
+                "同時実行数はmin <= initial <= maxを満たさなければなりません。"
+            )
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_rate_limited_retries = max_rate_limited_retries
+        self.default_retry_after = default_retry_after
+
+        # トークンバケット
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        # Retry-Afterで指定された再開時刻
+        self._blocked_until = 0.0
+        # AIMDで調整される同時実行数の上限
+        self._concurrency = float(initial_concurrency)
+        self._in_flight = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._token_lock = asyncio.Lock()
+        self._slot_condition = asyncio.Condition()
+
+    @property
+    def concurrency(self) -> int:
+        """現在の同時実行数の上限を取得する"""
+        return int(self._concurrency)
+
+    async def call(self, request: Callable[[], Awaitable[T]]) -> T:
+        """レート制限の下でリクエストを実行する
+
+        :param request: 呼び出すたびに新しいリクエストを生成する関数
+        :raise HTTPResponseError: 429以外のエラー、または429の再送上限に達した場合
+        """
+        self._ensure_loop()
+        rate_limited_count = 0
+        while True:
+            await self._acquire_slot()
+            try:
+                await self._acquire_token()
+                result = await request()
+            except HTTPResponseError as e:
+                if not self.is_throttled_error(e):
+                    raise
+                self._decrease_concurrency()
+                if e.status != 429 or (
+                    rate_limited_count >= self.max_rate_limited_retries
+                ):
+                    raise
+                rate_limited_count += 1
+                self._block_for(self._get_retry_after(e))
+                continue
+            finally:
+                await self._release_slot()
+
+            self._increase_concurrency()
+            return result
+
+    @staticmethod
+    def is_throttled_error(e: Exception) -> bool:
+        """レート制限もしくはサーバー過負荷を示すエラーか判定する"""
+        return isinstance(e, HTTPResponseError) and (e.status == 429 or e.status >= 500)
+
+    def _get_retry_after(self, e: HTTPResponseError) -> float:
+        """Retry-Afterヘッダから待機秒数を取得する"""
+        try:
+            return max(float(e.headers.get("Retry-After", "")), 0.0)
+        except (TypeError, ValueError):
+            return self.default_retry_after
+
+    def _block_for(self, seconds: float) -> None:
+        """指定秒数、全てのリクエストの送信を止める"""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def _refill(self) -> None:
+        """経過時間に応じてトークンを補充する"""
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.burst), self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    async def _acquire_token(self) -> None:
+        """トークンを1つ取得するまで待機する"""
+        async with self._token_lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def _acquire_slot(self) -> None:
+        """同時実行数の上限に空きができるまで待機する"""
+        async with self._slot_condition:
+            await self._slot_condition.wait_for(
+                lambda: self._in_flight < self.concurrency
+            )
+            self._in_flight += 1
+
+    async def _release_slot(self) -> None:
+        """同時実行数の枠を解放する"""
+        async with self._slot_condition:
+            self._in_flight -= 1
+            self._slot_condition.notify_all()
+
+    def _increase_concurrency(self) -> None:
+        """成功時に同時実行数を加算的に増やす"""
+        self._concurrency = min(
+            float(self.max_concurrency), self._concurrency + 1 / self._concurrency
+        )
+
+    def _decrease_concurrency(self) -> None:
+        """429/5xx時に同時実行数を乗算的に減らす"""
+        self._concurrency = max(float(self.min_concurrency), self._concurrency / 2)
+
+    def _ensure_loop(self) -> None:
+        """asyncioの同期プリミティブをイベントループ毎に作り直す"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._in_flight = 0
+            self._token_lock = asyncio.Lock()
+            self._slot_condition = asyncio.Condition()
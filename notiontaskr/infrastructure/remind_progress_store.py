@@ -0,0 +1,45 @@
+from datetime import datetime
+import json
+import os
+from typing import Optional
+
+
+class RemindProgressStore:
+    """レギュラージョブでリマインドを通知し終えた日時を保持するクラス
+
+    毎分起動するレギュラージョブは実行間で状態を持たないため、
+    前回の実行から今回の実行までの間のリマインドを通知するために使用する。
+    """
+
+    def __init__(self, save_path: str):
+        self.save_path = save_path
+        # この日時までのリマインドは通知済み(Noneの場合は記録が無い)
+        self.reminded_until: Optional[datetime] = None
+
+    def load(self) -> None:
+        """ファイルから通知済みの日時を読み込む
+
+        ファイルが存在しない場合は記録が無いとみなす
+        """
+        self.reminded_until = None
+        if not os.path.exists(self.save_path):
+            return
+        with open(self.save_path, "r", encoding="utf-8") as f:
+            reminded_until = json.load(f).get("reminded_until")
+        if reminded_until is not None:
+            self.reminded_until = datetime.fromisoformat(reminded_until)
+
+    def save(self) -> None:
+        """通知済みの日時をファイルに保存する"""
+        os.makedirs(os.path.dirname(self.save_path), exist_ok=True)
+        with open(self.save_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "reminded_until": (
+                        self.reminded_until.isoformat()
+                        if self.reminded_until is not None
+                        else None
+                    )
+                },
+                f,
+            )
@@ -0,0 +1,65 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, TypeVar
+
+import httpx
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+from notiontaskr import config
+
+T = TypeVar("T")
+
+
+class RetryPolicy:
+    """一時的なエラーに対してジッター付き指数バックオフで再試行するクラス
+
+    429はNotionRateLimiterがRetry-Afterに従って再送するため、二重に再試行しない
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = config.NOTION_RETRY_MAX_ATTEMPTS,
+        base_delay: float = config.NOTION_RETRY_BASE_DELAY,
+        max_delay: float = config.NOTION_RETRY_MAX_DELAY,
+    ):
+        if max_attempts < 1:
+            raise ValueError(
+                f"max_attempts`{max_attempts}`は1以上でなければなりません。"
+            )
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    async def run(self, request: Callable[[], Awaitable[T]]) -> T:
+        """一時的なエラーが発生した場合は再試行しながらリクエストを実行する
+
+        :param request: 呼び出すたびに新しいリクエストを生成する関数
+        :raise Exception: 一時的でないエラー、または再試行回数の上限に達した場合
+        """
+        attempt = 1
+        while True:
+            try:
+                return await request()
+            except Exception as e:
+                if not self.is_retryable_error(e) or attempt >= self.max_attempts:
+                    raise
+                await asyncio.sleep(self.get_delay(attempt))
+                attempt += 1
+
+    def get_delay(self, attempt: int) -> float:
+        """試行回数に応じた待機秒数を取得する(フルジッター)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    @classmethod
+    def is_retryable_error(cls, e: Exception) -> bool:
+        """再試行するエラーか判定する(429以外の一時的なエラー)"""
+        if isinstance(e, HTTPResponseError) and e.status == 429:
+            return False
+        return cls.is_transient_error(e)
+
+    @staticmethod
+    def is_transient_error(e: Exception) -> bool:
+        """再試行で回復しうるエラーか判定する"""
+        if isinstance(e, HTTPResponseError):
+            return e.status == 429 or e.status >= 500
+        return isinstance(e, (RequestTimeoutError, httpx.TransportError))
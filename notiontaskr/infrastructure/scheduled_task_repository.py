@@ -1,9 +1,19 @@
-from typing import Callable
+from typing import Callable, Optional
+
+from notion_client import AsyncClient
 from notiontaskr.domain.value_objects.page_id import PageId
 from notiontaskr.infrastructure.scheduled_task_update_properties import (
     ScheduledTaskUpdateProperties,
 )
-from notion_client import Client
+from notiontaskr.infrastructure.notion_client_pool import NotionClientPool
+from notiontaskr.infrastructure.notion_rate_limiter import NotionRateLimiter
+from notiontaskr.infrastructure.notion_query_paginator import (
+    NotionQueryPaginator,
+    PageFetchMetric,
+)
+from notiontaskr.infrastructure.retry_policy import RetryPolicy
+from notiontaskr.infrastructure.dead_letter_store import DeadLetter, DeadLetterStore
+from notiontaskr.infrastructure.written_property_store import WrittenPropertyStore
 from notiontaskr.domain.scheduled_task import ScheduledTask
 from notiontaskr.infrastructure.operator import CheckboxOperator
 from notiontaskr.infrastructure.task_search_condition import TaskSearchCondition
@@ -11,129 +21,131 @@ from notiontaskr.domain.scheduled_tasks import ScheduledTasks
 
 
 class ScheduledTaskRepository:
-    def __init__(self, token, db_id):
-        self.client = Client(
-            auth=token,
-        )
+    def __init__(
+        self,
+        token,
+        db_id,
+        client_pool: Optional[NotionClientPool] = None,
+        rate_limiter: Optional[NotionRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        dead_letter_store: Optional[DeadLetterStore] = None,
+        written_property_store: Optional[WrittenPropertyStore] = None,
+    ):
+        # 予定・実績リポジトリ間でコネクションプールとレート制限を共有できるようにする
+        self.client_pool = client_pool or NotionClientPool(token)
+        self.rate_limiter = rate_limiter or NotionRateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        # 再試行しても更新できなかった内容の退避先(Noneの場合は破棄する)
+        self.dead_letter_store = dead_letter_store
+        # 前回書き込んだ内容と同じ場合に更新を省略するための記録(Noneの場合は常に更新する)
+        self.written_property_store = written_property_store
         self.db_id = db_id
         self.filter = TaskSearchCondition()
+        self.paginator = NotionQueryPaginator(query=self._query)
+
+    @property
+    def client(self) -> AsyncClient:
+        """実行中のイベントループに対応するNotionクライアントを取得する"""
+        return self.client_pool.get()
 
     async def find_all(
-        self, on_error: Callable[[Exception, dict], None]
+        self,
+        on_error: Callable[[Exception, dict], None],
+        max_pages: Optional[int] = None,
+        on_page_fetched: Optional[Callable[[PageFetchMetric], None]] = None,
     ) -> ScheduledTasks:
         """全ての予定を取得する"""
-        filter = (
-            TaskSearchCondition()
-            .and_(
-                TaskSearchCondition().where_scheduled_flag(
-                    operator=CheckboxOperator.EQUALS, is_scheduled=True
-                ),
-            )
-            .build()
-        )
-
-        response_data = self.client.databases.query(
-            **{"database_id": self.db_id, "filter": filter}
+        return await self._find_by_filter(
+            filter=self._build_filter(),
+            on_error=on_error,
+            max_pages=max_pages,
+            on_page_fetched=on_page_fetched,
         )
 
-        # response_dataをScheduledTaskのリストに変換する
-        scheduled_tasks = ScheduledTasks.from_empty()
-        for data in response_data["results"]:  # type: ignore
-            try:
-                scheduled_tasks.append(ScheduledTask.from_response_data(data))
-            except Exception as e:
-                # 名前が空のときにもスキップされる
-                on_error(e, data)
-
-        return scheduled_tasks
-
     async def find_by_condition(
         self,
         condition: TaskSearchCondition,
         on_error: Callable[[Exception, dict], None],
+        max_pages: Optional[int] = None,
+        on_page_fetched: Optional[Callable[[PageFetchMetric], None]] = None,
     ) -> ScheduledTasks:
-        """タスクDBの指定タグの予定を全て取得する"""
-        filter = (
-            TaskSearchCondition()
-            .and_(
-                TaskSearchCondition().where_scheduled_flag(
-                    operator=CheckboxOperator.EQUALS, is_scheduled=True
-                ),
-                condition,
-            )
-            .build()
+        """指定した条件に一致する予定タスクをページネーションを考慮して取得する
+
+        :param max_pages: 取得するページ数(1ページ100件)の上限。Noneの場合は全ページ
+        :param on_page_fetched: ページを受信するたびに取得時間の計測結果を受け取る関数
+        """
+        return await self._find_by_filter(
+            filter=self._build_filter(condition),
+            on_error=on_error,
+            max_pages=max_pages,
+            on_page_fetched=on_page_fetched,
         )
 
-        response_data = self.client.databases.query(
-            **{"database_id": self.db_id, "filter": filter}
-        )
-
-        # response_dataをScheduledTaskのリストに変換する
-        scheduled_tasks = ScheduledTasks.from_empty()
-        for data in response_data["results"]:  # type: ignore
-            try:
-                scheduled_tasks.append(ScheduledTask.from_response_data(data))
-            except Exception as e:
-                # 名前が空のときにもスキップされる
-                on_error(e, data)
-
-        return scheduled_tasks
-
     async def find_all_by_condition(
         self,
         condition: TaskSearchCondition,
         on_error: Callable[[Exception, dict], None],
+        max_pages: Optional[int] = None,
+        on_page_fetched: Optional[Callable[[PageFetchMetric], None]] = None,
     ) -> ScheduledTasks:
         """指定した条件に一致する全ての予定タスクをページネーションを考慮して取得する"""
-        all_tasks = ScheduledTasks.from_empty()
-        start_cursor = None
-        has_more = True
-        while has_more:
-            tasks, next_cursor, has_more = await self._find_by_condition_with_cursor(
-                condition=condition,
-                on_error=on_error,
-                start_cursor=start_cursor,  # type: ignore
-            )
-            all_tasks.extend(tasks)
-            start_cursor = next_cursor
-        return all_tasks
+        return await self.find_by_condition(
+            condition=condition,
+            on_error=on_error,
+            max_pages=max_pages,
+            on_page_fetched=on_page_fetched,
+        )
 
-    async def _find_by_condition_with_cursor(
+    async def _find_by_filter(
         self,
-        condition: TaskSearchCondition,
+        filter: dict,
         on_error: Callable[[Exception, dict], None],
-        start_cursor: str = None,  # type: ignore
-    ) -> tuple[ScheduledTasks, str, bool]:
-        """タスクDBの指定タグの予定を全て取得する（ページネーション対応）"""
-        filter = (
-            TaskSearchCondition()
-            .and_(
-                TaskSearchCondition().where_scheduled_flag(
-                    operator=CheckboxOperator.EQUALS, is_scheduled=True
-                ),
-                condition,
-            )
-            .build()
-        )
-        query_params = {"database_id": self.db_id, "filter": filter}
-        if start_cursor:
-            query_params["start_cursor"] = start_cursor
+        max_pages: Optional[int],
+        on_page_fetched: Optional[Callable[[PageFetchMetric], None]],
+    ) -> ScheduledTasks:
+        """フィルターに一致する予定タスクを取得する
 
-        response_data = self.client.databases.query(**query_params)
+        次のページを先読みしながら、受信済みのページをScheduledTaskに変換する
+        """
         scheduled_tasks = ScheduledTasks.from_empty()
-        for data in response_data["results"]:  # type: ignore
-            try:
-                scheduled_tasks.append(ScheduledTask.from_response_data(data))
-            except Exception as e:
-                on_error(e, data)
-        next_cursor = response_data.get("next_cursor")  # type: ignore
-        has_more = response_data.get("has_more", False)  # type: ignore
-        return scheduled_tasks, next_cursor, has_more
+        async for response_data in self.paginator.iter_pages(
+            query_params={"database_id": self.db_id, "filter": filter},
+            max_pages=max_pages,
+            on_page_fetched=on_page_fetched,
+        ):
+            for data in response_data["results"]:
+                if self.written_property_store is not None:
+                    self.written_property_store.verify(data)
+                try:
+                    scheduled_tasks.append(ScheduledTask.from_response_data(data))
+                except Exception as e:
+                    # 名前が空のときにもスキップされる
+                    on_error(e, data)
+        return scheduled_tasks
+
+    def _build_filter(self, condition: Optional[TaskSearchCondition] = None) -> dict:
+        """予定フラグの条件を付与したフィルターを生成する"""
+        conditions = [
+            TaskSearchCondition().where_scheduled_flag(
+                operator=CheckboxOperator.EQUALS, is_scheduled=True
+            )
+        ]
+        if condition is not None:
+            conditions.append(condition)
+        return TaskSearchCondition().and_(*conditions).build()
+
+    async def _query(self, query_params: dict) -> dict:
+        """レート制限の下でデータベースを1ページ分検索する"""
+        return await self.rate_limiter.call(
+            lambda: self.client.databases.query(**query_params)
+        )
 
     async def find_by_page_id(self, page_id: PageId) -> ScheduledTask:
         """ページIDから1件のページ情報を取得する"""
         try:
-            response_data = self.client.pages.retrieve(page_id=str(page_id))
+            response_data = await self.rate_limiter.call(
+                lambda: self.client.pages.retrieve(page_id=str(page_id))
+            )
             task = ScheduledTask.from_response_data(response_data)  # type: ignore
             return task
 
@@ -146,26 +158,72 @@ class ScheduledTaskRepository:
         on_success: Callable[[ScheduledTask], None],
         on_error: Callable[[Exception, ScheduledTask], None],
     ):
-        """予定タスクを更新する"""
+        """予定タスクを更新する
+
+        送信するプロパティが無い場合や、前回書き込んだ内容と同じ場合は更新しない
+        """
 
         try:
+            # 更新内容に記録された項目のみを送信する
             properties = (
                 ScheduledTaskUpdateProperties(task=scheduled_task)
-                .set_name()
-                .set_status()
-                .set_scheduled_man_hours()
-                .set_executed_man_hours()
-                .set_progress_rate()
-                .set_has_before_start()
-                .set_has_before_end()
-                .set_before_start_minutes()
-                .set_before_end_minutes()
+                .set_updated_contents()
                 .build()
             )
-
-            self.client.pages.update(
-                **{"page_id": str(scheduled_task.page_id), "properties": properties}
-            )
+            if not properties:
+                return
+
+            page_id = str(scheduled_task.page_id)
+            written_properties = None
+            if self.written_property_store is not None:
+                # 再計算で同じ値になっただけの場合は、前回の書き込み内容と一致するため省略する
+                written_properties = (
+                    ScheduledTaskUpdateProperties(task=scheduled_task).set_all().build()
+                )
+                if self.written_property_store.is_written(page_id, written_properties):
+                    self.written_property_store.skipped_count += 1
+                    return
+
+            response = await self.update_page(page_id=page_id, properties=properties)
+            if self.written_property_store is not None and written_properties:
+                self.written_property_store.record(
+                    page_id=page_id,
+                    properties=written_properties,
+                    last_edited_time=response.get("last_edited_time"),
+                )
             on_success(scheduled_task)
         except Exception as e:
+            if self.written_property_store is not None:
+                self.written_property_store.discard(str(scheduled_task.page_id))
+            if self.dead_letter_store is not None and RetryPolicy.is_transient_error(e):
+                self.dead_letter_store.append(
+                    DeadLetter(
+                        kind=DeadLetterStore.SCHEDULED,
+                        page_id=str(scheduled_task.page_id),
+                        task_number=scheduled_task.id.number,
+                        properties=properties,
+                        error=str(e),
+                        last_edited_time=scheduled_task.last_edited_time,
+                    )
+                )
             on_error(e, scheduled_task)
+
+    async def retrieve_page(self, page_id: str) -> dict:
+        """レート制限の下でページを取得する"""
+        return await self.rate_limiter.call(
+            lambda: self.client.pages.retrieve(page_id=page_id)
+        )
+
+    async def update_page(self, page_id: str, properties: dict) -> dict:
+        """ページのプロパティを更新し、更新後のページを返す
+
+        429はレート制限でRetry-Afterに従って再送し、
+        それ以外の一時的なエラーはジッター付き指数バックオフで再試行する
+        """
+        return await self.retry_policy.run(
+            lambda: self.rate_limiter.call(
+                lambda: self.client.pages.update(
+                    **{"page_id": page_id, "properties": properties}
+                )
+            )
+        )
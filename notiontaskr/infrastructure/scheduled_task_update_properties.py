@@ -25,3 +25,10 @@ class ScheduledTaskUpdateProperties(TaskUpdateProperties):
             "number": self.task.progress_rate.value,
         }
         return self
+
+    SETTERS_BY_UPDATE_KEY = {
+        **TaskUpdateProperties.SETTERS_BY_UPDATE_KEY,
+        "予定人時": (set_scheduled_man_hours,),
+        "実績人時": (set_executed_man_hours,),
+        "進捗率": (set_progress_rate,),
+    }
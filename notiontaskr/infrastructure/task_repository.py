@@ -0,0 +1,93 @@
+from typing import Callable, Optional
+
+from notion_client import AsyncClient
+from notiontaskr.infrastructure.notion_client_pool import NotionClientPool
+from notiontaskr.infrastructure.notion_rate_limiter import NotionRateLimiter
+from notiontaskr.infrastructure.notion_query_paginator import (
+    NotionQueryPaginator,
+    PageFetchMetric,
+)
+from notiontaskr.infrastructure.task_search_condition import TaskSearchCondition
+from notiontaskr.infrastructure.written_property_store import WrittenPropertyStore
+
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.domain.executed_task import ExecutedTask
+from notiontaskr.domain.scheduled_tasks import ScheduledTasks
+from notiontaskr.domain.executed_tasks import ExecutedTasks
+
+
+class TaskRepository:
+    """予定タスクと実績タスクを1回の検索でまとめて取得するクラス
+
+    予定・実績は同じデータベースに格納されているため、予定フラグで絞り込まずに検索し、
+    受信したページを予定フラグの値で振り分ける。
+    """
+
+    SCHEDULED_FLAG_PROPERTY = "予定フラグ"
+
+    def __init__(
+        self,
+        token,
+        db_id,
+        client_pool: Optional[NotionClientPool] = None,
+        rate_limiter: Optional[NotionRateLimiter] = None,
+        written_property_store: Optional[WrittenPropertyStore] = None,
+    ):
+        self.client_pool = client_pool or NotionClientPool(token)
+        self.rate_limiter = rate_limiter or NotionRateLimiter()
+        # 取得したページが書き込み後に編集されていないかの確認に使用する
+        self.written_property_store = written_property_store
+        self.db_id = db_id
+        self.paginator = NotionQueryPaginator(query=self._query)
+
+    @property
+    def client(self) -> AsyncClient:
+        """実行中のイベントループに対応するNotionクライアントを取得する"""
+        return self.client_pool.get()
+
+    async def find_by_condition(
+        self,
+        condition: TaskSearchCondition,
+        on_error: Callable[[Exception, dict], None],
+        max_pages: Optional[int] = None,
+        on_page_fetched: Optional[Callable[[PageFetchMetric], None]] = None,
+    ) -> tuple[ScheduledTasks, ExecutedTasks]:
+        """指定した条件に一致する予定タスクと実績タスクを取得する
+
+        :param max_pages: 取得するページ数(1ページ100件)の上限。Noneの場合は全ページ
+        :param on_page_fetched: ページを受信するたびに取得時間の計測結果を受け取る関数
+        :return: (予定タスク, 実績タスク)
+        """
+        scheduled_tasks = ScheduledTasks.from_empty()
+        executed_tasks = ExecutedTasks.from_empty()
+        async for response_data in self.paginator.iter_pages(
+            query_params={"database_id": self.db_id, "filter": condition.build()},
+            max_pages=max_pages,
+            on_page_fetched=on_page_fetched,
+        ):
+            for data in response_data["results"]:
+                if self.written_property_store is not None:
+                    self.written_property_store.verify(data)
+                try:
+                    if self.is_scheduled(data):
+                        scheduled_tasks.append(ScheduledTask.from_response_data(data))
+                    else:
+                        executed_tasks.append(ExecutedTask.from_response_data(data))
+                except Exception as e:
+                    # 名前が空のときにもスキップされる
+                    on_error(e, data)
+        return scheduled_tasks, executed_tasks
+
+    @classmethod
+    def is_scheduled(cls, data: dict) -> bool:
+        """レスポンスデータが予定タスクか判定する
+
+        :raise KeyError: 予定フラグが存在しない場合
+        """
+        return bool(data["properties"][cls.SCHEDULED_FLAG_PROPERTY]["checkbox"])
+
+    async def _query(self, query_params: dict) -> dict:
+        """レート制限の下でデータベースを1ページ分検索する"""
+        return await self.rate_limiter.call(
+            lambda: self.client.databases.query(**query_params)
+        )
@@ -0,0 +1,297 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+import json
+import struct
+from typing import Optional
+
+from notiontaskr.domain.executed_task import ExecutedTask
+from notiontaskr.domain.name_labels.id_label import IdLabel
+from notiontaskr.domain.name_labels.man_hours_label import ManHoursLabel
+from notiontaskr.domain.name_labels.parent_id_label import ParentIdLabel
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.domain.tags import Tags
+from notiontaskr.domain.task import Task
+from notiontaskr.domain.task_identity_map import TaskIdentityMap
+from notiontaskr.domain.task_name import TaskName
+from notiontaskr.domain.value_objects.executed_man_hours import ExecutedManHours
+from notiontaskr.domain.value_objects.man_hours import ManHours
+from notiontaskr.domain.value_objects.notion_date import NotionDate
+from notiontaskr.domain.value_objects.notion_id import NotionId
+from notiontaskr.domain.value_objects.page_id import PageId
+from notiontaskr.domain.value_objects.parent_task_page_id import ParentTaskPageId
+from notiontaskr.domain.value_objects.progress_rate import ProgressRate
+from notiontaskr.domain.value_objects.scheduled_man_hours import ScheduledManHours
+from notiontaskr.domain.value_objects.scheduled_task_id import ScheduledTaskId
+from notiontaskr.domain.value_objects.scheduled_task_page_id import ScheduledTaskPageId
+from notiontaskr.domain.value_objects.status import Status
+from notiontaskr.domain.value_objects.sub_task_page_ids import SubTaskPageIds
+from notiontaskr.domain.value_objects.tag import Tag
+from notiontaskr.notifier.remind_minutes import RemindMinutes
+from notiontaskr.notifier.task_remind_info import TaskRemindInfo
+
+
+class TaskCodec(ABC):
+    """シリアライズしたタスクの圧縮方式"""
+
+    # ヘッダに記録する圧縮方式の識別子
+    CODEC_ID: int
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        pass
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        pass
+
+
+class RawCodec(TaskCodec):
+    """圧縮しない(小さなレコード向け)"""
+
+    CODEC_ID = 0
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+
+@dataclass
+class DecodedTask:
+    """レコードから復元したタスクと、未解決の関連タスクのID"""
+
+    task: Task
+    sub_task_ids: list[str] = field(default_factory=list)
+    executed_task_ids: list[str] = field(default_factory=list)
+
+    def register(self, identity_map: TaskIdentityMap) -> None:
+        """タスクと参照しているタスクIDを識別マップに登録する"""
+        if isinstance(self.task, ScheduledTask):
+            identity_map.put_scheduled_task(
+                self.task,
+                sub_task_ids=self.sub_task_ids,
+                executed_task_ids=self.executed_task_ids,
+            )
+        else:
+            identity_map.put_executed_task(self.task)  # type: ignore
+
+
+class TaskSerializer:
+    """タスクをスキーマバージョン付きのフラットなレコードに変換するクラス
+
+    - サブアイテム・実績タスクは入れ子のコピーではなくタスクIDで参照する
+    - 更新内容(update_contents)は保存しないため、復元したタスクは未更新の状態になる
+    - 先頭にマジックバイト・スキーマバージョン・圧縮方式を持つため、
+      圧縮方式に関わらず復元できる
+    """
+
+    MAGIC = b"NT"
+    # レコードの構成を変更した場合は値を上げる(古いバージョンは復元できない)
+    SCHEMA_VERSION = 1
+    HEADER = struct.Struct(">2sBB")
+
+    SCHEDULED = "s"
+    EXECUTED = "e"
+
+    CODECS: dict[int, type[TaskCodec]] = {RawCodec.CODEC_ID: RawCodec}
+
+    def __init__(self, codec: Optional[TaskCodec] = None):
+        """
+        :param codec: 書き込み時の圧縮方式。Noneの場合は圧縮しない
+        """
+        self.codec = codec or RawCodec()
+        self._codecs: dict[int, TaskCodec] = {self.codec.CODEC_ID: self.codec}
+
+    def encode(self, task: Task) -> bytes:
+        """タスクを1件のレコードに変換する"""
+        return self._pack(self._to_record(task))
+
+    def decode(self, data: bytes) -> DecodedTask:
+        """レコードからタスクを復元する(関連タスクは未解決のまま)
+
+        :raise ValueError: 形式もしくはスキーマバージョンが未対応の場合
+        """
+        return self._from_record(self._unpack(data))
+
+    def _pack(self, value) -> bytes:
+        """ヘッダを付与し、JSONを圧縮する"""
+        body = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        return self.HEADER.pack(
+            self.MAGIC, self.SCHEMA_VERSION, self.codec.CODEC_ID
+        ) + self.codec.compress(body.encode("utf-8"))
+
+    def _unpack(self, data: bytes):
+        """ヘッダを検証し、展開したJSONを読み込む"""
+        if len(data) < self.HEADER.size:
+            raise ValueError("タスクのレコードの形式が不正です。")
+        magic, version, codec_id = self.HEADER.unpack_from(data)
+        if magic != self.MAGIC:
+            raise ValueError("タスクのレコードの形式が不正です。")
+        if version != self.SCHEMA_VERSION:
+            raise ValueError(f"未対応のスキーマバージョンです: {version}")
+        body = self._get_codec(codec_id).decompress(data[self.HEADER.size :])
+        return json.loads(body)
+
+    def _get_codec(self, codec_id: int) -> TaskCodec:
+        """識別子に対応する圧縮方式を取得する"""
+        codec = self._codecs.get(codec_id)
+        if codec is None:
+            codec_class = self.CODECS.get(codec_id)
+            if codec_class is None:
+                raise ValueError(f"未対応の圧縮方式です: {codec_id}")
+            codec = self._codecs[codec_id] = codec_class()
+        return codec
+
+    def _to_record(self, task: Task) -> list:
+        """タスクをフラットなレコード(リスト)に変換する"""
+        name = task.name
+        remind_info = task.remind_info
+        record = [
+            self.SCHEDULED if isinstance(task, ScheduledTask) else self.EXECUTED,
+            task.page_id.value,
+            [
+                name.task_name,
+                self._label_to_value(name.id_label),
+                self._label_to_value(name.man_hours_label),
+                self._label_to_value(name.parent_id_label),
+            ],
+            [tag.value for tag in task.tags],
+            [task.id.number, task.id.prefix],
+            task.status.value,
+            [
+                self._minutes_to_value(remind_info.before_start_minutes),
+                self._minutes_to_value(remind_info.before_end_minutes),
+                remind_info.has_before_start,
+                remind_info.has_before_end,
+                remind_info.has_start,
+                remind_info.has_end,
+            ],
+            task.parent_task_page_id.value if task.parent_task_page_id else None,
+            (
+                [task.date.start.isoformat(), task.date.end.isoformat()]
+                if task.date
+                else None
+            ),
+        ]
+        if isinstance(task, ScheduledTask):
+            record += [
+                task.scheduled_man_hours.value,
+                task.executed_man_hours.value,
+                task.progress_rate.value,
+                [page_id.value for page_id in task.sub_task_page_ids],
+                [sub_task.id.number for sub_task in task.sub_tasks],
+                [executed_task.id.number for executed_task in task.executed_tasks],
+            ]
+        elif isinstance(task, ExecutedTask):
+            record += [
+                task.man_hours.value,
+                (
+                    [task.scheduled_task_id.number, task.scheduled_task_id.prefix]
+                    if task.scheduled_task_id
+                    else None
+                ),
+                (
+                    task.scheduled_task_page_id.value
+                    if task.scheduled_task_page_id
+                    else None
+                ),
+            ]
+        else:
+            raise ValueError(f"未対応のタスクです: {type(task)}")
+        return record
+
+    def _from_record(self, record: list) -> DecodedTask:
+        """レコードからタスクを復元する"""
+        kind, page_id, name, tags, id, status, remind, parent_page_id, date = record[:9]
+        task_name, id_label, man_hours_label, parent_id_label = name
+        common = {
+            "page_id": PageId(page_id),
+            "name": TaskName(
+                task_name=task_name,
+                id_label=IdLabel(*id_label) if id_label else None,
+                man_hours_label=(
+                    ManHoursLabel(*man_hours_label) if man_hours_label else None
+                ),
+                parent_id_label=(
+                    ParentIdLabel(*parent_id_label) if parent_id_label else None
+                ),
+            ),
+            "tags": Tags.from_tags([Tag(tag) for tag in tags]),
+            "id": NotionId(*id),
+            "status": Status(status),
+            "remind_info": TaskRemindInfo(
+                before_start_minutes=self._value_to_minutes(remind[0]),
+                before_end_minutes=self._value_to_minutes(remind[1]),
+                has_before_start=remind[2],
+                has_before_end=remind[3],
+                has_start=remind[4],
+                has_end=remind[5],
+            ),
+            "parent_task_page_id": (
+                ParentTaskPageId(parent_page_id) if parent_page_id else None
+            ),
+            "date": (
+                NotionDate(
+                    start=datetime.fromisoformat(date[0]),
+                    end=datetime.fromisoformat(date[1]),
+                )
+                if date
+                else None
+            ),
+        }
+
+        if kind == self.SCHEDULED:
+            (
+                scheduled_man_hours,
+                executed_man_hours,
+                progress_rate,
+                sub_task_page_ids,
+                sub_task_ids,
+                executed_task_ids,
+            ) = record[9:]
+            return DecodedTask(
+                task=ScheduledTask(
+                    **common,
+                    scheduled_man_hours=ScheduledManHours(scheduled_man_hours),
+                    executed_man_hours=ExecutedManHours(executed_man_hours),
+                    progress_rate=ProgressRate(progress_rate),
+                    sub_task_page_ids=SubTaskPageIds(
+                        [PageId(page_id) for page_id in sub_task_page_ids]
+                    ),
+                ),
+                sub_task_ids=sub_task_ids,
+                executed_task_ids=executed_task_ids,
+            )
+        if kind == self.EXECUTED:
+            man_hours, scheduled_task_id, scheduled_task_page_id = record[9:]
+            return DecodedTask(
+                task=ExecutedTask(
+                    **common,
+                    man_hours=ManHours(man_hours),
+                    scheduled_task_id=(
+                        ScheduledTaskId(*scheduled_task_id)
+                        if scheduled_task_id
+                        else None
+                    ),
+                    scheduled_task_page_id=(
+                        ScheduledTaskPageId(scheduled_task_page_id)
+                        if scheduled_task_page_id
+                        else None
+                    ),
+                )
+            )
+        raise ValueError(f"未対応のタスクの種類です: {kind}")
+
+    @staticmethod
+    def _label_to_value(label) -> Optional[list]:
+        return [label.key, label.value] if label else None
+
+    @staticmethod
+    def _minutes_to_value(minutes: Optional[RemindMinutes]) -> Optional[float]:
+        return minutes.total_seconds() if minutes is not None else None
+
+    @staticmethod
+    def _value_to_minutes(value: Optional[float]) -> Optional[RemindMinutes]:
+        return RemindMinutes(seconds=value) if value is not None else None
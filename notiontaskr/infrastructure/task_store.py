@@ -0,0 +1,519 @@
+from contextlib import closing
+from datetime import datetime, timezone
+import os
+import sqlite3
+from typing import Iterable, Optional
+
+from notiontaskr.domain.executed_tasks import ExecutedTasks
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.domain.scheduled_tasks import ScheduledTasks
+from notiontaskr.domain.task import Task
+from notiontaskr.domain.task_identity_map import TaskIdentityMap
+from notiontaskr.domain.tasks import Tasks
+from notiontaskr.domain.value_objects.man_hours import ManHours
+from notiontaskr.domain.value_objects.tag import Tag
+from notiontaskr.util.converter import normalize_task_name
+from notiontaskr.infrastructure.task_serializer import (
+    DecodedTask,
+    RawCodec,
+    TaskSerializer,
+)
+
+
+class TaskStore:
+    """タスクをSQLiteにタスク単位で保存するクラス
+
+    タスクID・ページID・親ページID・予定タスクID・タスク名・日付に索引を持ち、
+    変更のあったタスクのみの追加・更新と、関連するタスクのみの読み込みができる。
+    サブアイテム・実績タスクはタスクIDで参照して保存し、読み込み時に識別マップを通して紐づける。
+    実績タスクの人時はタグ×日ごとの集計表(uptime_cube)に書き込みのたびに差分で反映し、
+    稼働実績をタスクを読み込まずに集計できる。
+    全てのタスクを置き換えた際に、実績タスクを漏れなく保存している期間の開始日時(covered_from)を記録する。
+    """
+
+    SCHEDULED = "scheduled"
+    EXECUTED = "executed"
+
+    # 1回の検索で指定する値の上限(SQLiteのプレースホルダ数の制限に合わせる)
+    MAX_QUERY_VALUES = 500
+
+    def __init__(self, save_path: str, serializer: Optional[TaskSerializer] = None):
+        """
+        :param serializer: 1行ごとのタスクの変換に使用する。
+            Noneの場合は圧縮しない(1件のレコードは小さく、圧縮の効果より展開の時間が大きいため)
+        """
+        self.save_path = save_path
+        self.serializer = serializer or TaskSerializer(codec=RawCodec())
+
+    def _connect(self) -> sqlite3.Connection:
+        """データベースに接続し、テーブルと索引が無ければ作成する
+
+        保存されているタスクのスキーマバージョンが異なる場合は、復元できないため全て削除する
+        """
+        os.makedirs(os.path.dirname(self.save_path), exist_ok=True)
+        conn = sqlite3.connect(self.save_path)
+        if (
+            conn.execute("PRAGMA user_version").fetchone()[0]
+            != TaskSerializer.SCHEMA_VERSION
+        ):
+            with conn:
+                conn.execute("DROP TABLE IF EXISTS tasks")
+                conn.execute("DROP TABLE IF EXISTS uptime_contributions")
+                conn.execute("DROP TABLE IF EXISTS uptime_cube")
+                conn.execute("DROP TABLE IF EXISTS metadata")
+                conn.execute(f"PRAGMA user_version = {TaskSerializer.SCHEMA_VERSION}")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                kind TEXT NOT NULL,
+                task_id TEXT NOT NULL,
+                page_id TEXT NOT NULL,
+                parent_page_id TEXT,
+                scheduled_task_id TEXT,
+                name TEXT NOT NULL,
+                date_start TEXT,
+                data BLOB NOT NULL,
+                PRIMARY KEY (kind, task_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_tasks_page_id ON tasks (kind, page_id);
+            CREATE INDEX IF NOT EXISTS idx_tasks_parent_page_id
+                ON tasks (kind, parent_page_id);
+            CREATE INDEX IF NOT EXISTS idx_tasks_scheduled_task_id
+                ON tasks (kind, scheduled_task_id);
+            CREATE INDEX IF NOT EXISTS idx_tasks_name ON tasks (kind, name);
+            CREATE INDEX IF NOT EXISTS idx_tasks_date_start ON tasks (kind, date_start);
+            CREATE TABLE IF NOT EXISTS metadata (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """)
+        if not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'uptime_cube'"
+        ).fetchone():
+            self._create_uptime_cube(conn)
+        return conn
+
+    def _create_uptime_cube(self, conn: sqlite3.Connection) -> None:
+        """稼働実績の集計表を作成し、保存されている実績タスクから集計する"""
+        with conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS uptime_contributions (
+                    task_id TEXT NOT NULL,
+                    tag TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    hours REAL NOT NULL,
+                    PRIMARY KEY (task_id, tag)
+                );
+                CREATE TABLE uptime_cube (
+                    tag TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    hours REAL NOT NULL,
+                    PRIMARY KEY (tag, day)
+                ) WITHOUT ROWID;
+                """)
+            rows = conn.execute(
+                "SELECT data FROM tasks WHERE kind = ?", (self.EXECUTED,)
+            ).fetchall()
+            self._update_uptime_cube(
+                conn, [self.serializer.decode(row[0]).task for row in rows]
+            )
+
+    def replace_all(
+        self,
+        scheduled_tasks: ScheduledTasks,
+        executed_tasks: ExecutedTasks,
+        covered_from: Optional[datetime] = None,
+    ) -> None:
+        """保存している全てのタスクを置き換える
+
+        :param covered_from: 開始日がこの日時以降の実績タスクを漏れなく含んでいる場合に指定する。
+            Noneの場合は、どの期間の実績タスクも漏れなく保存しているとはみなさない
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM tasks")
+            conn.execute("DELETE FROM uptime_contributions")
+            conn.execute("DELETE FROM uptime_cube")
+            conn.execute("DELETE FROM metadata WHERE key = 'covered_from'")
+            if covered_from is not None:
+                conn.execute(
+                    "INSERT INTO metadata VALUES ('covered_from', ?)",
+                    (self._format_date(covered_from),),
+                )
+            self._insert(conn, scheduled_tasks)
+            self._insert(conn, executed_tasks)
+
+    def get_covered_from(self) -> Optional[datetime]:
+        """実績タスクを漏れなく保存している期間の開始日時(UTC)を取得する
+
+        全てのタスクを置き換えた際に指定されていない場合はNoneを返す
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT value FROM metadata WHERE key = 'covered_from'"
+            ).fetchone()
+        if row is None:
+            return None
+        return datetime.fromisoformat(row[0]).replace(tzinfo=timezone.utc)
+
+    def upsert(self, tasks: Tasks) -> None:
+        """タスクを追加もしくは更新する"""
+        with closing(self._connect()) as conn, conn:
+            self._insert(conn, tasks)
+
+    def merge(self, other_path: str) -> None:
+        """別のタスクストアファイルのタスクを追加もしくは更新する
+
+        :raise ValueError: 別のファイルのスキーマバージョンが異なる場合
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("ATTACH DATABASE ? AS other", (other_path,))
+            try:
+                version = conn.execute("PRAGMA other.user_version").fetchone()[0]
+                if version != TaskSerializer.SCHEMA_VERSION:
+                    raise ValueError(
+                        f"{other_path}は未対応のスキーマバージョンです: {version}"
+                    )
+                with conn:
+                    rows = conn.execute(
+                        "SELECT data FROM other.tasks WHERE kind = ?",
+                        (self.EXECUTED,),
+                    ).fetchall()
+                    self._update_uptime_cube(
+                        conn, [self.serializer.decode(row[0]).task for row in rows]
+                    )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO tasks SELECT * FROM other.tasks"
+                    )
+            finally:
+                conn.execute("DETACH DATABASE other")
+
+    def _insert(self, conn: sqlite3.Connection, tasks: Tasks) -> None:
+        """タスクを1行ずつ書き込む(同じタスクIDの行は置き換える)"""
+        kind = self._get_kind(tasks)
+        conn.executemany(
+            "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [self._to_row(kind, task) for task in tasks],
+        )
+        if kind == self.EXECUTED:
+            self._update_uptime_cube(conn, tasks)
+
+    def _update_uptime_cube(self, conn: sqlite3.Connection, tasks: Iterable) -> None:
+        """実績タスクの人時を、以前の値との差分として稼働実績の集計表に反映する"""
+        tasks_by_id = {task.id.number: task for task in tasks}
+        task_ids = list(tasks_by_id)
+        deltas: dict[tuple[str, str], float] = {}
+
+        # 以前の値を差し引く
+        for i in range(0, len(task_ids), self.MAX_QUERY_VALUES):
+            chunk = task_ids[i : i + self.MAX_QUERY_VALUES]
+            placeholders = ", ".join("?" for _ in chunk)
+            for tag, day, hours in conn.execute(
+                f"SELECT tag, day, hours FROM uptime_contributions WHERE task_id IN ({placeholders})",
+                chunk,
+            ):
+                deltas[(tag, day)] = deltas.get((tag, day), 0.0) - hours
+            conn.execute(
+                f"DELETE FROM uptime_contributions WHERE task_id IN ({placeholders})",
+                chunk,
+            )
+
+        # 新しい値を加える
+        contributions = []
+        for task_id, task in tasks_by_id.items():
+            if task.date is None:
+                continue
+            day = self._format_day(task.date.start)
+            hours = task.man_hours.value
+            for tag in dict.fromkeys(str(tag) for tag in task.tags):
+                contributions.append((task_id, tag, day, hours))
+                deltas[(tag, day)] = deltas.get((tag, day), 0.0) + hours
+        conn.executemany(
+            "INSERT INTO uptime_contributions VALUES (?, ?, ?, ?)", contributions
+        )
+
+        conn.executemany(
+            """
+            INSERT INTO uptime_cube VALUES (?, ?, ?)
+            ON CONFLICT (tag, day) DO UPDATE SET hours = hours + excluded.hours
+            """,
+            [(tag, day, hours) for (tag, day), hours in deltas.items() if hours != 0],
+        )
+
+    def sum_uptime_by_tag(
+        self, tags: Iterable[Tag], from_: datetime, to: datetime
+    ) -> dict[Tag, ManHours]:
+        """開始日が指定期間内の実績タスクについて、タグごとの人時の合計を集計表から取得する
+
+        日はUTCで区切る(タイムゾーンの無い日時はUTCとみなす)
+        """
+        tags = list(tags)
+        totals = {tag: ManHours(0) for tag in tags}
+        if not tags:
+            return totals
+        placeholders = ", ".join("?" for _ in tags)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT tag, SUM(hours) FROM uptime_cube
+                WHERE tag IN ({placeholders}) AND day BETWEEN ? AND ?
+                GROUP BY tag
+                """,
+                (
+                    *(str(tag) for tag in tags),
+                    self._format_day(from_),
+                    self._format_day(to),
+                ),
+            ).fetchall()
+        for tag, hours in rows:
+            # 差分の反映で生じる浮動小数点の誤差を丸める
+            totals[Tag(tag)] = ManHours(max(round(hours, 6), 0.0))
+        return totals
+
+    def count(self, kind: str) -> int:
+        """保存しているタスク数を取得する"""
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM tasks WHERE kind = ?", (kind,)
+            ).fetchone()[0]
+
+    def find_scheduled_tasks_by_ids(
+        self,
+        ids: Iterable[object],
+        identity_map: Optional[TaskIdentityMap] = None,
+    ) -> ScheduledTasks:
+        """タスクIDに一致する予定タスクを取得する"""
+        return ScheduledTasks.from_tasks(
+            self._find(
+                self.SCHEDULED,
+                "task_id",
+                [self._get_number(i) for i in ids],
+                identity_map,
+            )
+        )
+
+    def find_scheduled_tasks_by_page_ids(
+        self,
+        page_ids: Iterable[object],
+        identity_map: Optional[TaskIdentityMap] = None,
+    ) -> ScheduledTasks:
+        """ページIDに一致する予定タスクを取得する"""
+        return ScheduledTasks.from_tasks(
+            self._find(
+                self.SCHEDULED, "page_id", [str(p) for p in page_ids], identity_map
+            )
+        )
+
+    def find_scheduled_tasks_by_parent_page_ids(
+        self,
+        parent_page_ids: Iterable[object],
+        identity_map: Optional[TaskIdentityMap] = None,
+    ) -> ScheduledTasks:
+        """親ページIDに一致する予定タスク(サブアイテム)を取得する"""
+        return ScheduledTasks.from_tasks(
+            self._find(
+                self.SCHEDULED,
+                "parent_page_id",
+                [str(p) for p in parent_page_ids],
+                identity_map,
+            )
+        )
+
+    def find_ancestor_scheduled_tasks_by_page_ids(
+        self,
+        page_ids: Iterable[object],
+        identity_map: Optional[TaskIdentityMap] = None,
+    ) -> ScheduledTasks:
+        """ページIDに一致する予定タスクと、その親タスクを根まで辿って取得する
+
+        読み込む回数は階層の深さに比例する(関連が循環していても停止する)
+        """
+        if identity_map is None:
+            identity_map = TaskIdentityMap()
+        ancestors = ScheduledTasks.from_empty()
+        pending = {str(page_id) for page_id in page_ids}
+        visited: set[str] = set()
+        while pending:
+            visited |= pending
+            tasks = self.find_scheduled_tasks_by_page_ids(pending, identity_map)
+            ancestors.upsert_by_id(tasks)
+            pending = {
+                str(task.parent_task_page_id)
+                for task in tasks
+                if task.parent_task_page_id is not None
+            } - visited
+        return ancestors
+
+    def find_scheduled_tasks_by_names(
+        self,
+        names: Iterable[str],
+        identity_map: Optional[TaskIdentityMap] = None,
+    ) -> ScheduledTasks:
+        """タスク名(ラベルを除く)に一致する予定タスクを取得する
+
+        全角・半角や空白の違いを無視して検索するため、完全に一致しない予定タスクも含まれる
+        """
+        return ScheduledTasks.from_tasks(
+            self._find(
+                self.SCHEDULED,
+                "name",
+                [normalize_task_name(name) for name in names],
+                identity_map,
+            )
+        )
+
+    def find_executed_tasks_by_scheduled_task_ids(
+        self,
+        scheduled_task_ids: Iterable[object],
+        identity_map: Optional[TaskIdentityMap] = None,
+    ) -> ExecutedTasks:
+        """予定タスクIDに一致する実績タスクを取得する"""
+        return ExecutedTasks.from_tasks(
+            self._find(
+                self.EXECUTED,
+                "scheduled_task_id",
+                [self._get_number(i) for i in scheduled_task_ids],
+                identity_map,
+            )
+        )
+
+    def find_executed_tasks_by_date_range(
+        self, from_: datetime, to: datetime
+    ) -> ExecutedTasks:
+        """開始日時が指定期間内の実績タスクを取得する"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT data FROM tasks WHERE kind = ? AND date_start BETWEEN ? AND ?",
+                (self.EXECUTED, self._format_date(from_), self._format_date(to)),
+            ).fetchall()
+        return ExecutedTasks.from_tasks(
+            [self.serializer.decode(row[0]).task for row in rows]
+        )
+
+    def _find(
+        self,
+        kind: str,
+        column: str,
+        values: Iterable[str],
+        identity_map: Optional[TaskIdentityMap] = None,
+    ) -> list:
+        """指定した列の値に一致するタスクを取得する
+
+        参照しているサブアイテム・実績タスクも読み込んで紐づける
+
+        :param identity_map: 読み込んだタスクを登録する識別マップ。
+            登録済みのタスクは読み込まずに登録されているインスタンスを使用する
+        """
+        if identity_map is None:
+            identity_map = TaskIdentityMap()
+        with closing(self._connect()) as conn:
+            tasks, decoded_tasks = self._select(
+                conn, kind, column, values, identity_map
+            )
+
+            # 参照先が全て読み込まれるまで、サブアイテムのサブアイテムも辿る
+            unresolved = decoded_tasks
+            while unresolved:
+                _, decoded_sub_tasks = self._select(
+                    conn,
+                    self.SCHEDULED,
+                    "task_id",
+                    [i for decoded in unresolved for i in decoded.sub_task_ids],
+                    identity_map,
+                )
+                self._select(
+                    conn,
+                    self.EXECUTED,
+                    "task_id",
+                    [i for decoded in unresolved for i in decoded.executed_task_ids],
+                    identity_map,
+                )
+                decoded_tasks += decoded_sub_tasks
+                unresolved = decoded_sub_tasks
+
+        for decoded in decoded_tasks:
+            if isinstance(decoded.task, ScheduledTask):
+                identity_map.resolve(decoded.task)
+        return tasks
+
+    def _select(
+        self,
+        conn: sqlite3.Connection,
+        kind: str,
+        column: str,
+        values: Iterable[str],
+        identity_map: TaskIdentityMap,
+    ) -> tuple[list[Task], list[DecodedTask]]:
+        """指定した列の値に一致するタスクを読み込み、識別マップに登録する(参照は未解決のまま)
+
+        :return: (一致したタスク, 新たに読み込んだタスク)
+        """
+        get_registered = (
+            identity_map.get_scheduled_task
+            if kind == self.SCHEDULED
+            else identity_map.get_executed_task
+        )
+        tasks: list[Task] = []
+        values = list(dict.fromkeys(values))
+        if column == "task_id":
+            # 登録済みのタスクは検索しない
+            registered = [get_registered(value) for value in values]
+            tasks += [task for task in registered if task is not None]
+            values = [value for value, task in zip(values, registered) if task is None]
+
+        decoded_tasks = []
+        for i in range(0, len(values), self.MAX_QUERY_VALUES):
+            chunk = values[i : i + self.MAX_QUERY_VALUES]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = conn.execute(
+                f"SELECT task_id, data FROM tasks WHERE kind = ? AND {column} IN ({placeholders})",
+                (kind, *chunk),
+            ).fetchall()
+            for task_id, data in rows:
+                task = get_registered(task_id)
+                if task is None:
+                    decoded = self.serializer.decode(data)
+                    decoded.register(identity_map)
+                    decoded_tasks.append(decoded)
+                    task = decoded.task
+                tasks.append(task)
+        return tasks, decoded_tasks
+
+    def _to_row(self, kind: str, task: Task) -> tuple:
+        """タスクを行に変換する"""
+        scheduled_task_id = getattr(task, "scheduled_task_id", None)
+        return (
+            kind,
+            task.id.number,
+            str(task.page_id),
+            str(task.parent_task_page_id) if task.parent_task_page_id else None,
+            scheduled_task_id.number if scheduled_task_id else None,
+            normalize_task_name(task.name.task_name),
+            self._format_date(task.date.start) if task.date else None,
+            self.serializer.encode(task),
+        )
+
+    def _get_kind(self, tasks: Tasks) -> str:
+        """タスクのリストの種類を取得する"""
+        if isinstance(tasks, ScheduledTasks):
+            return self.SCHEDULED
+        if isinstance(tasks, ExecutedTasks):
+            return self.EXECUTED
+        raise ValueError(f"未対応のタスクのリストです: {type(tasks)}")
+
+    @staticmethod
+    def _get_number(id: object) -> str:
+        """NotionIdもしくは文字列からID番号を取得する"""
+        return str(getattr(id, "number", id))
+
+    @classmethod
+    def _format_day(cls, date: datetime) -> str:
+        """日時をUTCの日付(YYYY-MM-DD)に変換する"""
+        return cls._format_date(date)[:10]  # type: ignore
+
+    @staticmethod
+    def _format_date(date: Optional[datetime]) -> Optional[str]:
+        """日時を文字列として比較できるUTCのISO形式に変換する"""
+        if date is None:
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        return date.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
@@ -0,0 +1,258 @@
+from datetime import datetime, timezone
+import os
+import shutil
+from typing import Optional
+from uuid import uuid4
+
+from google.api_core.exceptions import PreconditionFailed
+
+from notiontaskr import config
+from notiontaskr.domain.executed_task import ExecutedTask
+from notiontaskr.domain.executed_tasks import ExecutedTasks
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.domain.scheduled_tasks import ScheduledTasks
+from notiontaskr.gcs_handler import GCSHandler
+from notiontaskr.infrastructure.task_store import TaskStore
+
+
+class TaskStoreJournal:
+    """タスクストアをスナップショットと追記専用の差分ファイルとしてGCSに保存するクラス
+
+    - 更新したタスクのみを差分ファイルとしてアップロードする
+    - 読み込み時はスナップショットに差分ファイルを名前(作成日時)順に適用する
+    - 全件の置き換え時、もしくは差分ファイルが一定数に達した時にスナップショットへ統合する
+    - アップロードを遅らせた更新は、flushで1つの差分ファイルにまとめてアップロードする
+    - スナップショットはタスクストアとは別のファイルに保持し、変更が無ければダウンロードしない
+      (差分ファイルはスナップショットのコピーであるタスクストアに適用する)
+    """
+
+    # 差分ファイル名の先頭に付与する作成日時の形式(名前順が作成順になる)
+    DELTA_TIME_FORMAT = "%Y%m%dT%H%M%S%f"
+
+    def __init__(
+        self,
+        store: TaskStore,
+        gcs_handler: Optional[GCSHandler],
+        bucket_snapshot_path: str = config.BUCKET_TASK_STORE_PATH,
+        local_snapshot_path: str = config.LOCAL_TASK_STORE_SNAPSHOT_PATH,
+        bucket_delta_dir: str = config.BUCKET_TASK_STORE_DELTA_DIR,
+        local_delta_dir: str = config.LOCAL_TASK_STORE_DELTA_DIR,
+        compaction_deltas: int = config.TASK_STORE_COMPACTION_DELTAS,
+    ):
+        """
+        :param gcs_handler: Noneの場合はローカルのタスクストアのみを使用する
+        """
+        self.store = store
+        self.gcs_handler = gcs_handler
+        self.bucket_snapshot_path = bucket_snapshot_path
+        self.local_snapshot_path = local_snapshot_path
+        self.bucket_delta_dir = bucket_delta_dir
+        self.local_delta_dir = local_delta_dir
+        self.compaction_deltas = compaction_deltas
+        # スナップショットに統合されていない差分ファイルのGCSのパス
+        self._delta_paths: list[str] = []
+        # スナップショットと全ての差分ファイルを読み込めたか(統合の可否の判定に使用する)
+        self._is_loaded = False
+        # 読み込んだスナップショットのGCS上の世代(他の実行による上書きの検知に使用する)
+        self._snapshot_generation: Optional[int] = None
+        # アップロードを遅らせたタスク(タスクID番号 -> タスク)
+        self._pending_scheduled_tasks: dict[str, ScheduledTask] = {}
+        self._pending_executed_tasks: dict[str, ExecutedTask] = {}
+
+    @property
+    def generation(self) -> tuple[Optional[int], tuple[str, ...]]:
+        """読み込んだスナップショットの世代と差分ファイル(他の実行による更新の検知に使用する)"""
+        return self._snapshot_generation, tuple(self._delta_paths)
+
+    def load(self) -> int:
+        """スナップショットと差分ファイルをダウンロードし、タスクストアに適用する
+
+        アップロードを遅らせたタスクは、適用後のタスクストアに再度書き込む
+
+        :return: 適用した差分ファイル数
+        :raise Exception: ダウンロードもしくは適用に失敗した場合
+        """
+        if self.gcs_handler is None:
+            return 0
+
+        self._is_loaded = False
+        self._delta_paths = []
+        self.gcs_handler.download(
+            from_=self.bucket_snapshot_path, to=self.local_snapshot_path
+        )
+        self._snapshot_generation = self.gcs_handler.get_generation(
+            local_path=self.local_snapshot_path, gcs_path=self.bucket_snapshot_path
+        )
+        self._copy_file(from_=self.local_snapshot_path, to=self.store.save_path)
+        for delta_path in self.gcs_handler.list(prefix=self.bucket_delta_dir):
+            local_path = os.path.join(
+                self.local_delta_dir, os.path.basename(delta_path)
+            )
+            self.gcs_handler.download(from_=delta_path, to=local_path)
+            self.store.merge(local_path)
+            self._remove_local_file(local_path)
+            self._delta_paths.append(delta_path)
+        self.store.upsert(
+            ScheduledTasks.from_tasks(list(self._pending_scheduled_tasks.values()))
+        )
+        self.store.upsert(
+            ExecutedTasks.from_tasks(list(self._pending_executed_tasks.values()))
+        )
+        self._is_loaded = True
+        return len(self._delta_paths)
+
+    def append(
+        self,
+        scheduled_tasks: ScheduledTasks,
+        executed_tasks: ExecutedTasks,
+        uploads: bool = True,
+    ) -> None:
+        """タスクをタスクストアに書き込み、差分ファイルとしてアップロードする
+
+        差分ファイルが一定数に達した場合はスナップショットに統合する
+
+        :param uploads: Falseの場合はアップロードせず、flushでまとめてアップロードする
+        """
+        self.store.upsert(scheduled_tasks)
+        self.store.upsert(executed_tasks)
+        if self.gcs_handler is None:
+            return
+        if not uploads:
+            for task in scheduled_tasks:
+                self._pending_scheduled_tasks[task.id.number] = task
+            for task in executed_tasks:
+                self._pending_executed_tasks[task.id.number] = task
+            return
+        self._upload_delta(self.gcs_handler, scheduled_tasks, executed_tasks)
+
+    def flush(self) -> int:
+        """アップロードを遅らせたタスクを1つの差分ファイルとしてアップロードする
+
+        :return: アップロードしたタスク数
+        :raise Exception: アップロードに失敗した場合(タスクは次回のflushでアップロードする)
+        """
+        count = len(self._pending_scheduled_tasks) + len(self._pending_executed_tasks)
+        if self.gcs_handler is None or count == 0:
+            return 0
+        self._upload_delta(
+            self.gcs_handler,
+            ScheduledTasks.from_tasks(list(self._pending_scheduled_tasks.values())),
+            ExecutedTasks.from_tasks(list(self._pending_executed_tasks.values())),
+        )
+        self._pending_scheduled_tasks = {}
+        self._pending_executed_tasks = {}
+        return count
+
+    def _upload_delta(
+        self,
+        gcs_handler: GCSHandler,
+        scheduled_tasks: ScheduledTasks,
+        executed_tasks: ExecutedTasks,
+    ) -> None:
+        """タスクを差分ファイルとしてアップロードし、一定数に達した場合はスナップショットに統合する"""
+        file_name = f"{datetime.now(timezone.utc).strftime(self.DELTA_TIME_FORMAT)}_{uuid4().hex[:8]}.sqlite3"
+        local_path = os.path.join(self.local_delta_dir, file_name)
+        delta = TaskStore(save_path=local_path)
+        delta.upsert(scheduled_tasks)
+        delta.upsert(executed_tasks)
+
+        delta_path = f"{self.bucket_delta_dir}{file_name}"
+        # 差分ファイルは新規作成のみ(同名のファイルを上書きしない)
+        gcs_handler.upload(from_=local_path, to=delta_path, if_generation_match=0)
+        self._remove_local_file(local_path)
+        self._delta_paths.append(delta_path)
+
+        # 読み込みに失敗している場合は、不完全なスナップショットになるため統合しない
+        if self._is_loaded and len(self._delta_paths) >= self.compaction_deltas:
+            try:
+                self.compact()
+            except PreconditionFailed:
+                # 他の実行が先にスナップショットを更新した場合は、差分ファイルを残して次回以降に統合する
+                pass
+
+    def compact(self) -> None:
+        """タスクストアをスナップショットとしてアップロードし、統合した差分ファイルを削除する
+
+        :raise google.api_core.exceptions.PreconditionFailed:
+            読み込み後に他の実行がスナップショットを更新していた、もしくは差分ファイルを追加していた場合
+        """
+        if self.gcs_handler is None:
+            return
+        # 読み込み後に他の実行が追加した差分ファイルは統合できず、残すとスナップショットより
+        # 後に適用されて新しい内容を上書きするため、統合せずに次回以降の読み込み後に統合する
+        unknown_delta_paths = set(
+            self.gcs_handler.list(prefix=self.bucket_delta_dir)
+        ) - set(self._delta_paths)
+        if unknown_delta_paths:
+            raise PreconditionFailed(
+                f"読み込み後に追加された差分ファイルがあります: {sorted(unknown_delta_paths)}"
+            )
+        self._upload_snapshot(
+            self.gcs_handler, if_generation_match=self._snapshot_generation
+        )
+        for delta_path in self._delta_paths:
+            self.gcs_handler.delete(delta_path)
+        self._delta_paths = []
+
+    def replace_all(
+        self,
+        scheduled_tasks: ScheduledTasks,
+        executed_tasks: ExecutedTasks,
+        fetched_at: datetime,
+        covered_from: Optional[datetime] = None,
+    ) -> None:
+        """全てのタスクを置き換えてスナップショットとしてアップロードする
+
+        :param fetched_at: タスクを取得した日時。これより前に作成された差分ファイルを削除する
+        :param covered_from: 開始日がこの日時以降の実績タスクを漏れなく取得している場合に指定する
+        """
+        self.store.replace_all(
+            scheduled_tasks, executed_tasks, covered_from=covered_from
+        )
+        self._pending_scheduled_tasks = {}
+        self._pending_executed_tasks = {}
+        if self.gcs_handler is None:
+            return
+        self._upload_snapshot(self.gcs_handler, if_generation_match=None)
+
+        fetched_at_name = fetched_at.astimezone(timezone.utc).strftime(
+            self.DELTA_TIME_FORMAT
+        )
+        for delta_path in self.gcs_handler.list(prefix=self.bucket_delta_dir):
+            if os.path.basename(delta_path) < fetched_at_name:
+                self.gcs_handler.delete(delta_path)
+        self._delta_paths = []
+
+    def _upload_snapshot(
+        self, gcs_handler: GCSHandler, if_generation_match: Optional[int]
+    ) -> None:
+        """タスクストアをスナップショットとしてアップロードする
+
+        アップロードしたファイルをスナップショットとして保持し、次回の読み込みでダウンロードを省略する
+
+        :raise google.api_core.exceptions.PreconditionFailed: 世代が一致しなかった場合
+        """
+        self._copy_file(from_=self.store.save_path, to=self.local_snapshot_path)
+        gcs_handler.upload(
+            from_=self.local_snapshot_path,
+            to=self.bucket_snapshot_path,
+            if_generation_match=if_generation_match,
+        )
+        self._snapshot_generation = gcs_handler.get_generation(
+            local_path=self.local_snapshot_path, gcs_path=self.bucket_snapshot_path
+        )
+
+    @staticmethod
+    def _copy_file(from_: str, to: str) -> None:
+        """ファイルをコピーする(コピー中のファイルを読み込まないよう、一時ファイルから置き換える)"""
+        os.makedirs(os.path.dirname(to), exist_ok=True)
+        temp_path = f"{to}.copy"
+        shutil.copyfile(from_, temp_path)
+        os.replace(temp_path, to)
+
+    @staticmethod
+    def _remove_local_file(path: str) -> None:
+        """適用・アップロード済みの差分ファイルとそのマニフェストを削除する"""
+        for file_path in (path, f"{path}{GCSHandler.MANIFEST_SUFFIX}"):
+            if os.path.exists(file_path):
+                os.remove(file_path)
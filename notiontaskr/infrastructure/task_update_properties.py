@@ -64,6 +64,40 @@ class TaskUpdateProperties(ABC):
         }
         return self
 
+    def set_updated_contents(self):
+        """タスクの更新内容に記録された項目のプロパティのみを設定する"""
+        for key in self.task.update_contents.get_updated_keys():
+            for setter in self.SETTERS_BY_UPDATE_KEY.get(key, ()):
+                setter(self)
+        return self
+
+    def set_all(self):
+        """書き込み対象の全てのプロパティを設定する"""
+        setters = []
+        for key_setters in self.SETTERS_BY_UPDATE_KEY.values():
+            for setter in key_setters:
+                if setter not in setters:
+                    setters.append(setter)
+        for setter in setters:
+            setter(self)
+        return self
+
+    # 更新内容のキーと、そのキーが更新された場合に呼び出すプロパティ設定メソッド
+    SETTERS_BY_UPDATE_KEY = {
+        # ラベルは名前に含まれるため、名前として更新する
+        "タスク名": (set_name,),
+        "工数ラベル": (set_name,),
+        "IDラベル": (set_name,),
+        "親IDラベル": (set_name,),
+        "ステータス": (set_status,),
+        "リマインド情報": (
+            set_has_before_start,
+            set_has_before_end,
+            set_before_start_minutes,
+            set_before_end_minutes,
+        ),
+    }
+
     def build(self):
         """更新用の最終プロパティを返す"""
         return self.properties if self.properties else {}
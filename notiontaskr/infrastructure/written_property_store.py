@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+from typing import Optional
+
+
+class WrittenPropertyStore:
+    """最後に書き込みに成功したページプロパティのハッシュを保持するクラス
+
+    再計算によって同じ値に更新されただけのページへの書き込みを省略するために使用する。
+    ページが書き込み後に編集された場合は、Notion上の値が変わっている可能性があるため
+    ハッシュを破棄する。
+    """
+
+    # 丸め誤差を同一視するための小数点以下の桁数
+    FLOAT_DIGITS = 6
+
+    def __init__(self, save_path: str):
+        self.save_path = save_path
+        # ページID -> {"hash": プロパティのハッシュ, "last_edited_time": 書き込み後の最終更新日時}
+        self._entries: dict[str, dict] = {}
+        # 書き込みを省略した回数
+        self.skipped_count = 0
+
+    @classmethod
+    def compute_hash(cls, properties: dict) -> str:
+        """プロパティの正規化したハッシュを計算する"""
+        canonical = json.dumps(
+            cls._normalize(properties),
+            ensure_ascii=False,
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _normalize(cls, value):
+        """ハッシュ計算用に値を正規化する
+
+        整数値の浮動小数点数は整数として扱い、それ以外は指定桁数で丸める
+        """
+        if isinstance(value, dict):
+            return {key: cls._normalize(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [cls._normalize(item) for item in value]
+        if isinstance(value, float):
+            rounded = round(value, cls.FLOAT_DIGITS)
+            return int(rounded) if rounded.is_integer() else rounded
+        return value
+
+    def is_written(self, page_id: str, properties: dict) -> bool:
+        """前回書き込んだプロパティと同じか判定する"""
+        entry = self._entries.get(page_id)
+        return entry is not None and entry["hash"] == self.compute_hash(properties)
+
+    def record(
+        self, page_id: str, properties: dict, last_edited_time: Optional[str]
+    ) -> None:
+        """書き込みに成功したプロパティを記録する
+
+        :param last_edited_time: 書き込み後のページの最終更新日時
+        """
+        self._entries[page_id] = {
+            "hash": self.compute_hash(properties),
+            "last_edited_time": last_edited_time,
+        }
+
+    def discard(self, page_id: str) -> None:
+        """ページの記録を破棄する"""
+        self._entries.pop(page_id, None)
+
+    def verify(self, data: dict) -> None:
+        """取得したページが前回の書き込み以降に編集されていれば記録を破棄する
+
+        :param data: databases.queryで取得したページのレスポンスデータ
+        """
+        page_id = data.get("id")
+        entry = self._entries.get(page_id) if page_id else None
+        if entry is not None and entry["last_edited_time"] != data.get(
+            "last_edited_time"
+        ):
+            self.discard(page_id)  # type: ignore
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self) -> None:
+        """ファイルから記録を読み込み、保持している内容を置き換える
+
+        ファイルが存在しない場合は空とみなす
+        """
+        self._entries = {}
+        self.skipped_count = 0
+        if not os.path.exists(self.save_path):
+            return
+        with open(self.save_path, "r", encoding="utf-8") as f:
+            self._entries = json.load(f)
+
+    def save(self) -> None:
+        """記録をファイルに保存する"""
+        os.makedirs(os.path.dirname(self.save_path), exist_ok=True)
+        with open(self.save_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, ensure_ascii=False)
@@ -0,0 +1,161 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import heapq
+import itertools
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+from notiontaskr import config
+from notiontaskr.notifier.task_reminder import ReminderKind, TaskReminder
+
+if TYPE_CHECKING:
+    from notiontaskr.domain.task import Task
+
+
+class ReminderScheduler:
+    """タスクのリマインドを通知日時の順にヒープで管理し、通知日時に1度だけ通知するクラス
+
+    - リマインドはタスク(ページID)と種類ごとに1件保持し、変更されたタスクのみ登録し直す
+    - 通知日時が変わった場合は古いエントリをヒープに残し、取り出す際に読み飛ばす
+    - 通知済みのリマインドは、同じ通知日時で登録し直しても再度通知しない
+    - 通知日時から一定時間(grace)以上過ぎたリマインドは通知せずに破棄する
+    - 通知済みの記録はメモリのみに保持するため、再起動で再度通知しないよう、
+      起動前の通知日時のリマインドは通知せずに破棄する
+    """
+
+    def __init__(
+        self,
+        reminder: TaskReminder,
+        grace: timedelta = timedelta(minutes=config.REMINDER_GRACE_MINUTES),
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        self.reminder = reminder
+        self.grace = grace
+        self.clock = clock
+        # 起動日時(これより前の通知日時のリマインドは、前回の起動で通知済みとみなす)
+        self._started_at = clock()
+        # (通知日時, 登録順, ページID, 種類)
+        self._heap: list[tuple[datetime, int, str, ReminderKind]] = []
+        self._counter = itertools.count()
+        # (ページID, 種類) -> (通知日時, タスク)
+        self._entries: dict[tuple[str, ReminderKind], tuple[datetime, "Task"]] = {}
+        # 通知済みのリマインド(ページID, 種類, 通知日時)
+        self._fired: set[tuple[str, ReminderKind, datetime]] = set()
+        # リマインドの登録もしくは停止で、待機中のrunを起こす
+        self._wakeup = asyncio.Event()
+        self._is_stopped = False
+
+    def update_task(self, task: "Task") -> None:
+        """タスクのリマインドを登録し直す
+
+        リマインドしない種類や、通知日時が過ぎた種類のリマインドは削除する
+        """
+        page_id = str(task.page_id)
+        remind_dts = TaskReminder.get_remind_dts(task)
+        expired_at = self._get_expired_at(self.clock())
+        for kind in ReminderKind:
+            key = (page_id, kind)
+            fire_at = remind_dts.get(kind)
+            if fire_at is not None:
+                fire_at = self._to_utc(fire_at)
+            if (
+                fire_at is None
+                or fire_at < expired_at
+                or (page_id, kind, fire_at) in self._fired
+            ):
+                self._entries.pop(key, None)
+                continue
+
+            entry = self._entries.get(key)
+            # 通知メッセージに最新のタスク名を使うため、タスクは常に置き換える
+            self._entries[key] = (fire_at, task)
+            if entry is None or entry[0] != fire_at:
+                heapq.heappush(
+                    self._heap, (fire_at, next(self._counter), page_id, kind)
+                )
+                self._wakeup.set()
+
+    def update_tasks(
+        self,
+        tasks: Iterable["Task"],
+        on_error: Optional[Callable[[Exception, "Task"], None]] = None,
+    ) -> None:
+        """変更されたタスクのリマインドを登録し直す"""
+        for task in tasks:
+            try:
+                self.update_task(task)
+            except Exception as e:
+                if on_error is not None:
+                    on_error(e, task)
+
+    def pop_due(self) -> list[tuple["Task", ReminderKind]]:
+        """通知日時を過ぎたリマインドを取り出す(取り出したリマインドは通知済みとする)"""
+        now = self.clock()
+        expired_at = self._get_expired_at(now)
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, _, page_id, kind = heapq.heappop(self._heap)
+            entry = self._entries.get((page_id, kind))
+            if entry is None or entry[0] != fire_at:
+                continue
+            del self._entries[(page_id, kind)]
+            self._fired.add((page_id, kind, fire_at))
+            if fire_at >= expired_at:
+                due.append((entry[1], kind))
+        # 破棄される時刻を過ぎたリマインドは登録されないため、通知済みの記録も不要になる
+        self._fired = {fired for fired in self._fired if fired[2] >= expired_at}
+        return due
+
+    def _get_expired_at(self, now: datetime) -> datetime:
+        """これより前の通知日時のリマインドは通知せずに破棄する日時を取得する"""
+        return max(now - self.grace, self._started_at)
+
+    def get_next_fire_at(self) -> Optional[datetime]:
+        """次に通知するリマインドの通知日時を取得する"""
+        while self._heap:
+            fire_at, _, page_id, kind = self._heap[0]
+            entry = self._entries.get((page_id, kind))
+            if entry is not None and entry[0] == fire_at:
+                return fire_at
+            heapq.heappop(self._heap)
+        return None
+
+    def __len__(self) -> int:
+        """登録されているリマインドの数"""
+        return len(self._entries)
+
+    async def run(
+        self,
+        on_success: Callable[["Task"], None],
+        on_error: Callable[[Exception, "Task"], None],
+    ) -> None:
+        """停止するまで、通知日時になったリマインドを通知する"""
+        self._is_stopped = False
+        while not self._is_stopped:
+            self._wakeup.clear()
+            for task, kind in self.pop_due():
+                await self.reminder.remind_by_kind(
+                    task, kind, on_success=on_success, on_error=on_error
+                )
+
+            next_fire_at = self.get_next_fire_at()
+            timeout = (
+                None
+                if next_fire_at is None
+                else max((next_fire_at - self.clock()).total_seconds(), 0)
+            )
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        """runを停止する"""
+        self._is_stopped = True
+        self._wakeup.set()
+
+    @staticmethod
+    def _to_utc(dt: datetime) -> datetime:
+        """UTCの日時に変換する(タイムゾーンの無い日時はUTCとみなす)"""
+        if dt.tzinfo is None:
+            return dt.replace(tzinfo=timezone.utc)
+        return dt.astimezone(timezone.utc)
@@ -1,4 +1,5 @@
 from datetime import datetime, timezone
+from enum import Enum
 from typing import TYPE_CHECKING, Callable, Optional
 from notiontaskr.notifier.notifiable import Notifiable
 
@@ -7,6 +8,15 @@ if TYPE_CHECKING:
     from notiontaskr.domain.tasks import Tasks
 
 
+class ReminderKind(Enum):
+    """リマインドの種類"""
+
+    BEFORE_START = "before_start"
+    BEFORE_END = "before_end"
+    START = "start"
+    END = "end"
+
+
 class TaskReminder:
     def __init__(self, notifier: "Notifiable"):
         """コンストラクタでNotifiableインターフェースを受け取る"""
@@ -21,27 +31,84 @@ class TaskReminder:
         for task in tasks.get_remind_tasks():
             try:
                 if self.is_remind_time_before_start(task):
-                    message = f"{str(task.remind_info.before_start_minutes)}分後開始: {task.name.get_remind_message()}"
-
+                    kind = ReminderKind.BEFORE_START
                 elif self.is_remind_time_before_end(task):
-                    message = f"{str(task.remind_info.before_end_minutes)}分後終了: {task.name.get_remind_message()}"
-
+                    kind = ReminderKind.BEFORE_END
                 elif self.is_remind_time_equal_start(task):
-                    message = f"開始: {task.name.get_remind_message()}"
+                    kind = ReminderKind.START
                 elif self.is_remind_time_equal_end(task):
-                    message = f"終了: {task.name.get_remind_message()}"
-
+                    kind = ReminderKind.END
                 else:
                     raise ValueError(f"リマインド時刻が現在ではありません: {task.name}")
 
                 await self.notifier.notify(
-                    message=message,
+                    message=self.get_message(task, kind),
                 )
                 on_success(task)
 
             except Exception as e:
                 on_error(e, task)
 
+    async def remind_by_kind(
+        self,
+        task: "Task",
+        kind: ReminderKind,
+        on_success: Callable[["Task"], None],
+        on_error: Callable[[Exception, "Task"], None],
+    ) -> None:
+        """リマインド時刻を判定せずに、指定した種類のリマインドを送る"""
+        try:
+            await self.notifier.notify(
+                message=self.get_message(task, kind),
+            )
+            on_success(task)
+        except Exception as e:
+            on_error(e, task)
+
+    async def remind_between(
+        self,
+        tasks: "Tasks",
+        from_: datetime,
+        to: datetime,
+        on_success: Callable[["Task"], None],
+        on_error: Callable[[Exception, "Task"], None],
+    ) -> None:
+        """リマインド日時が指定期間内(from_より後、to以前)のリマインドを送る
+
+        実行の間隔が空いても、前回の実行以降のリマインドを漏らさずに送るために使用する
+        """
+        for task in tasks:
+            for kind, remind_dt in self.get_remind_dts(task).items():
+                if from_ < remind_dt <= to:
+                    await self.remind_by_kind(
+                        task, kind, on_success=on_success, on_error=on_error
+                    )
+
+    @staticmethod
+    def get_message(task: "Task", kind: ReminderKind) -> str:
+        """リマインドの種類に応じた通知メッセージを取得する"""
+        if kind == ReminderKind.BEFORE_START:
+            return f"{str(task.remind_info.before_start_minutes)}分後開始: {task.name.get_remind_message()}"
+        if kind == ReminderKind.BEFORE_END:
+            return f"{str(task.remind_info.before_end_minutes)}分後終了: {task.name.get_remind_message()}"
+        if kind == ReminderKind.START:
+            return f"開始: {task.name.get_remind_message()}"
+        return f"終了: {task.name.get_remind_message()}"
+
+    @classmethod
+    def get_remind_dts(cls, task: "Task") -> dict[ReminderKind, datetime]:
+        """リマインドの種類ごとのリマインド日時を取得する(リマインドしない種類は含まない)"""
+        if task.date is None:
+            return {}
+
+        remind_dts: dict[ReminderKind, Optional[datetime]] = {
+            ReminderKind.BEFORE_START: cls.get_before_start_dt(task),
+            ReminderKind.BEFORE_END: cls.get_before_end_dt(task),
+            ReminderKind.START: task.date.start if task.remind_info.has_start else None,
+            ReminderKind.END: task.date.end if task.remind_info.has_end else None,
+        }
+        return {kind: dt for kind, dt in remind_dts.items() if dt is not None}
+
     @staticmethod
     def get_before_start_dt(task: "Task") -> Optional["datetime"]:
         """開始前リマインド日時を取得する"""
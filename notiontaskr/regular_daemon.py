@@ -0,0 +1,27 @@
+import asyncio
+import signal
+
+from notiontaskr.application.regular_task_daemon import RegularTaskDaemon
+from notiontaskr.application.task_application_service import TaskApplicationService
+
+
+async def run():
+    service = TaskApplicationService()
+    daemon = RegularTaskDaemon(service=service)
+    # 停止要求を受けたら、実行中のレギュラータスクの完了と状態の保存を待って終了する
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, daemon.stop)
+    try:
+        await daemon.run()
+    finally:
+        await service.notion_client_pool.aclose()
+
+
+def main():
+    """常駐して一分ごとに実行する処理(regular_job.pyを毎分起動する代わりに使用する)"""
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 from datetime import datetime, timedelta, timezone
+import re
+import unicodedata
 
 
 def to_isoformat(dt: datetime) -> str:
@@ -30,6 +32,15 @@ def remove_variant_selectors(text: str) -> str:
     return "".join(c for c in text if not (0xFE00 <= ord(c) <= 0xFE0F))
 
 
+def normalize_task_name(name: str) -> str:
+    """タスク名を照合用に正規化する
+
+    全角・半角を統一(NFKC)し、連続する空白を1つの半角スペースにまとめて前後の空白を除去する
+    例: "ＡＰＩ　設計  レビュー " -> "API 設計 レビュー"
+    """
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", name)).strip()
+
+
 def dt_to_month_start_end(dt: datetime) -> tuple[datetime, datetime]:
     # 月初（0時0分0秒）
     start_date = datetime(dt.year, dt.month, 1, 0, 0, 0)
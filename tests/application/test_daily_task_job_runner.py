@@ -0,0 +1,86 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+from notiontaskr.application.daily_task_job_runner import (
+    DailyTaskJobRunner,
+    DailyTaskJobStatus,
+)
+
+
+class TestDailyTaskJobRunner:
+    def test_完了を待たずにジョブを返し完了後に状態を更新すること(self):
+        service = Mock()
+
+        async def daily_task(timer):
+            timer.start()
+            await asyncio.sleep(0)
+            timer.snap_delta("タスクの取得完了")
+
+        service.daily_task = AsyncMock(side_effect=daily_task)
+        runner = DailyTaskJobRunner(service=service, logger=Mock())
+
+        async def run():
+            job = runner.start()
+            assert job.is_running()
+            await runner._running_task
+            return job
+
+        job = asyncio.run(run())
+
+        assert job.status == DailyTaskJobStatus.SUCCEEDED
+        assert job.finished_at is not None
+        assert [phase["name"] for phase in job.to_dict()["phases"]] == [
+            "タスクの取得完了"
+        ]
+
+    def test_実行中に再度開始した場合は同じジョブを返すこと(self):
+        service = Mock()
+        service.daily_task = AsyncMock()
+        runner = DailyTaskJobRunner(service=service, logger=Mock())
+
+        async def run():
+            first = runner.start()
+            second = runner.start()
+            await runner._running_task
+            third = runner.start()
+            await runner._running_task
+            return first, second, third
+
+        first, second, third = asyncio.run(run())
+
+        assert first is second
+        assert third is not first
+        assert service.daily_task.await_count == 2
+
+    def test_失敗したジョブはエラー内容を保持すること(self):
+        service = Mock()
+        service.daily_task = AsyncMock(side_effect=Exception("error"))
+        runner = DailyTaskJobRunner(service=service, logger=Mock())
+
+        async def run():
+            job = runner.start()
+            await runner._running_task
+            return job
+
+        job = asyncio.run(run())
+
+        assert job.status == DailyTaskJobStatus.FAILED
+        assert job.error == "error"
+
+    def test_古いジョブは破棄されること(self):
+        service = Mock()
+        service.daily_task = AsyncMock()
+        runner = DailyTaskJobRunner(service=service, max_history=2, logger=Mock())
+
+        async def run():
+            jobs = []
+            for _ in range(3):
+                jobs.append(runner.start())
+                await runner._running_task
+            return jobs
+
+        jobs = asyncio.run(run())
+
+        assert runner.get(jobs[0].id) is None
+        assert runner.get(jobs[2].id) is jobs[2]
+        assert runner.get_latest() is jobs[2]
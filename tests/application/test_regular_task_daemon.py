@@ -0,0 +1,76 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+from notiontaskr.application.regular_task_daemon import RegularTaskDaemon
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def create_daemon(clock=None, **kwargs):
+    service = Mock()
+    service.regular_task = AsyncMock()
+    service.checkpoint = AsyncMock()
+    service.reminder_scheduler.run = AsyncMock()
+    daemon = RegularTaskDaemon(
+        service=service,
+        logger=Mock(),
+        clock=clock or FakeClock(),
+        **kwargs,
+    )
+    return daemon, service
+
+
+class TestRegularTaskDaemon:
+    def test_状態を保持したままレギュラータスクを繰り返し実行すること(self):
+        daemon, service = create_daemon(interval_seconds=0)
+
+        asyncio.run(daemon.run(max_ticks=3))
+
+        assert service.regular_task.await_count == 3
+        service.regular_task.assert_awaited_with(keeps_state=True)
+        # 停止時に状態を保存する
+        service.checkpoint.assert_awaited_once()
+
+    def test_一定間隔ごとに状態を保存すること(self):
+        clock = FakeClock()
+        daemon, service = create_daemon(
+            clock=clock, interval_seconds=0, checkpoint_seconds=600
+        )
+
+        async def regular_task(keeps_state):
+            clock.now += 400
+
+        service.regular_task.side_effect = regular_task
+
+        asyncio.run(daemon.run(max_ticks=3))
+
+        # 800秒時点と停止時
+        assert service.checkpoint.await_count == 2
+
+    def test_レギュラータスクが失敗しても実行を続けること(self):
+        daemon, service = create_daemon(interval_seconds=0)
+        service.regular_task.side_effect = [Exception("error"), None]
+
+        asyncio.run(daemon.run(max_ticks=2))
+
+        assert service.regular_task.await_count == 2
+        daemon.logger.error.assert_called_once()
+
+    def test_停止を要求すると待機を中断して終了すること(self):
+        daemon, service = create_daemon(interval_seconds=60)
+
+        async def regular_task(keeps_state):
+            asyncio.get_running_loop().call_soon(daemon.stop)
+
+        service.regular_task.side_effect = regular_task
+
+        asyncio.run(asyncio.wait_for(daemon.run(), timeout=5))
+
+        service.regular_task.assert_awaited_once()
+        service.checkpoint.assert_awaited_once()
@@ -1,39 +1,484 @@
-# 動作確認用
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+import json
+import time
+import os
+from unittest.mock import AsyncMock, Mock, PropertyMock, patch
+
+import httpx
+from notion_client.errors import HTTPResponseError
+import pytest
+
+import notiontaskr.config as config
+from notiontaskr.application.dto.uptime_data import UptimeDataByTag
 from notiontaskr.application.task_application_service import TaskApplicationService
+from notiontaskr.domain.executed_task import ExecutedTask
+from notiontaskr.domain.executed_tasks import ExecutedTasks
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.domain.scheduled_tasks import ScheduledTasks
 from notiontaskr.domain.tags import Tags
+from notiontaskr.domain.task_identity_map import TaskIdentityMap
+from notiontaskr.domain.task_name import TaskName
+from notiontaskr.domain.value_objects.man_hours import ManHours
+from notiontaskr.domain.value_objects.notion_date import NotionDate
+from notiontaskr.domain.value_objects.notion_id import NotionId
+from notiontaskr.domain.value_objects.page_id import PageId
+from notiontaskr.domain.value_objects.parent_task_page_id import ParentTaskPageId
+from notiontaskr.domain.value_objects.scheduled_task_id import ScheduledTaskId
+from notiontaskr.domain.value_objects.status import Status
 from notiontaskr.domain.value_objects.tag import Tag
-from notiontaskr.util.converter import dt_to_month_start_end
+from notiontaskr.infrastructure.dead_letter_store import DeadLetter, DeadLetterStore
+from notiontaskr.infrastructure.task_store import TaskStore
+from notiontaskr.infrastructure.task_store_journal import TaskStoreJournal
+from notiontaskr.infrastructure.written_property_store import WrittenPropertyStore
+from notiontaskr.infrastructure.remind_progress_store import RemindProgressStore
+from notiontaskr.notifier.remind_minutes import RemindMinutes
+from notiontaskr.notifier.task_remind_info import TaskRemindInfo
+from notiontaskr.notifier.task_reminder import ReminderKind, TaskReminder
 
-service = TaskApplicationService()
+LAST_EDITED_TIME = "2025-01-01T00:00:00.000Z"
 
 
-def main():
-    # _get_uptime()
-    # _daily_task()
-    _regular_task()
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """Notionのリポジトリをモックし、ローカルファイルのみを使用するサービス"""
+    monkeypatch.setattr(config, "DEBUG_MODE", True)
+    service = TaskApplicationService(logger=Mock())
+    service.dead_letter_store = DeadLetterStore(
+        save_path=os.path.join(tmp_path, "dead_letters.json")
+    )
+    service.written_property_store = WrittenPropertyStore(
+        save_path=os.path.join(tmp_path, "written_properties.json")
+    )
+    service.task_store = TaskStore(save_path=os.path.join(tmp_path, "tasks.sqlite3"))
+    service.remind_progress_store = RemindProgressStore(
+        save_path=os.path.join(tmp_path, "remind_progress.json")
+    )
+    service.task_repo = Mock()
+    service.task_repo.find_by_condition = AsyncMock(
+        return_value=(ScheduledTasks.from_empty(), ExecutedTasks.from_empty())
+    )
+    service.scheduled_task_repo = Mock()
+    service.scheduled_task_repo.update = AsyncMock()
+    service.scheduled_task_repo.update_page = AsyncMock()
+    service.scheduled_task_repo.retrieve_page = AsyncMock(
+        return_value={"last_edited_time": LAST_EDITED_TIME}
+    )
+    service.executed_task_repo = Mock()
+    service.executed_task_repo.update = AsyncMock()
+    service.executed_task_repo.update_page = AsyncMock()
+    service.executed_task_repo.find_by_condition = AsyncMock(
+        return_value=ExecutedTasks.from_empty()
+    )
+    return service
 
 
-def _regular_task():
-    asyncio.run(service.regular_task())
+def create_dead_letter(page_id: str = "page-1", **kwargs) -> DeadLetter:
+    kwargs.setdefault("last_edited_time", LAST_EDITED_TIME)
+    return DeadLetter(
+        kind=DeadLetterStore.SCHEDULED,
+        page_id=page_id,
+        task_number="1",
+        properties={"人時(予)": {"number": 1.0}},
+        **kwargs,
+    )
 
 
-def _daily_task():
-    asyncio.run(service.daily_task())
+def make_scheduled_task(
+    number: str, name: str, parent_page_id: str | None = None
+) -> ScheduledTask:
+    task = ScheduledTask(
+        page_id=PageId(f"page_{number}"),
+        name=TaskName(name),
+        tags=Tags.from_empty(),
+        id=NotionId(number),
+        status=Status.IN_PROGRESS,
+    )
+    if parent_page_id:
+        task.parent_task_page_id = ParentTaskPageId(parent_page_id)
+    return task
 
 
-def _get_uptime():
-    start, end = dt_to_month_start_end(datetime(year=2025, month=5, day=1))
-    uptime_data_by_tag = asyncio.run(
-        service.get_uptime(
-            from_=start,
-            to=end,
-            tags=Tags.from_tags([Tag("notion-api"), Tag("お小遣いクエストボード")]),
-        )
+def make_executed_task(
+    number: str, name: str, scheduled_task_id: str | None = None
+) -> ExecutedTask:
+    return ExecutedTask(
+        page_id=PageId(f"page_{number}"),
+        name=TaskName(name),
+        tags=Tags.from_empty(),
+        man_hours=ManHours(2),
+        id=NotionId(number),
+        status=Status.COMPLETED,
+        scheduled_task_id=(
+            ScheduledTaskId(scheduled_task_id) if scheduled_task_id else None
+        ),
+        date=NotionDate(
+            start=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            end=datetime(2025, 1, 1, 2, tzinfo=timezone.utc),
+        ),
     )
-    print(uptime_data_by_tag.to_json())
 
 
-if __name__ == "__main__":
-    main()
+def save_scheduled_tasks(service: TaskApplicationService, *tasks: ScheduledTask):
+    service.task_store.replace_all(
+        scheduled_tasks=ScheduledTasks.from_tasks(list(tasks)),
+        executed_tasks=ExecutedTasks.from_empty(),
+    )
+
+
+def read_saved_dead_letters(service: TaskApplicationService) -> list[dict]:
+    with open(service.dead_letter_store.save_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestDailyTask:
+    def test_保存済みのデッドレターを上書きせずに保存すること(self, service):
+        saved_store = DeadLetterStore(save_path=service.dead_letter_store.save_path)
+        saved_store.append(create_dead_letter(page_id="page-1"))
+        saved_store.save()
+        # 実行中に更新に失敗したページ
+        service.dead_letter_store.append(create_dead_letter(page_id="page-2"))
+
+        asyncio.run(service.daily_task())
+
+        assert {data["page_id"] for data in read_saved_dead_letters(service)} == {
+            "page-1",
+            "page-2",
+        }
+
+
+class TestResendDeadLetter:
+    def test_退避していたページ更新を再送すること(self, service):
+        service.dead_letter_store.append(create_dead_letter())
+
+        drained_count = asyncio.run(service._drain_dead_letters())
+
+        assert drained_count == 1
+        service.scheduled_task_repo.update_page.assert_awaited_once_with(
+            page_id="page-1", properties={"人時(予)": {"number": 1.0}}
+        )
+        assert len(service.dead_letter_store) == 0
+
+    def test_一時的なエラーで再送に失敗した場合は再度退避すること(self, service):
+        service.scheduled_task_repo.update_page.side_effect = HTTPResponseError(
+            httpx.Response(status_code=502)
+        )
+        service.dead_letter_store.append(create_dead_letter())
+
+        asyncio.run(service._drain_dead_letters())
+
+        dead_letters = service.dead_letter_store.pop_all()
+        assert len(dead_letters) == 1
+        assert dead_letters[0].attempts == 2
+
+    def test_一時的でないエラーで再送に失敗した場合は破棄すること(self, service):
+        service.scheduled_task_repo.update_page.side_effect = HTTPResponseError(
+            httpx.Response(status_code=400)
+        )
+        service.dead_letter_store.append(create_dead_letter())
+
+        asyncio.run(service._drain_dead_letters())
+
+        assert len(service.dead_letter_store) == 0
+
+    def test_デッドレターが無い場合は再送しないこと(self, service):
+        assert asyncio.run(service._drain_dead_letters()) == 0
+        service.scheduled_task_repo.update_page.assert_not_awaited()
+
+    def test_退避後にページが編集された場合は再送せずに破棄すること(self, service):
+        service.scheduled_task_repo.retrieve_page = AsyncMock(
+            return_value={"last_edited_time": "2025-01-01T00:05:00.000Z"}
+        )
+        service.dead_letter_store.append(create_dead_letter())
+
+        asyncio.run(service._drain_dead_letters())
+
+        service.scheduled_task_repo.update_page.assert_not_awaited()
+        assert len(service.dead_letter_store) == 0
+
+
+class TestRegularTask:
+    def test_取得したタスクの紐づけに必要な予定タスクのみを読み込むこと(self, service):
+        save_scheduled_tasks(
+            service,
+            make_scheduled_task("1", "親タスク"),
+            make_scheduled_task("2", "子タスク", parent_page_id="page_1"),
+            make_scheduled_task("3", "孫タスク", parent_page_id="page_2"),
+            make_scheduled_task("4", "別タスク"),
+            make_scheduled_task("5", "名前が一致するタスク"),
+        )
+
+        related_tasks = service._find_related_scheduled_tasks(
+            fetched_scheduled_tasks=ScheduledTasks.from_empty(),
+            fetched_executed_tasks=ExecutedTasks.from_tasks(
+                [
+                    make_executed_task("11", "実績", scheduled_task_id="3"),
+                    make_executed_task("12", "名前が一致するタスク"),
+                ]
+            ),
+            identity_map=TaskIdentityMap(),
+        )
+
+        # 紐づく予定タスクとその祖先、名前が一致する予定タスク
+        assert {task.id.number for task in related_tasks} == {"1", "2", "3", "5"}
+
+    def test_変更されたタスクとその祖先のみを再集計して更新すること(self, service):
+        parent_task = make_scheduled_task("1", "親タスク")
+        sub_task = make_scheduled_task("2", "子タスク", parent_page_id="page_1")
+        parent_task.update_sub_tasks(ScheduledTasks.from_tasks([sub_task]))
+        save_scheduled_tasks(
+            service, parent_task, sub_task, make_scheduled_task("3", "別タスク")
+        )
+        service.task_repo.find_by_condition.return_value = (
+            ScheduledTasks.from_empty(),
+            ExecutedTasks.from_tasks(
+                [make_executed_task("11", "実績", scheduled_task_id="2")]
+            ),
+        )
+
+        asyncio.run(service.regular_task())
+
+        updated_numbers = {
+            call.kwargs["scheduled_task"].id.number
+            for call in service.scheduled_task_repo.update.await_args_list
+        }
+        assert updated_numbers == {"1", "2"}
+
+    def test_前回の実行以降にリマインド日時を過ぎたリマインドを通知すること(
+        self, service
+    ):
+        save_scheduled_tasks(service, make_scheduled_task("1", "予定タスク"))
+        now = datetime.now(timezone.utc)
+        service.remind_progress_store.reminded_until = now - timedelta(minutes=3)
+        service.remind_progress_store.save()
+
+        def make_remind_task(number: str, before_start_at: datetime) -> ExecutedTask:
+            task = make_executed_task(number, f"実績{number}")
+            task.remind_info = TaskRemindInfo(
+                before_start_minutes=RemindMinutes(minutes=10), has_before_start=True
+            )
+            start = before_start_at + timedelta(minutes=10)
+            task.date = NotionDate(start=start, end=start + timedelta(hours=1))
+            return task
+
+        service.executed_task_repo.find_by_condition.return_value = ExecutedTasks.from_tasks(
+            [
+                # 前回の実行より前(通知済み)
+                make_remind_task("11", now - timedelta(minutes=5)),
+                # 前回の実行以降(現在の分ではない)
+                make_remind_task("12", now - timedelta(minutes=2)),
+            ]
+        )
+        notifier = Mock()
+        notifier.notify = AsyncMock()
+        service.reminder = TaskReminder(notifier=notifier)
+
+        async def run():
+            await service.regular_task()
+            # 非同期で実行されるリマインドの通知を待つ
+            await asyncio.sleep(0)
+
+        asyncio.run(run())
+
+        assert [call.kwargs["message"] for call in notifier.notify.await_args_list] == [
+            TaskReminder.get_message(
+                make_remind_task("12", now), kind=ReminderKind.BEFORE_START
+            )
+        ]
+        service.remind_progress_store.load()
+        assert service.remind_progress_store.reminded_until >= now
+
+    def test_状態を保持する場合は2回目以降の実行で読み込み直さず変更の無いタスクを更新しないこと(
+        self, service
+    ):
+        parent_task = make_scheduled_task("1", "親タスク")
+        sub_task = make_scheduled_task("2", "子タスク", parent_page_id="page_1")
+        parent_task.update_sub_tasks(ScheduledTasks.from_tasks([sub_task]))
+        save_scheduled_tasks(service, parent_task, sub_task)
+        service.task_repo.find_by_condition.side_effect = lambda **kwargs: (
+            ScheduledTasks.from_empty(),
+            ExecutedTasks.from_tasks(
+                [make_executed_task("11", "実績", scheduled_task_id="2")]
+            ),
+        )
+        service._load_task_store = AsyncMock(side_effect=service._load_task_store)
+        service._load_written_properties = AsyncMock()
+        service._load_dead_letters = AsyncMock()
+
+        async def run():
+            await service.regular_task(keeps_state=True)
+            update_count = service.scheduled_task_repo.update.await_count
+            await service.regular_task(keeps_state=True)
+            return update_count
+
+        first_update_count = asyncio.run(run())
+
+        assert first_update_count > 0
+        # 2回目は前回の実行で反映済みのため更新しない
+        assert service.scheduled_task_repo.update.await_count == first_update_count
+        service._load_task_store.assert_awaited_once()
+        service._load_written_properties.assert_awaited_once()
+        service._load_dead_letters.assert_awaited_once()
+        # リマインドは常駐プロセスのスケジューラーで通知するため取得しない
+        service.executed_task_repo.find_by_condition.assert_not_awaited()
+
+
+class TestCheckpoint:
+    def test_アップロードを遅らせたタスクをまとめて保存し読み込み直すこと(
+        self, service
+    ):
+        journal = TaskStoreJournal(store=service.task_store, gcs_handler=Mock())
+        journal._upload_delta = Mock()
+        journal.append(
+            ScheduledTasks.from_tasks([make_scheduled_task("1", "タスク")]),
+            ExecutedTasks.from_empty(),
+            uploads=False,
+        )
+        service._regular_task_journal = journal
+        service._load_task_store = AsyncMock(return_value=True)
+
+        asyncio.run(service.checkpoint())
+
+        journal._upload_delta.assert_called_once()
+        _, scheduled_tasks, _ = journal._upload_delta.call_args.args
+        assert [task.id.number for task in scheduled_tasks] == ["1"]
+        assert journal.flush() == 0
+        assert os.path.exists(service.dead_letter_store.save_path)
+        assert os.path.exists(service.written_property_store.save_path)
+        service._load_task_store.assert_awaited_once_with(journal=journal)
+
+    def test_状態を保持していない場合は何もしないこと(self, service):
+        service._load_task_store = AsyncMock()
+
+        asyncio.run(service.checkpoint())
+
+        service._load_task_store.assert_not_awaited()
+
+
+class TestTaskStoreLock:
+    def test_タスクストアの読み込みと書き込みを同時に実行しないこと(self, service):
+        running_count = 0
+        max_running_count = 0
+
+        def sync(*args, **kwargs):
+            nonlocal running_count, max_running_count
+            running_count += 1
+            max_running_count = max(max_running_count, running_count)
+            time.sleep(0.01)
+            running_count -= 1
+            return 0
+
+        journal = Mock(load=Mock(side_effect=sync), append=Mock(side_effect=sync))
+
+        async def run():
+            await asyncio.gather(
+                service._load_task_store(journal=journal),
+                service._save_task_store(
+                    journal=journal,
+                    scheduled_tasks=ScheduledTasks.from_empty(),
+                    executed_tasks=ExecutedTasks.from_empty(),
+                ),
+                service._load_task_store(journal=journal),
+            )
+
+        asyncio.run(run())
+
+        assert journal.load.call_count == 2
+        journal.append.assert_called_once()
+        assert max_running_count == 1
+
+
+class TestGetGcsHandler:
+    def test_初期化に失敗した場合はNoneを返し次回作り直すこと(
+        self, service, monkeypatch
+    ):
+        monkeypatch.setattr(config, "DEBUG_MODE", False)
+        with patch("notiontaskr.gcs_handler.storage.Client") as client:
+            client.side_effect = Exception("認証エラー")
+            assert service._get_gcs_handler() is None
+
+            client.side_effect = None
+            gcs_handler = service._get_gcs_handler()
+
+        assert gcs_handler is not None and gcs_handler.is_available
+        assert service._get_gcs_handler() is gcs_handler
+
+
+class TestComputeUptime:
+    @pytest.fixture
+    def service(self, service):
+        """2025年以降の実績タスクを漏れなく保存しているタスクストア"""
+        executed_task = make_executed_task("11", "実績")
+        executed_task.tags = Tags.from_tags([Tag("開発")])
+        service.task_store.replace_all(
+            scheduled_tasks=ScheduledTasks.from_empty(),
+            executed_tasks=ExecutedTasks.from_tasks([executed_task]),
+            covered_from=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        )
+        return service
+
+    def compute_uptime(self, service: TaskApplicationService, from_: datetime):
+        return asyncio.run(
+            service._compute_uptime(
+                Tags.from_tags([Tag("開発")]), from_=from_, to=datetime(2025, 1, 31)
+            )
+        )
+
+    def test_タスクストアが保存している期間はタスクストアから集計すること(
+        self, service
+    ):
+        uptime_data_by_tag = self.compute_uptime(service, from_=datetime(2025, 1, 1))
+
+        assert uptime_data_by_tag.get_data("開発").uptime == 2
+        service.executed_task_repo.find_by_condition.assert_not_awaited()
+
+    def test_タスクストアが保存している期間より前を含む場合はNotionから集計すること(
+        self, service
+    ):
+        uptime_data_by_tag = self.compute_uptime(service, from_=datetime(2024, 12, 1))
+
+        assert uptime_data_by_tag.get_data("開発").uptime == 0
+        service.executed_task_repo.find_by_condition.assert_awaited_once()
+
+
+class TestGetUptime:
+    @pytest.fixture
+    def generation(self, service, monkeypatch):
+        """読み込んだタスクストアのGCS上の世代"""
+        monkeypatch.setattr(config, "UPTIME_TASK_STORE_REFRESH_SECONDS", 0)
+        generation = PropertyMock(return_value=(1, ()))
+        monkeypatch.setattr(TaskStoreJournal, "generation", generation)
+        service._load_task_store = AsyncMock(return_value=True)
+        service._compute_uptime = AsyncMock(return_value=UptimeDataByTag.from_empty())
+        return generation
+
+    def get_uptime(self, service: TaskApplicationService):
+        return service.get_uptime(
+            Tags.from_empty(),
+            from_=datetime(2025, 1, 1),
+            to=datetime(2025, 1, 31),
+        )
+
+    def test_タスクストアが更新されていない場合はキャッシュした集計結果を返すこと(
+        self, service, generation
+    ):
+        async def run():
+            await self.get_uptime(service)
+            await self.get_uptime(service)
+
+        asyncio.run(run())
+
+        assert service._load_task_store.await_count == 2
+        service._compute_uptime.assert_awaited_once()
+
+    def test_他の実行でタスクストアが更新された場合はキャッシュを破棄すること(
+        self, service, generation
+    ):
+        async def run():
+            await self.get_uptime(service)
+            generation.return_value = (1, ("/deltas/1.sqlite3",))
+            await self.get_uptime(service)
+
+        asyncio.run(run())
+
+        assert service._compute_uptime.await_count == 2
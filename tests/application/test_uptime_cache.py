@@ -0,0 +1,125 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from notiontaskr.application.dto.uptime_data import UptimeDataByTag
+from notiontaskr.application.uptime_cache import UptimeCache
+from notiontaskr.domain.tags import Tags
+from notiontaskr.domain.value_objects.tag import Tag
+
+JANUARY = (datetime(2025, 1, 1), datetime(2025, 1, 31, 23, 59, 59))
+
+
+def make_tags(*tags: str) -> Tags:
+    return Tags.from_tags([Tag(tag) for tag in tags])
+
+
+class TestUptimeCache:
+    def test_同じ条件の集計結果はキャッシュから返すこと(self):
+        cache = UptimeCache()
+        result = UptimeDataByTag.from_empty()
+        compute = AsyncMock(return_value=result)
+
+        async def run():
+            first = await cache.get_or_compute(make_tags("a", "b"), *JANUARY, compute)
+            # タグの順序が異なっても同じ条件とみなす
+            second = await cache.get_or_compute(make_tags("b", "a"), *JANUARY, compute)
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert first is result
+        assert second is result
+        compute.assert_awaited_once()
+
+    def test_実行中の同じ条件の集計は1回にまとめること(self):
+        cache = UptimeCache()
+        calls = []
+
+        async def compute():
+            calls.append(None)
+            await asyncio.sleep(0)
+            return UptimeDataByTag.from_empty()
+
+        async def run():
+            return await asyncio.gather(
+                *(
+                    cache.get_or_compute(make_tags("a"), *JANUARY, compute)
+                    for _ in range(5)
+                )
+            )
+
+        results = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+
+    def test_有効期間が過ぎた集計結果は集計し直すこと(self):
+        now = [0.0]
+        cache = UptimeCache(ttl=60, timer=lambda: now[0])
+        compute = AsyncMock(return_value=UptimeDataByTag.from_empty())
+
+        async def run():
+            await cache.get_or_compute(make_tags("a"), *JANUARY, compute)
+            now[0] = 61.0
+            await cache.get_or_compute(make_tags("a"), *JANUARY, compute)
+
+        asyncio.run(run())
+
+        assert compute.await_count == 2
+
+    def test_上限を超えた場合は最も使われていない集計結果を破棄すること(self):
+        cache = UptimeCache(maxsize=2)
+        compute = AsyncMock(return_value=UptimeDataByTag.from_empty())
+
+        async def run():
+            await cache.get_or_compute(make_tags("a"), *JANUARY, compute)
+            await cache.get_or_compute(make_tags("b"), *JANUARY, compute)
+            await cache.get_or_compute(make_tags("a"), *JANUARY, compute)
+            await cache.get_or_compute(make_tags("c"), *JANUARY, compute)
+            # bが破棄され、aは残る
+            await cache.get_or_compute(make_tags("a"), *JANUARY, compute)
+            await cache.get_or_compute(make_tags("b"), *JANUARY, compute)
+
+        asyncio.run(run())
+
+        assert compute.await_count == 4
+
+    def test_失敗した集計はキャッシュしないこと(self):
+        cache = UptimeCache()
+        compute = AsyncMock(
+            side_effect=[Exception("error"), UptimeDataByTag.from_empty()]
+        )
+
+        async def run():
+            with pytest.raises(Exception):
+                await cache.get_or_compute(make_tags("a"), *JANUARY, compute)
+            await cache.get_or_compute(make_tags("a"), *JANUARY, compute)
+
+        asyncio.run(run())
+
+        assert compute.await_count == 2
+
+    def test_破棄した後は集計し直すこと(self):
+        cache = UptimeCache()
+        compute = AsyncMock(return_value=UptimeDataByTag.from_empty())
+
+        asyncio.run(cache.get_or_compute(make_tags("a"), *JANUARY, compute))
+        cache.clear()
+
+        assert len(cache) == 0
+        asyncio.run(cache.get_or_compute(make_tags("a"), *JANUARY, compute))
+        assert compute.await_count == 2
+
+    def test_集計中に破棄された場合は集計結果をキャッシュしないこと(self):
+        cache = UptimeCache()
+
+        async def compute():
+            cache.clear()
+            return UptimeDataByTag.from_empty()
+
+        asyncio.run(cache.get_or_compute(make_tags("a"), *JANUARY, compute))
+
+        assert len(cache) == 0
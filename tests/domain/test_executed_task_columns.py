@@ -0,0 +1,74 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from notiontaskr.domain.executed_task import ExecutedTask
+from notiontaskr.domain.executed_task_columns import ExecutedTaskColumns
+from notiontaskr.domain.executed_tasks import ExecutedTasks
+from notiontaskr.domain.tags import Tags
+from notiontaskr.domain.task_name import TaskName
+from notiontaskr.domain.value_objects.man_hours import ManHours
+from notiontaskr.domain.value_objects.notion_date import NotionDate
+from notiontaskr.domain.value_objects.notion_id import NotionId
+from notiontaskr.domain.value_objects.page_id import PageId
+from notiontaskr.domain.value_objects.status import Status
+from notiontaskr.domain.value_objects.tag import Tag
+
+
+def make_executed_task(
+    number: str,
+    tags: list[str],
+    hours: float,
+    start: datetime | None,
+) -> ExecutedTask:
+    return ExecutedTask(
+        page_id=PageId(f"page_{number}"),
+        name=TaskName("実績"),
+        tags=Tags.from_tags([Tag(tag) for tag in tags]),
+        id=NotionId(number),
+        status=Status.COMPLETED,
+        man_hours=ManHours(hours),
+        date=NotionDate(start=start, end=None) if start else None,
+    )
+
+
+class TestExecutedTaskColumns:
+    @pytest.fixture
+    def columns(self):
+        return ExecutedTaskColumns.from_tasks(
+            ExecutedTasks.from_tasks(
+                [
+                    make_executed_task("1", ["a"], 1.0, datetime(2025, 1, 5)),
+                    make_executed_task("2", ["a", "b"], 2.0, datetime(2025, 1, 5)),
+                    make_executed_task(
+                        "3", ["b"], 4.0, datetime(2025, 2, 1, tzinfo=timezone.utc)
+                    ),
+                    make_executed_task("4", ["c"], 8.0, None),
+                ]
+            )
+        )
+
+    def test_タグごとの人時を集計できること(self, columns: ExecutedTaskColumns):
+        totals = columns.sum_man_hours_by_tag([Tag("a"), Tag("b"), Tag("存在しない")])
+
+        assert totals == {Tag("a"): 3.0, Tag("b"): 6.0, Tag("存在しない"): 0.0}
+
+    def test_実績タスクが無い場合も集計できること(self):
+        columns = ExecutedTaskColumns.from_tasks(ExecutedTasks.from_empty())
+
+        assert columns.sum_man_hours_by_tag([Tag("a")]) == {Tag("a"): 0.0}
+
+    def test_8個を超えるタグもビットマップから集計できること(self):
+        tags = [f"tag{i}" for i in range(10)]
+        columns = ExecutedTaskColumns.from_tasks(
+            ExecutedTasks.from_tasks(
+                [
+                    make_executed_task("1", tags, 1.0, datetime(2025, 1, 5)),
+                    make_executed_task("2", ["tag9"], 2.0, datetime(2025, 1, 5)),
+                ]
+            )
+        )
+
+        totals = columns.sum_man_hours_by_tag([Tag("tag0"), Tag("tag9")])
+
+        assert totals == {Tag("tag0"): 1.0, Tag("tag9"): 3.0}
@@ -68,3 +68,50 @@ class TestExecutedTaskService:
             updated_tasks = ExecutedTaskService().get_scheduled_tasks_added_executed_id(to, source)  # type: ignore
             # 新たにIDが付与された予定タスクがない場合は空のリストを返すことを確認
             assert updated_tasks == ScheduledTasks.from_empty()
+
+        def test_同じ名前の予定タスクが複数ある場合は先に見つかった予定タスクを紐づけること(
+            self,
+        ):
+            executed_task = Mock()
+            executed_task.name.id_label = None
+            executed_task.name.task_name = "タスク1"
+            first = Mock()
+            first.name.task_name = "タスク1"
+            first.id = "scheduled_id_1"
+            second = Mock()
+            second.name.task_name = "タスク1"
+            second.id = "scheduled_id_2"
+            to = ExecutedTasks.from_tasks([executed_task])
+
+            _ = ExecutedTaskService().get_scheduled_tasks_added_executed_id(to, [first, second])  # type: ignore
+
+            executed_task.update_scheduled_task_id.assert_called_once_with(
+                "scheduled_id_1"
+            )
+
+        def test_正規化を有効にすると全角半角や空白の違いを無視して紐づけること(
+            self,
+        ):
+            executed_task = Mock()
+            executed_task.name.id_label = None
+            executed_task.name.task_name = "ＡＰＩ　設計"
+            scheduled_task = Mock()
+            scheduled_task.name.task_name = "API 設計"
+            scheduled_task.id = "scheduled_id_1"
+            to = ExecutedTasks.from_tasks([executed_task])
+
+            _ = ExecutedTaskService(
+                normalizes_task_name=False
+            ).get_scheduled_tasks_added_executed_id(
+                to, [scheduled_task]
+            )  # type: ignore
+            executed_task.update_scheduled_task_id.assert_not_called()
+
+            _ = ExecutedTaskService(
+                normalizes_task_name=True
+            ).get_scheduled_tasks_added_executed_id(
+                to, [scheduled_task]
+            )  # type: ignore
+            executed_task.update_scheduled_task_id.assert_called_once_with(
+                "scheduled_id_1"
+            )
@@ -0,0 +1,139 @@
+from unittest.mock import Mock
+
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.domain.scheduled_task_rollup import ScheduledTaskRollup
+from notiontaskr.domain.scheduled_tasks import ScheduledTasks
+from notiontaskr.domain.task_name import TaskName
+from notiontaskr.domain.tags import Tags
+from notiontaskr.domain.value_objects.notion_id import NotionId
+from notiontaskr.domain.value_objects.page_id import PageId
+from notiontaskr.domain.value_objects.progress_rate import ProgressRate
+from notiontaskr.domain.value_objects.scheduled_man_hours import ScheduledManHours
+from notiontaskr.domain.value_objects.status import Status
+
+
+def create_task(number: str, status=Status.NOT_STARTED, scheduled_man_hours=0.0):
+    return ScheduledTask(
+        page_id=PageId(f"page_{number}"),
+        name=TaskName(f"タスク{number}"),
+        tags=Tags.from_empty(),
+        id=NotionId(number),
+        status=status,
+        scheduled_man_hours=ScheduledManHours(scheduled_man_hours),
+    )
+
+
+def link(parent: ScheduledTask, *sub_tasks: ScheduledTask):
+    parent.update_sub_tasks(ScheduledTasks.from_tasks(list(sub_tasks)))
+
+
+class TestScheduledTaskRollup:
+    def test_サブアイテムが親タスクより先に並ぶこと(self):
+        root = create_task("1")
+        child = create_task("2")
+        grandchild = create_task("3")
+        link(root, child)
+        link(child, grandchild)
+
+        order = ScheduledTaskRollup(ScheduledTasks.from_tasks([root])).get_order()
+
+        assert [task.id.number for task, _ in order] == ["3", "2", "1"]
+
+    def test_共有されたサブアイテムは1度だけ並ぶこと(self):
+        parent1 = create_task("1")
+        parent2 = create_task("2")
+        shared = create_task("3")
+        link(parent1, shared)
+        link(parent2, shared)
+
+        order = ScheduledTaskRollup(
+            ScheduledTasks.from_tasks([parent1, parent2, shared])
+        ).get_order()
+
+        assert [task.id.number for task, _ in order] == ["3", "1", "2"]
+
+    def test_深い階層を葉から集計すること(self):
+        # 1 -> 2 -> 3 -> (4: 完了, 5: 未着手)
+        tasks = [create_task(str(i)) for i in range(1, 4)]
+        done = create_task("4", status=Status.COMPLETED, scheduled_man_hours=3.0)
+        todo = create_task("5", scheduled_man_hours=1.0)
+        link(tasks[0], tasks[1])
+        link(tasks[1], tasks[2])
+        link(tasks[2], done, todo)
+
+        # 親タスクを先に並べても、サブアイテムの集計結果を使うこと
+        ScheduledTasks.from_tasks(tasks + [done, todo]).update_tasks_properties()
+
+        for task in tasks:
+            assert task.scheduled_man_hours == ScheduledManHours(4.0)
+            assert task.status == Status.IN_PROGRESS
+        assert tasks[2].progress_rate == ProgressRate(0.75)
+        # 直下のサブアイテムが完了していない場合は0になる
+        assert tasks[0].progress_rate == ProgressRate(0.0)
+
+    def test_全てのサブアイテムが完了の場合は親タスクも完了になること(self):
+        root = create_task("1")
+        child = create_task("2")
+        grandchild = create_task("3", status=Status.COMPLETED, scheduled_man_hours=2)
+        link(root, child)
+        link(child, grandchild)
+
+        ScheduledTasks.from_tasks([root]).update_tasks_properties()
+
+        assert child.status == Status.COMPLETED
+        assert root.status == Status.COMPLETED
+        assert root.progress_rate == ProgressRate(1.0)
+
+    def test_循環する関連を無視して集計しエラーを通知すること(self):
+        task1 = create_task("1", scheduled_man_hours=1.0)
+        task2 = create_task("2", scheduled_man_hours=2.0)
+        link(task1, task2)
+        link(task2, task1)
+        on_error = Mock()
+
+        ScheduledTasks.from_tasks([task1, task2]).update_tasks_properties(
+            on_error=on_error
+        )
+
+        on_error.assert_called_once()
+        error, task = on_error.call_args.args
+        assert isinstance(error, ValueError)
+        assert task is task2
+        # 2 -> 1 の関連を除いて集計する
+        assert task1.scheduled_man_hours == ScheduledManHours(2.0)
+
+    def test_自身をサブアイテムに持つ場合も停止すること(self):
+        task = create_task("1")
+        link(task, task)
+        on_error = Mock()
+
+        ScheduledTasks.from_tasks([task]).update_tasks_properties(on_error=on_error)
+
+        on_error.assert_called_once()
+
+    def test_再帰の上限を超える深さの階層を集計できること(self):
+        tasks = [create_task(str(i)) for i in range(1, 3001)]
+        for parent, child in zip(tasks, tasks[1:]):
+            link(parent, child)
+        tasks[-1].update_status(Status.COMPLETED)
+
+        ScheduledTasks.from_tasks([tasks[0]]).update_tasks_properties()
+
+        assert tasks[0].status == Status.COMPLETED
+
+    def test_対象外のサブアイテムは辿らずに集計済みの値を使うこと(self):
+        parent = create_task("1")
+        child = create_task("2", status=Status.COMPLETED, scheduled_man_hours=2.0)
+        grandchild = create_task("3", scheduled_man_hours=5.0)
+        link(parent, child)
+        link(child, grandchild)
+
+        ScheduledTasks.from_tasks([parent]).update_tasks_properties(
+            updates_sub_tasks=False
+        )
+
+        # 孫タスクから再集計せず、サブアイテムの値をそのまま使う
+        assert child.scheduled_man_hours == ScheduledManHours(2.0)
+        assert child.status == Status.COMPLETED
+        assert parent.scheduled_man_hours == ScheduledManHours(2.0)
+        assert parent.status == Status.COMPLETED
@@ -96,6 +96,73 @@ class TestScheduledTasks:
         )
         assert len(result_tasks) == 1
 
+    def test_upserted_by_idは元のリストを変更せずタスクを共有すること(
+        self, task1: ScheduledTask, task2: ScheduledTask
+    ):
+        scheduled_tasks = ScheduledTasks.from_tasks([task1])
+
+        result_tasks = scheduled_tasks.upserted_by_id(
+            ScheduledTasks.from_tasks([task2])
+        )
+
+        assert len(scheduled_tasks) == 1
+        assert len(result_tasks) == 2
+        assert result_tasks[0] is task1
+
+    def test_同じIDのタスクは元の位置で置き換えられること(
+        self, task1: ScheduledTask, task2: ScheduledTask
+    ):
+        scheduled_tasks = ScheduledTasks.from_tasks([task1, task2])
+        new_task1 = ScheduledTask(
+            page_id=PageId("page_1_new"),
+            name=TaskName("タスク1(更新)"),
+            tags=Tags.from_empty(),
+            id=NotionId("1"),
+            status=Status.COMPLETED,
+        )
+
+        scheduled_tasks.upsert_by_id(ScheduledTasks.from_tasks([new_task1]))
+
+        assert scheduled_tasks._tasks == [new_task1, task2]
+        assert scheduled_tasks.get_by_page_id(PageId("page_1_new")) is new_task1
+        assert scheduled_tasks.get_by_page_id(PageId("page_1")) is None
+
+    def test_IDとページIDでタスクを取得できること(
+        self, task1: ScheduledTask, task2: ScheduledTask
+    ):
+        scheduled_tasks = ScheduledTasks.from_empty()
+        scheduled_tasks.append(task1)
+        scheduled_tasks.extend(ScheduledTasks.from_tasks([task2]))
+
+        assert scheduled_tasks.get_by_id(NotionId("2")) is task2
+        assert scheduled_tasks.get_by_page_id(PageId("page_1")) is task1
+        assert scheduled_tasks.has_id(NotionId("1"))
+        assert not scheduled_tasks.has_id(NotionId("3"))
+        assert scheduled_tasks.get_by_id(None) is None
+
+    def test_appendで重複したIDはupsert_by_idで除去されること(
+        self, task1: ScheduledTask, task2: ScheduledTask
+    ):
+        scheduled_tasks = ScheduledTasks.from_empty()
+        scheduled_tasks.append(task1)
+        scheduled_tasks.append(task1)
+        assert len(scheduled_tasks) == 2
+
+        scheduled_tasks.upsert_by_id(ScheduledTasks.from_tasks([task2]))
+
+        assert scheduled_tasks._tasks == [task1, task2]
+
+    def test_索引を経由せずにリストを変更しても索引を作り直すこと(
+        self, task1: ScheduledTask, task2: ScheduledTask
+    ):
+        tasks = [task1]
+        scheduled_tasks = ScheduledTasks.from_tasks(tasks)
+        assert scheduled_tasks.get_by_id(NotionId("2")) is None
+
+        tasks.append(task2)
+
+        assert scheduled_tasks.get_by_id(NotionId("2")) is task2
+
     def test_IDで一意なタスクを取得できること(self, task1: ScheduledTask):
         scheduled_tasks = ScheduledTasks.from_tasks([task1, task1])
         unique_tasks = scheduled_tasks.get_unique_tasks_by_id()
@@ -0,0 +1,88 @@
+from notiontaskr.domain.executed_task import ExecutedTask
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.domain.scheduled_tasks import ScheduledTasks
+from notiontaskr.domain.tags import Tags
+from notiontaskr.domain.task_dependency_graph import TaskDependencyGraph
+from notiontaskr.domain.task_name import TaskName
+from notiontaskr.domain.value_objects.notion_id import NotionId
+from notiontaskr.domain.value_objects.page_id import PageId
+from notiontaskr.domain.value_objects.scheduled_task_id import ScheduledTaskId
+from notiontaskr.domain.value_objects.status import Status
+
+
+def make_scheduled_task(number: str, *sub_tasks: ScheduledTask) -> ScheduledTask:
+    return ScheduledTask(
+        page_id=PageId(f"page_{number}"),
+        name=TaskName("予定"),
+        tags=Tags.from_empty(),
+        id=NotionId(number),
+        status=Status.IN_PROGRESS,
+        sub_tasks=ScheduledTasks.from_tasks(list(sub_tasks)),
+    )
+
+
+def make_executed_task(number: str, scheduled_task_id=None) -> ExecutedTask:
+    return ExecutedTask(
+        page_id=PageId(f"page_{number}"),
+        name=TaskName("実績"),
+        tags=Tags.from_empty(),
+        id=NotionId(number),
+        status=Status.COMPLETED,
+        scheduled_task_id=scheduled_task_id,
+    )
+
+
+class TestTaskDependencyGraph:
+    def test_変更されたタスクとその祖先のみが対象になること(self):
+        # 1 -> 2 -> 3, 1 -> 4
+        task3 = make_scheduled_task("3")
+        task2 = make_scheduled_task("2", task3)
+        task4 = make_scheduled_task("4")
+        task1 = make_scheduled_task("1", task2, task4)
+        graph = TaskDependencyGraph.from_scheduled_tasks(
+            ScheduledTasks.from_tasks([task1, task2, task3, task4])
+        )
+
+        graph.mark_scheduled_task_dirty(task3)
+
+        assert [task.id.number for task in graph.get_dirty_tasks()] == ["3", "2", "1"]
+
+    def test_実績タスクが紐づく予定タスクとその祖先が対象になること(self):
+        task2 = make_scheduled_task("2")
+        task1 = make_scheduled_task("1", task2)
+        linked = make_executed_task("11")
+        task2.executed_tasks.append(linked)
+        graph = TaskDependencyGraph.from_scheduled_tasks(
+            ScheduledTasks.from_tasks([task1, task2])
+        )
+
+        graph.mark_executed_task_dirty(linked)
+
+        assert [task.id.number for task in graph.get_dirty_tasks()] == ["2", "1"]
+
+    def test_予定IDのみを持つ実績タスクでも対象になること(self):
+        task1 = make_scheduled_task("1")
+        graph = TaskDependencyGraph.from_scheduled_tasks(
+            ScheduledTasks.from_tasks([task1])
+        )
+
+        graph.mark_executed_task_dirty(
+            make_executed_task("11", scheduled_task_id=ScheduledTaskId("1"))
+        )
+
+        assert [task.id.number for task in graph.get_dirty_tasks()] == ["1"]
+
+    def test_関連が循環していても停止すること(self):
+        task1 = make_scheduled_task("1")
+        task2 = make_scheduled_task("2", task1)
+        task1.sub_tasks.append(task2)
+        graph = TaskDependencyGraph.from_scheduled_tasks(
+            ScheduledTasks.from_tasks([task1, task2])
+        )
+
+        graph.mark_scheduled_task_dirty(task1)
+
+        assert sorted(task.id.number for task in graph.get_dirty_tasks()) == [
+            "1",
+            "2",
+        ]
@@ -0,0 +1,83 @@
+from notiontaskr.domain.executed_task import ExecutedTask
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.domain.scheduled_tasks import ScheduledTasks
+from notiontaskr.domain.tags import Tags
+from notiontaskr.domain.task_identity_map import TaskIdentityMap
+from notiontaskr.domain.task_name import TaskName
+from notiontaskr.domain.value_objects.notion_id import NotionId
+from notiontaskr.domain.value_objects.page_id import PageId
+from notiontaskr.domain.value_objects.status import Status
+
+
+def make_scheduled_task(number: str, name: str = "予定") -> ScheduledTask:
+    return ScheduledTask(
+        page_id=PageId(f"page_{number}"),
+        name=TaskName(name),
+        tags=Tags.from_empty(),
+        id=NotionId(number),
+        status=Status.IN_PROGRESS,
+    )
+
+
+def make_executed_task(number: str) -> ExecutedTask:
+    return ExecutedTask(
+        page_id=PageId(f"page_{number}"),
+        name=TaskName("実績"),
+        tags=Tags.from_empty(),
+        id=NotionId(number),
+        status=Status.COMPLETED,
+    )
+
+
+class TestTaskIdentityMap:
+    def test_埋め込まれている関連をIDで登録できること(self):
+        parent = make_scheduled_task("1")
+        parent.sub_tasks.append(make_scheduled_task("2"))
+        parent.executed_tasks.append(make_executed_task("11"))
+        identity_map = TaskIdentityMap()
+
+        identity_map.put_scheduled_task(parent)
+
+        assert [t.id.number for t in identity_map.get_sub_tasks(NotionId("1"))] == ["2"]
+        assert [t.id.number for t in identity_map.get_executed_tasks("1")] == ["11"]
+        assert identity_map.get_scheduled_task("2") is parent.sub_tasks._tasks[0]
+
+    def test_同じIDのタスクを登録すると関連を引き継いで置き換えること(self):
+        cached_parent = make_scheduled_task("1", "キャッシュ")
+        cached_child = make_scheduled_task("2", "キャッシュ")
+        cached_parent.sub_tasks.append(cached_child)
+        cached_parent.executed_tasks.append(make_executed_task("11"))
+        identity_map = TaskIdentityMap()
+        identity_map.put_scheduled_task(cached_parent)
+
+        fetched_parent = make_scheduled_task("1", "取得")
+        fetched_child = make_scheduled_task("2", "取得")
+        identity_map.put_scheduled_tasks(
+            ScheduledTasks.from_tasks([fetched_parent, fetched_child])
+        )
+        merged = identity_map.get_scheduled_tasks()
+
+        assert merged.get_tasks_by_id()[NotionId("1")] is fetched_parent
+        assert fetched_parent.sub_tasks._tasks == [fetched_child]
+        assert fetched_parent.sub_tasks._tasks[0] is fetched_child
+        assert [t.id.number for t in fetched_parent.executed_tasks] == ["11"]
+
+    def test_IDで関連付けたタスクは登録後に紐づくこと(self):
+        identity_map = TaskIdentityMap()
+        parent = make_scheduled_task("1")
+        identity_map.put_scheduled_task(parent, sub_task_ids=["2"])
+        identity_map.link_executed_task(NotionId("1"), NotionId("11"))
+
+        identity_map.resolve(parent)
+        assert len(parent.sub_tasks) == 0
+        assert len(parent.executed_tasks) == 0
+
+        child = make_scheduled_task("2")
+        executed_task = make_executed_task("11")
+        identity_map.put_scheduled_task(child)
+        identity_map.put_executed_task(executed_task)
+        identity_map.resolve(parent)
+
+        assert parent.sub_tasks._tasks[0] is child
+        assert parent.executed_tasks._tasks[0] is executed_task
+        assert len(identity_map) == 3
@@ -82,6 +82,25 @@ class TestUpdateContents:
             update_contents.upsert(content3)
             assert update_contents.is_updated()
 
+    class Test_更新されたキーを取得する:
+        def test_値が変わった更新内容のキーのみを返すこと(self):
+            update_contents = UpdateContents()
+            update_contents.upsert(
+                UpdateContent(
+                    key="ステータス",
+                    original_value="未着手",
+                    update_value="進行中",
+                )
+            )
+            update_contents.upsert(
+                UpdateContent(
+                    key="進捗率",
+                    original_value="0.5",
+                    update_value="0.5",
+                )
+            )
+            assert update_contents.get_updated_keys() == ["ステータス"]
+
     class Test_配列関連のメソッド:
         def test_要素にアクセスできること(self):
             update_contents = UpdateContents()
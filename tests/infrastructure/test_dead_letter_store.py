@@ -0,0 +1,74 @@
+import os
+
+from pytest import fixture
+
+from notiontaskr.infrastructure.dead_letter_store import DeadLetter, DeadLetterStore
+
+
+class TestDeadLetterStore:
+    @fixture
+    def store(self, tmp_path):
+        return DeadLetterStore(save_path=os.path.join(tmp_path, "dead_letters.json"))
+
+    @fixture
+    def dead_letter(self):
+        return DeadLetter(
+            kind=DeadLetterStore.SCHEDULED,
+            page_id="page_1",
+            task_number="1",
+            properties={"進捗率": {"number": 0.5}},
+        )
+
+    def test_保存したデッドレターを読み込めること(self, store, dead_letter):
+        store.append(dead_letter)
+        store.save()
+
+        loaded_store = DeadLetterStore(save_path=store.save_path)
+        loaded_store.load()
+
+        assert loaded_store.pop_all() == [dead_letter]
+
+    def test_ファイルが存在しない場合は空になること(self, store):
+        store.load()
+        assert len(store) == 0
+
+    def test_同じページのデッドレターはプロパティがマージされること(
+        self, store, dead_letter
+    ):
+        store.append(dead_letter)
+        store.append(
+            DeadLetter(
+                kind=DeadLetterStore.SCHEDULED,
+                page_id="page_1",
+                task_number="1",
+                properties={"進捗率": {"number": 1.0}, "人時(実)": {"number": 2}},
+            )
+        )
+
+        dead_letters = store.pop_all()
+        assert len(dead_letters) == 1
+        assert dead_letters[0].properties == {
+            "進捗率": {"number": 1.0},
+            "人時(実)": {"number": 2},
+        }
+
+    def test_取り出した後は空になること(self, store, dead_letter):
+        store.append(dead_letter)
+        store.pop_all()
+        assert len(store) == 0
+
+    def test_算出時点の最終更新日時より後に編集された場合は古いと判定すること(
+        self, dead_letter
+    ):
+        dead_letter.last_edited_time = "2025-01-01T00:00:00.000Z"
+
+        assert dead_letter.is_outdated("2025-01-01T00:05:00.000Z")
+        assert not dead_letter.is_outdated("2025-01-01T00:00:00.000Z")
+
+    def test_算出時点の最終更新日時が不明な場合は失敗した日時と比較すること(
+        self, dead_letter
+    ):
+        dead_letter.failed_at = "2025-01-01T00:03:00+00:00"
+
+        assert dead_letter.is_outdated("2025-01-01T00:05:00.000Z")
+        assert not dead_letter.is_outdated("2025-01-01T00:00:00.000Z")
@@ -0,0 +1,44 @@
+from pytest import fixture
+
+from notiontaskr.domain.executed_task import ExecutedTask
+from notiontaskr.domain.tags import Tags
+from notiontaskr.domain.task_name import TaskName
+from notiontaskr.domain.value_objects.notion_id import NotionId
+from notiontaskr.domain.value_objects.page_id import PageId
+from notiontaskr.domain.value_objects.scheduled_task_page_id import (
+    ScheduledTaskPageId,
+)
+from notiontaskr.domain.value_objects.status import Status
+from notiontaskr.infrastructure.executed_task_update_properties import (
+    ExecutedTaskUpdateProperties,
+)
+
+
+class TestExecutedTaskUpdateProperties:
+    @fixture
+    def task(self):
+        return ExecutedTask(
+            page_id=PageId("page_1"),
+            name=TaskName("タスク1"),
+            tags=Tags.from_empty(),
+            id=NotionId("1"),
+            status=Status.IN_PROGRESS,
+        )
+
+    def test_ステータスのみ更新された場合はステータスのみを返すこと(self, task):
+        task.update_status(Status.COMPLETED)
+
+        properties = (
+            ExecutedTaskUpdateProperties(task=task).set_updated_contents().build()
+        )
+
+        assert properties == {"ステータス": {"status": {"name": "完了"}}}
+
+    def test_予定タスクページIDが更新された場合は予定タスクを返すこと(self, task):
+        task.update_scheduled_task_page_id(ScheduledTaskPageId("page_2"))
+
+        properties = (
+            ExecutedTaskUpdateProperties(task=task).set_updated_contents().build()
+        )
+
+        assert properties == {"予定タスク": {"relation": [{"id": "page_2"}]}}
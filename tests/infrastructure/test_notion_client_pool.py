@@ -0,0 +1,50 @@
+import asyncio
+
+from notiontaskr.infrastructure.notion_client_pool import NotionClientPool
+
+
+class TestNotionClientPool:
+    def test_同一イベントループ内では同じクライアントを返すこと(self):
+        pool = NotionClientPool(token="token")
+
+        async def get_twice():
+            return pool.get(), pool.get()
+
+        client1, client2 = asyncio.run(get_twice())
+        assert client1 is client2
+
+    def test_イベントループが変わると新しいクライアントを生成すること(self):
+        pool = NotionClientPool(token="token")
+
+        async def get():
+            return pool.get()
+
+        client1 = asyncio.run(get())
+        client2 = asyncio.run(get())
+        assert client1 is not client2
+
+    def test_接続数の上限を設定できること(self):
+        pool = NotionClientPool(token="token", max_connections=3)
+        assert pool.limits.max_connections == 3
+
+    def test_イベントループの終了時にクライアントを閉じること(self):
+        pool = NotionClientPool(token="token")
+
+        async def get():
+            return pool.get()
+
+        client = asyncio.run(get())
+        assert client.client.is_closed
+
+    def test_明示的に閉じると次の取得で新しいクライアントを生成すること(self):
+        pool = NotionClientPool(token="token")
+
+        async def run():
+            client1 = pool.get()
+            await pool.aclose()
+            return client1, pool.get()
+
+        client1, client2 = asyncio.run(run())
+        assert client1.client.is_closed
+        assert client1 is not client2
+        assert client2.client.is_closed
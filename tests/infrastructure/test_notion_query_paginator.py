@@ -0,0 +1,106 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from notiontaskr.infrastructure.notion_query_paginator import (
+    NotionQueryPaginator,
+    PageFetchMetric,
+)
+
+
+def make_pages(count: int) -> list[dict]:
+    return [
+        {
+            "results": [{"page": i}],
+            "has_more": i < count - 1,
+            "next_cursor": f"cursor_{i + 1}" if i < count - 1 else None,
+        }
+        for i in range(count)
+    ]
+
+
+class TestNotionQueryPaginator:
+    def test_全てのページを順に返すこと(self):
+        query = AsyncMock(side_effect=make_pages(3))
+        paginator = NotionQueryPaginator(query=query)
+
+        async def collect():
+            return [page async for page in paginator.iter_pages({"filter": {}})]
+
+        pages = asyncio.run(collect())
+
+        assert [page["results"][0]["page"] for page in pages] == [0, 1, 2]
+        assert query.await_args_list[1].args[0] == {
+            "filter": {},
+            "start_cursor": "cursor_1",
+        }
+
+    def test_ページ数の上限を指定できること(self):
+        query = AsyncMock(side_effect=make_pages(5))
+        paginator = NotionQueryPaginator(query=query)
+
+        async def collect():
+            return [page async for page in paginator.iter_pages({}, max_pages=2)]
+
+        pages = asyncio.run(collect())
+
+        assert len(pages) == 2
+        assert query.await_count == 2
+
+    def test_ページを返す前に次のページのリクエストを送っていること(self):
+        query = AsyncMock(side_effect=make_pages(2))
+        paginator = NotionQueryPaginator(query=query)
+
+        async def consume_first():
+            async for _ in paginator.iter_pages({}):
+                await asyncio.sleep(0)
+                return query.call_count
+
+        assert asyncio.run(consume_first()) == 2
+
+    def test_ページ数の上限が1未満の場合ValueErrorが発生すること(self):
+        paginator = NotionQueryPaginator(query=AsyncMock())
+
+        async def collect():
+            return [page async for page in paginator.iter_pages({}, max_pages=0)]
+
+        with pytest.raises(ValueError):
+            asyncio.run(collect())
+
+    def test_ページごとの取得時間と件数を通知すること(self):
+        query = AsyncMock(side_effect=make_pages(2))
+        paginator = NotionQueryPaginator(query=query)
+        metrics: list[PageFetchMetric] = []
+
+        async def collect():
+            return [
+                page
+                async for page in paginator.iter_pages(
+                    {}, on_page_fetched=metrics.append
+                )
+            ]
+
+        asyncio.run(collect())
+
+        assert [metric.page_number for metric in metrics] == [1, 2]
+        assert [metric.result_count for metric in metrics] == [1, 1]
+        assert all(metric.latency >= 0 for metric in metrics)
+
+    def test_取得中のエラーが呼び出し元に伝わること(self):
+        pages = make_pages(2)
+        query = AsyncMock(side_effect=[pages[0], RuntimeError("fetch failed")])
+        paginator = NotionQueryPaginator(query=query)
+        received = []
+
+        async def collect():
+            async for page in paginator.iter_pages({}):
+                received.append(page)
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(collect())
+        assert received == [pages[0]]
+
+    def test_先読みページ数が1未満の場合ValueErrorが発生すること(self):
+        with pytest.raises(ValueError):
+            NotionQueryPaginator(query=AsyncMock(), prefetch_pages=0)
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from notion_client.errors import HTTPResponseError
+
+from notiontaskr.infrastructure.notion_rate_limiter import NotionRateLimiter
+
+
+def make_error(status: int, headers: dict = {}) -> HTTPResponseError:
+    return HTTPResponseError(httpx.Response(status_code=status, headers=headers))
+
+
+class TestNotionRateLimiter:
+    def test_リクエストの結果を返すこと(self):
+        limiter = NotionRateLimiter()
+        request = AsyncMock(return_value="result")
+
+        result = asyncio.run(limiter.call(request))
+
+        assert result == "result"
+
+    def test_トークンが尽きた場合はレートに従って待機すること(self):
+        limiter = NotionRateLimiter(rate=50, burst=1)
+        request = AsyncMock()
+
+        async def call_all():
+            await asyncio.gather(*[limiter.call(request) for _ in range(4)])
+
+        start = time.monotonic()
+        asyncio.run(call_all())
+
+        # 1件目はバーストで即時、残り3件は1/50秒ずつ待機する
+        assert time.monotonic() - start >= 0.05
+
+    def test_同時実行数の上限を超えて実行しないこと(self):
+        limiter = NotionRateLimiter(
+            rate=1000, burst=100, initial_concurrency=2, max_concurrency=2
+        )
+        in_flight = 0
+        max_in_flight = 0
+
+        async def request():
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        async def call_all():
+            await asyncio.gather(*[limiter.call(request) for _ in range(5)])
+
+        asyncio.run(call_all())
+
+        assert max_in_flight == 2
+
+    def test_成功時に同時実行数が増加すること(self):
+        limiter = NotionRateLimiter(
+            rate=1000, burst=100, initial_concurrency=1, max_concurrency=5
+        )
+
+        async def call_all():
+            for _ in range(3):
+                await limiter.call(AsyncMock())
+
+        asyncio.run(call_all())
+
+        assert limiter.concurrency > 1
+
+    def test_429応答時はRetry_Afterだけ待機して再送すること(self):
+        limiter = NotionRateLimiter(rate=1000, burst=100)
+        request = AsyncMock(
+            side_effect=[make_error(429, {"Retry-After": "0.05"}), "result"]
+        )
+
+        start = time.monotonic()
+        result = asyncio.run(limiter.call(request))
+
+        assert result == "result"
+        assert request.await_count == 2
+        assert time.monotonic() - start >= 0.05
+
+    def test_429応答時に同時実行数が半減すること(self):
+        limiter = NotionRateLimiter(
+            rate=1000, burst=100, initial_concurrency=4, max_concurrency=4
+        )
+        request = AsyncMock(side_effect=[make_error(429, {"Retry-After": "0"}), None])
+
+        asyncio.run(limiter.call(request))
+
+        assert limiter.concurrency < 4
+
+    def test_5xx応答時は同時実行数を減らして例外を送出すること(self):
+        limiter = NotionRateLimiter(
+            rate=1000, burst=100, initial_concurrency=4, max_concurrency=4
+        )
+        request = AsyncMock(side_effect=make_error(503))
+
+        with pytest.raises(HTTPResponseError):
+            asyncio.run(limiter.call(request))
+        assert limiter.concurrency == 2
+
+    def test_429の再送上限に達した場合は例外を送出すること(self):
+        limiter = NotionRateLimiter(rate=1000, burst=100, max_rate_limited_retries=1)
+        request = AsyncMock(side_effect=make_error(429, {"Retry-After": "0"}))
+
+        with pytest.raises(HTTPResponseError):
+            asyncio.run(limiter.call(request))
+        assert request.await_count == 2
+
+    def test_異なるイベントループから呼び出せること(self):
+        limiter = NotionRateLimiter()
+
+        asyncio.run(limiter.call(AsyncMock()))
+        asyncio.run(limiter.call(AsyncMock()))
@@ -0,0 +1,32 @@
+from datetime import datetime, timezone
+import os
+
+from pytest import fixture
+
+from notiontaskr.infrastructure.remind_progress_store import RemindProgressStore
+
+
+class TestRemindProgressStore:
+    @fixture
+    def store(self, tmp_path):
+        return RemindProgressStore(
+            save_path=os.path.join(tmp_path, "remind_progress.json")
+        )
+
+    def test_保存した通知済みの日時を読み込めること(self, store):
+        store.reminded_until = datetime(2025, 1, 1, 9, 30, tzinfo=timezone.utc)
+        store.save()
+
+        loaded_store = RemindProgressStore(save_path=store.save_path)
+        loaded_store.load()
+
+        assert loaded_store.reminded_until == datetime(
+            2025, 1, 1, 9, 30, tzinfo=timezone.utc
+        )
+
+    def test_ファイルが無い場合は記録が無いとみなすこと(self, store):
+        store.reminded_until = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+        store.load()
+
+        assert store.reminded_until is None
@@ -0,0 +1,55 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+from notiontaskr.infrastructure.retry_policy import RetryPolicy
+
+
+def make_error(status: int) -> HTTPResponseError:
+    return HTTPResponseError(httpx.Response(status_code=status))
+
+
+class TestRetryPolicy:
+    def test_一時的なエラーの場合は再試行して結果を返すこと(self):
+        policy = RetryPolicy(max_attempts=3, base_delay=0)
+        request = AsyncMock(side_effect=[make_error(502), RequestTimeoutError(), "ok"])
+
+        result = asyncio.run(policy.run(request))
+
+        assert result == "ok"
+        assert request.await_count == 3
+
+    def test_試行回数の上限に達した場合は例外を送出すること(self):
+        policy = RetryPolicy(max_attempts=2, base_delay=0)
+        request = AsyncMock(side_effect=make_error(503))
+
+        with pytest.raises(HTTPResponseError):
+            asyncio.run(policy.run(request))
+        assert request.await_count == 2
+
+    def test_一時的でないエラーの場合は再試行しないこと(self):
+        policy = RetryPolicy(max_attempts=3, base_delay=0)
+        request = AsyncMock(side_effect=make_error(400))
+
+        with pytest.raises(HTTPResponseError):
+            asyncio.run(policy.run(request))
+        assert request.await_count == 1
+
+    def test_429の場合はレート制限に再送を任せて再試行しないこと(self):
+        policy = RetryPolicy(max_attempts=3, base_delay=0)
+        request = AsyncMock(side_effect=make_error(429))
+
+        with pytest.raises(HTTPResponseError):
+            asyncio.run(policy.run(request))
+        assert request.await_count == 1
+
+    def test_待機時間は上限を超えないこと(self):
+        policy = RetryPolicy(base_delay=1, max_delay=3)
+        assert all(0 <= policy.get_delay(attempt) <= 3 for attempt in range(1, 10))
+
+    def test_試行回数が1未満の場合ValueErrorが発生すること(self):
+        with pytest.raises(ValueError):
+            RetryPolicy(max_attempts=0)
@@ -0,0 +1,230 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+from notion_client.errors import HTTPResponseError
+from pytest import fixture
+
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.domain.tags import Tags
+from notiontaskr.domain.task_name import TaskName
+from notiontaskr.domain.value_objects.notion_id import NotionId
+from notiontaskr.domain.value_objects.page_id import PageId
+from notiontaskr.domain.value_objects.status import Status
+from notiontaskr.infrastructure.dead_letter_store import DeadLetterStore
+from notiontaskr.infrastructure.retry_policy import RetryPolicy
+from notiontaskr.infrastructure.scheduled_task_repository import (
+    ScheduledTaskRepository,
+)
+from notiontaskr.infrastructure.written_property_store import WrittenPropertyStore
+
+
+class TestScheduledTaskRepository:
+    @fixture
+    def client(self):
+        client = Mock()
+        client.databases.query = AsyncMock(
+            return_value={"results": [], "has_more": False, "next_cursor": None}
+        )
+        client.pages.update = AsyncMock()
+        return client
+
+    @fixture
+    def repo(self, client):
+        client_pool = Mock()
+        client_pool.get = Mock(return_value=client)
+        return ScheduledTaskRepository(
+            "token",
+            "db_id",
+            client_pool=client_pool,
+            retry_policy=RetryPolicy(max_attempts=2, base_delay=0),
+        )
+
+    @fixture
+    def task(self):
+        task = ScheduledTask(
+            page_id=PageId("page_1"),
+            name=TaskName("タスク1"),
+            tags=Tags.from_empty(),
+            id=NotionId("1"),
+            status=Status.IN_PROGRESS,
+        )
+        task.update_status(Status.COMPLETED)
+        return task
+
+    def test_条件検索で非同期クライアントが呼び出されること(self, repo, client):
+        condition = Mock()
+        condition.build = Mock(return_value={})
+
+        asyncio.run(repo.find_by_condition(condition=condition, on_error=Mock()))
+
+        client.databases.query.assert_awaited_once()
+
+    def test_条件検索で次のページがある場合は全ページを取得すること(self, repo, client):
+        client.databases.query = AsyncMock(
+            side_effect=[
+                {"results": [{}], "has_more": True, "next_cursor": "cursor"},
+                {"results": [{}], "has_more": False, "next_cursor": None},
+            ]
+        )
+        condition = Mock()
+        condition.build = Mock(return_value={})
+        on_error = Mock()
+
+        asyncio.run(repo.find_by_condition(condition=condition, on_error=on_error))
+
+        assert client.databases.query.await_count == 2
+        # 不正なレスポンスは両ページ分on_errorに渡される
+        assert on_error.call_count == 2
+
+    def test_更新時に非同期クライアントでページが更新されること(
+        self, repo, client, task
+    ):
+        on_success = Mock()
+
+        asyncio.run(repo.update(task, on_success=on_success, on_error=Mock()))
+
+        client.pages.update.assert_awaited_once()
+        on_success.assert_called_once_with(task)
+
+    def test_複数の更新が並行して実行されること(self, repo, client, task):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def update(**kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        client.pages.update = AsyncMock(side_effect=update)
+
+        async def update_all():
+            await asyncio.gather(
+                *[
+                    repo.update(task, on_success=Mock(), on_error=Mock())
+                    for _ in range(3)
+                ]
+            )
+
+        asyncio.run(update_all())
+
+        assert max_in_flight == 3
+
+    def test_一時的なエラーで更新できなかった場合はデッドレターに退避すること(
+        self, repo, client, task, tmp_path
+    ):
+        repo.dead_letter_store = DeadLetterStore(
+            save_path=os.path.join(tmp_path, "dead_letters.json")
+        )
+        client.pages.update = AsyncMock(
+            side_effect=HTTPResponseError(httpx.Response(status_code=502))
+        )
+        on_error = Mock()
+
+        asyncio.run(repo.update(task, on_success=Mock(), on_error=on_error))
+
+        on_error.assert_called_once()
+        dead_letters = repo.dead_letter_store.pop_all()
+        assert len(dead_letters) == 1
+        assert dead_letters[0].page_id == "page_1"
+        assert client.pages.update.await_count == 2
+
+    def test_デッドレターに更新内容を算出した時点のページの最終更新日時を記録すること(
+        self, repo, client, task, tmp_path
+    ):
+        repo.dead_letter_store = DeadLetterStore(
+            save_path=os.path.join(tmp_path, "dead_letters.json")
+        )
+        task.last_edited_time = "2025-01-01T00:00:00.000Z"
+        client.pages.update = AsyncMock(
+            side_effect=HTTPResponseError(httpx.Response(status_code=502))
+        )
+
+        asyncio.run(repo.update(task, on_success=Mock(), on_error=Mock()))
+
+        assert (
+            repo.dead_letter_store.pop_all()[0].last_edited_time
+            == "2025-01-01T00:00:00.000Z"
+        )
+
+    def test_一時的でないエラーの場合はデッドレターに退避しないこと(
+        self, repo, client, task, tmp_path
+    ):
+        repo.dead_letter_store = DeadLetterStore(
+            save_path=os.path.join(tmp_path, "dead_letters.json")
+        )
+        client.pages.update = AsyncMock(
+            side_effect=HTTPResponseError(httpx.Response(status_code=400))
+        )
+
+        asyncio.run(repo.update(task, on_success=Mock(), on_error=Mock()))
+
+        assert len(repo.dead_letter_store) == 0
+
+    def test_更新内容に記録された項目のみを送信すること(self, repo, client, task):
+        asyncio.run(repo.update(task, on_success=Mock(), on_error=Mock()))
+
+        assert client.pages.update.await_args.kwargs["properties"] == {
+            "ステータス": {"status": {"name": "完了"}}
+        }
+
+    def test_送信する項目が無い場合は更新しないこと(self, repo, client):
+        task = ScheduledTask(
+            page_id=PageId("page_2"),
+            name=TaskName("タスク2"),
+            tags=Tags.from_empty(),
+            id=NotionId("2"),
+            status=Status.IN_PROGRESS,
+        )
+        on_success = Mock()
+
+        asyncio.run(repo.update(task, on_success=on_success, on_error=Mock()))
+
+        client.pages.update.assert_not_awaited()
+        on_success.assert_not_called()
+
+    def test_前回書き込んだ内容と同じ場合は更新を省略すること(
+        self, repo, client, task, tmp_path
+    ):
+        repo.written_property_store = WrittenPropertyStore(
+            save_path=os.path.join(tmp_path, "written_properties.json")
+        )
+        client.pages.update = AsyncMock(
+            return_value={"last_edited_time": "2025-01-01T00:00:00.000Z"}
+        )
+
+        asyncio.run(repo.update(task, on_success=Mock(), on_error=Mock()))
+        asyncio.run(repo.update(task, on_success=Mock(), on_error=Mock()))
+
+        client.pages.update.assert_awaited_once()
+        assert repo.written_property_store.skipped_count == 1
+
+    def test_書き込み後にページが編集された場合は再度更新すること(
+        self, repo, client, task, tmp_path
+    ):
+        repo.written_property_store = WrittenPropertyStore(
+            save_path=os.path.join(tmp_path, "written_properties.json")
+        )
+        client.pages.update = AsyncMock(
+            return_value={"last_edited_time": "2025-01-01T00:00:00.000Z"}
+        )
+        client.databases.query = AsyncMock(
+            return_value={
+                "results": [
+                    {"id": "page_1", "last_edited_time": "2025-01-01T00:05:00.000Z"}
+                ],
+                "has_more": False,
+                "next_cursor": None,
+            }
+        )
+        condition = Mock()
+        condition.build = Mock(return_value={})
+
+        asyncio.run(repo.update(task, on_success=Mock(), on_error=Mock()))
+        asyncio.run(repo.find_by_condition(condition=condition, on_error=Mock()))
+        asyncio.run(repo.update(task, on_success=Mock(), on_error=Mock()))
+
+        assert client.pages.update.await_count == 2
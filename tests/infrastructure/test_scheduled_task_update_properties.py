@@ -0,0 +1,69 @@
+from pytest import fixture
+
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.domain.tags import Tags
+from notiontaskr.domain.task_name import TaskName
+from notiontaskr.domain.value_objects.notion_id import NotionId
+from notiontaskr.domain.value_objects.page_id import PageId
+from notiontaskr.domain.value_objects.progress_rate import ProgressRate
+from notiontaskr.domain.value_objects.status import Status
+from notiontaskr.infrastructure.scheduled_task_update_properties import (
+    ScheduledTaskUpdateProperties,
+)
+from notiontaskr.notifier.task_remind_info import TaskRemindInfo
+
+
+class TestScheduledTaskUpdateProperties:
+    @fixture
+    def task(self):
+        return ScheduledTask(
+            page_id=PageId("page_1"),
+            name=TaskName("タスク1"),
+            tags=Tags.from_empty(),
+            id=NotionId("1"),
+            status=Status.IN_PROGRESS,
+        )
+
+    def test_更新内容が無い場合は空のプロパティを返すこと(self, task):
+        properties = (
+            ScheduledTaskUpdateProperties(task=task).set_updated_contents().build()
+        )
+
+        assert properties == {}
+
+    def test_進捗率のみ更新された場合は進捗率のみを返すこと(self, task):
+        task.update_progress_rate(ProgressRate(0.5))
+
+        properties = (
+            ScheduledTaskUpdateProperties(task=task).set_updated_contents().build()
+        )
+
+        assert properties == {"進捗率": {"number": 0.5}}
+
+    def test_リマインド情報が更新された場合は通知関連の4項目を返すこと(self, task):
+        task.update_remind_info(
+            TaskRemindInfo.from_raw_values(
+                has_before_start=True, raw_before_start_minutes=10
+            )
+        )
+
+        properties = (
+            ScheduledTaskUpdateProperties(task=task).set_updated_contents().build()
+        )
+
+        assert set(properties) == {
+            "開始前通知",
+            "終了前通知",
+            "開始前通知時間(分)",
+            "終了前通知時間(分)",
+        }
+
+    def test_元の値に戻った項目は返さないこと(self, task):
+        task.update_status(Status.COMPLETED)
+        task.update_status(Status.IN_PROGRESS)
+
+        properties = (
+            ScheduledTaskUpdateProperties(task=task).set_updated_contents().build()
+        )
+
+        assert properties == {}
@@ -0,0 +1,91 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+from pytest import fixture
+
+from notiontaskr.domain.executed_task import ExecutedTask
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.infrastructure.operator import TextOperator
+from notiontaskr.infrastructure.task_repository import TaskRepository
+from notiontaskr.infrastructure.task_search_condition import TaskSearchCondition
+
+
+def make_data(number: int, is_scheduled: bool) -> dict:
+    return {
+        "properties": {
+            "ID": {"unique_id": {"number": number}},
+            "予定フラグ": {"checkbox": is_scheduled},
+        }
+    }
+
+
+class TestTaskRepository:
+    @fixture
+    def client(self):
+        client = Mock()
+        client.databases.query = AsyncMock(
+            return_value={"results": [], "has_more": False, "next_cursor": None}
+        )
+        return client
+
+    @fixture
+    def repo(self, client):
+        client_pool = Mock()
+        client_pool.get = Mock(return_value=client)
+        return TaskRepository("token", "db_id", client_pool=client_pool)
+
+    def test_予定フラグで絞り込まずに1回だけ検索すること(self, repo, client):
+        condition = TaskSearchCondition().where_name(
+            operator=TextOperator.CONTAINS, name="タスク"
+        )
+
+        asyncio.run(repo.find_by_condition(condition=condition, on_error=Mock()))
+
+        client.databases.query.assert_awaited_once()
+        assert client.databases.query.await_args.kwargs["filter"] == condition.build()
+
+    @patch.object(ExecutedTask, "from_response_data", side_effect=lambda data: data)
+    @patch.object(ScheduledTask, "from_response_data", side_effect=lambda data: data)
+    def test_予定フラグで予定タスクと実績タスクに振り分けること(
+        self, _scheduled, _executed, repo, client
+    ):
+        client.databases.query = AsyncMock(
+            side_effect=[
+                {
+                    "results": [make_data(1, True), make_data(2, False)],
+                    "has_more": True,
+                    "next_cursor": "cursor",
+                },
+                {
+                    "results": [make_data(3, False)],
+                    "has_more": False,
+                    "next_cursor": None,
+                },
+            ]
+        )
+
+        scheduled_tasks, executed_tasks = asyncio.run(
+            repo.find_by_condition(condition=TaskSearchCondition(), on_error=Mock())
+        )
+
+        assert [
+            t["properties"]["ID"]["unique_id"]["number"] for t in scheduled_tasks
+        ] == [1]
+        assert [
+            t["properties"]["ID"]["unique_id"]["number"] for t in executed_tasks
+        ] == [2, 3]
+
+    def test_予定フラグが無いページはon_errorに渡されること(self, repo, client):
+        data = {"properties": {"ID": {"unique_id": {"number": 1}}}}
+        client.databases.query = AsyncMock(
+            return_value={"results": [data], "has_more": False, "next_cursor": None}
+        )
+        on_error = Mock()
+
+        scheduled_tasks, executed_tasks = asyncio.run(
+            repo.find_by_condition(condition=TaskSearchCondition(), on_error=on_error)
+        )
+
+        assert len(scheduled_tasks) == 0
+        assert len(executed_tasks) == 0
+        assert on_error.call_args.args[1] == data
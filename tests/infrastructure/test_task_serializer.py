@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pytest import fixture
+
+from notiontaskr.domain.executed_task import ExecutedTask
+from notiontaskr.domain.executed_tasks import ExecutedTasks
+from notiontaskr.domain.name_labels.id_label import IdLabel
+from notiontaskr.domain.name_labels.man_hours_label import ManHoursLabel
+from notiontaskr.domain.name_labels.parent_id_label import ParentIdLabel
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.domain.scheduled_tasks import ScheduledTasks
+from notiontaskr.domain.tags import Tags
+from notiontaskr.domain.task_name import TaskName
+from notiontaskr.domain.value_objects.man_hours import ManHours
+from notiontaskr.domain.value_objects.notion_date import NotionDate
+from notiontaskr.domain.value_objects.notion_id import NotionId
+from notiontaskr.domain.value_objects.page_id import PageId
+from notiontaskr.domain.value_objects.parent_task_page_id import ParentTaskPageId
+from notiontaskr.domain.value_objects.progress_rate import ProgressRate
+from notiontaskr.domain.value_objects.scheduled_man_hours import ScheduledManHours
+from notiontaskr.domain.value_objects.scheduled_task_id import ScheduledTaskId
+from notiontaskr.domain.value_objects.scheduled_task_page_id import ScheduledTaskPageId
+from notiontaskr.domain.value_objects.status import Status
+from notiontaskr.domain.value_objects.sub_task_page_ids import SubTaskPageIds
+from notiontaskr.domain.value_objects.tag import Tag
+from notiontaskr.infrastructure.task_serializer import RawCodec, TaskSerializer
+from notiontaskr.notifier.remind_minutes import RemindMinutes
+from notiontaskr.notifier.task_remind_info import TaskRemindInfo
+
+START = datetime(2025, 1, 1, 9, tzinfo=timezone.utc)
+
+
+def make_scheduled_task(number: str) -> ScheduledTask:
+    return ScheduledTask(
+        page_id=PageId(f"page_{number}"),
+        name=TaskName(
+            task_name=f"予定{number}",
+            id_label=IdLabel(key="→", value=number),
+            man_hours_label=ManHoursLabel(key="⏱️", value="1/2"),
+            parent_id_label=ParentIdLabel(key="親", value="9"),
+        ),
+        tags=Tags.from_tags([Tag("開発")]),
+        id=NotionId(number, "T"),
+        status=Status.IN_PROGRESS,
+        remind_info=TaskRemindInfo(
+            before_start_minutes=RemindMinutes(minutes=10),
+            has_before_start=True,
+            has_end=True,
+        ),
+        date=NotionDate(start=START, end=START + timedelta(hours=2)),
+        scheduled_man_hours=ScheduledManHours(2),
+        progress_rate=ProgressRate(0.5),
+        sub_task_page_ids=SubTaskPageIds([PageId("page_sub")]),
+    )
+
+
+def make_executed_task(number: str, scheduled_task: ScheduledTask) -> ExecutedTask:
+    return ExecutedTask(
+        page_id=PageId(f"page_{number}"),
+        name=TaskName(task_name="実績"),
+        tags=Tags.from_empty(),
+        id=NotionId(number),
+        status=Status.COMPLETED,
+        date=NotionDate(start=START, end=START + timedelta(hours=1)),
+        man_hours=ManHours(1),
+        scheduled_task_id=ScheduledTaskId(scheduled_task.id.number),
+        scheduled_task_page_id=ScheduledTaskPageId(scheduled_task.page_id.value),
+    )
+
+
+class TestTaskSerializer:
+    @fixture
+    def tasks(self):
+        parent = make_scheduled_task("1")
+        child = make_scheduled_task("2")
+        child.parent_task_page_id = ParentTaskPageId("page_1")
+        parent.sub_tasks.append(child)
+        executed_task = make_executed_task("11", child)
+        child.executed_tasks.append(executed_task)
+        return ScheduledTasks.from_tasks([parent]), ExecutedTasks.from_tasks(
+            [executed_task]
+        )
+
+    def test_タスクを変換して復元できること(self, tasks):
+        serializer = TaskSerializer(codec=RawCodec())
+        scheduled_task = tasks[0]._tasks[0]
+        executed_task = tasks[1]._tasks[0]
+
+        decoded_scheduled_task = serializer.decode(
+            serializer.encode(scheduled_task)
+        ).task
+        decoded_executed_task = serializer.decode(serializer.encode(executed_task)).task
+
+        assert isinstance(decoded_scheduled_task, ScheduledTask)
+        assert str(decoded_scheduled_task.name) == str(scheduled_task.name)
+        assert decoded_scheduled_task.name == scheduled_task.name
+        assert decoded_scheduled_task.tags == scheduled_task.tags
+        assert decoded_scheduled_task.id == scheduled_task.id
+        assert decoded_scheduled_task.id.prefix == "T"
+        assert decoded_scheduled_task.status == scheduled_task.status
+        assert decoded_scheduled_task.remind_info == scheduled_task.remind_info
+        assert decoded_scheduled_task.remind_info.has_end is True
+        assert decoded_scheduled_task.date == scheduled_task.date
+        assert decoded_scheduled_task.scheduled_man_hours == ScheduledManHours(2)
+        assert decoded_scheduled_task.progress_rate == ProgressRate(0.5)
+        assert list(decoded_scheduled_task.sub_task_page_ids) == [PageId("page_sub")]
+        assert isinstance(decoded_executed_task, ExecutedTask)
+        assert decoded_executed_task.scheduled_task_id == ScheduledTaskId("2")
+        assert decoded_executed_task.scheduled_task_page_id == PageId("page_2")
+        assert decoded_executed_task.man_hours == ManHours(1)
+
+    def test_関連タスクはIDで参照し未更新の状態で復元すること(self, tasks):
+        serializer = TaskSerializer(codec=RawCodec())
+        parent = tasks[0]._tasks[0]
+        parent.update_status(Status.COMPLETED)
+
+        decoded = serializer.decode(serializer.encode(parent))
+
+        assert decoded.sub_task_ids == ["2"]
+        assert len(decoded.task.sub_tasks) == 0  # type: ignore
+        assert decoded.task.is_updated is False
+        assert decoded.task.update_contents.get_updated_keys() == []
+
+    def test_スキーマバージョンが異なる場合はValueErrorを送出すること(self, tasks):
+        serializer = TaskSerializer(codec=RawCodec())
+        data = bytearray(serializer.encode(tasks[0]._tasks[0]))
+        data[2] = TaskSerializer.SCHEMA_VERSION + 1
+
+        with pytest.raises(ValueError):
+            serializer.decode(bytes(data))
+
+    def test_形式が不正な場合はValueErrorを送出すること(self):
+        with pytest.raises(ValueError):
+            TaskSerializer(codec=RawCodec()).decode(b"\x80\x04pickle")
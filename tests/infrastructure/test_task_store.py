@@ -0,0 +1,309 @@
+from contextlib import closing
+from datetime import datetime, timezone
+import os
+import sqlite3
+
+from pytest import fixture
+
+from notiontaskr.domain.executed_task import ExecutedTask
+from notiontaskr.domain.executed_tasks import ExecutedTasks
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.domain.scheduled_tasks import ScheduledTasks
+from notiontaskr.domain.tags import Tags
+from notiontaskr.domain.task_identity_map import TaskIdentityMap
+from notiontaskr.domain.task_name import TaskName
+from notiontaskr.domain.value_objects.notion_date import NotionDate
+from notiontaskr.domain.value_objects.notion_id import NotionId
+from notiontaskr.domain.value_objects.page_id import PageId
+from notiontaskr.domain.value_objects.parent_task_page_id import ParentTaskPageId
+from notiontaskr.domain.value_objects.scheduled_task_id import ScheduledTaskId
+from notiontaskr.domain.value_objects.status import Status
+from notiontaskr.domain.value_objects.tag import Tag
+from notiontaskr.domain.value_objects.man_hours import ManHours
+from notiontaskr.infrastructure.task_store import TaskStore
+
+
+def make_scheduled_task(
+    number: str, name: str, parent_page_id: str | None = None
+) -> ScheduledTask:
+    task = ScheduledTask(
+        page_id=PageId(f"page_{number}"),
+        name=TaskName(name),
+        tags=Tags.from_empty(),
+        id=NotionId(number),
+        status=Status.IN_PROGRESS,
+    )
+    if parent_page_id:
+        task.parent_task_page_id = ParentTaskPageId(parent_page_id)
+    return task
+
+
+def make_executed_task(
+    number: str,
+    scheduled_task_id: str,
+    day: int,
+    tags: list[str] = [],
+    man_hours: float = 0,
+) -> ExecutedTask:
+    return ExecutedTask(
+        page_id=PageId(f"page_{number}"),
+        name=TaskName("実績"),
+        tags=Tags.from_tags([Tag(tag) for tag in tags]),
+        man_hours=ManHours(man_hours),
+        id=NotionId(number),
+        status=Status.COMPLETED,
+        scheduled_task_id=ScheduledTaskId(scheduled_task_id),
+        date=NotionDate(start=datetime(2025, 1, day, tzinfo=timezone.utc), end=None),
+    )
+
+
+class TestTaskStore:
+    @fixture
+    def store(self, tmp_path):
+        store = TaskStore(save_path=os.path.join(tmp_path, "tasks.sqlite3"))
+        store.replace_all(
+            scheduled_tasks=ScheduledTasks.from_tasks(
+                [
+                    make_scheduled_task("1", "親タスク"),
+                    make_scheduled_task("2", "子タスク", parent_page_id="page_1"),
+                    make_scheduled_task("3", "別タスク"),
+                ]
+            ),
+            executed_tasks=ExecutedTasks.from_tasks(
+                [
+                    make_executed_task("11", "2", day=1),
+                    make_executed_task("12", "3", day=10),
+                ]
+            ),
+        )
+        return store
+
+    def test_タスクIDで予定タスクを取得できること(self, store):
+        tasks = store.find_scheduled_tasks_by_ids([NotionId("1"), NotionId("3")])
+
+        assert sorted(task.id.number for task in tasks) == ["1", "3"]
+
+    def test_ページIDと親ページIDで予定タスクを取得できること(self, store):
+        assert [
+            task.id.number
+            for task in store.find_scheduled_tasks_by_page_ids([PageId("page_2")])
+        ] == ["2"]
+        assert [
+            task.id.number
+            for task in store.find_scheduled_tasks_by_parent_page_ids(
+                [PageId("page_1")]
+            )
+        ] == ["2"]
+
+    def test_親タスクを根まで辿って取得できること(self, store):
+        store.upsert(
+            ScheduledTasks.from_tasks(
+                [
+                    make_scheduled_task("4", "孫タスク", parent_page_id="page_2"),
+                    # 循環した関連があっても停止すること
+                    make_scheduled_task("5", "循環A", parent_page_id="page_6"),
+                    make_scheduled_task("6", "循環B", parent_page_id="page_5"),
+                ]
+            )
+        )
+
+        ancestors = store.find_ancestor_scheduled_tasks_by_page_ids(
+            [PageId("page_4"), PageId("page_5")]
+        )
+
+        assert sorted(task.id.number for task in ancestors) == [
+            "1",
+            "2",
+            "4",
+            "5",
+            "6",
+        ]
+
+    def test_タスク名で予定タスクを取得できること(self, store):
+        tasks = store.find_scheduled_tasks_by_names(["別タスク"])
+
+        assert [task.id.number for task in tasks] == ["3"]
+
+    def test_全角半角や空白の違いを無視してタスク名で取得できること(self, store):
+        store.upsert(ScheduledTasks.from_tasks([make_scheduled_task("4", "API 設計")]))
+
+        tasks = store.find_scheduled_tasks_by_names(["ＡＰＩ　 設計 "])
+
+        assert [task.id.number for task in tasks] == ["4"]
+
+    def test_日付の範囲で実績タスクを取得できること(self, store):
+        tasks = store.find_executed_tasks_by_date_range(
+            from_=datetime(2025, 1, 5, tzinfo=timezone.utc),
+            to=datetime(2025, 1, 31, tzinfo=timezone.utc),
+        )
+
+        assert [task.id.number for task in tasks] == ["12"]
+
+    def test_同じタスクIDのタスクは上書きされること(self, store):
+        store.upsert(ScheduledTasks.from_tasks([make_scheduled_task("3", "名前変更")]))
+
+        assert store.count(TaskStore.SCHEDULED) == 3
+        assert len(store.find_scheduled_tasks_by_names(["別タスク"])) == 0
+        assert len(store.find_scheduled_tasks_by_names(["名前変更"])) == 1
+
+    def test_全て置き換えると以前のタスクは削除されること(self, store):
+        store.replace_all(
+            scheduled_tasks=ScheduledTasks.from_tasks(
+                [make_scheduled_task("4", "新規")]
+            ),
+            executed_tasks=ExecutedTasks.from_empty(),
+        )
+
+        assert store.count(TaskStore.SCHEDULED) == 1
+        assert store.count(TaskStore.EXECUTED) == 0
+
+    def test_全て置き換えた際に実績タスクを漏れなく保存している期間を記録すること(
+        self, store
+    ):
+        assert store.get_covered_from() is None
+
+        store.replace_all(
+            scheduled_tasks=ScheduledTasks.from_empty(),
+            executed_tasks=ExecutedTasks.from_empty(),
+            covered_from=datetime(2024, 1, 1, 9, tzinfo=timezone.utc),
+        )
+        assert store.get_covered_from() == datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+
+        store.replace_all(
+            scheduled_tasks=ScheduledTasks.from_empty(),
+            executed_tasks=ExecutedTasks.from_empty(),
+        )
+        assert store.get_covered_from() is None
+
+    def test_別のタスクストアのタスクをマージできること(self, store, tmp_path):
+        other = TaskStore(save_path=os.path.join(tmp_path, "other.sqlite3"))
+        other.upsert(
+            ScheduledTasks.from_tasks(
+                [make_scheduled_task("3", "名前変更"), make_scheduled_task("4", "新規")]
+            )
+        )
+
+        store.merge(other.save_path)
+
+        assert store.count(TaskStore.SCHEDULED) == 4
+        assert len(store.find_scheduled_tasks_by_names(["名前変更"])) == 1
+
+    def test_サブアイテムと実績タスクは参照先を読み込んで紐づけること(self, store):
+        parent = make_scheduled_task("1", "親タスク")
+        child = make_scheduled_task("2", "子タスク", parent_page_id="page_1")
+        grandchild = make_scheduled_task("5", "孫タスク", parent_page_id="page_2")
+        child.sub_tasks.append(grandchild)
+        child.executed_tasks.append(make_executed_task("11", "2", day=1))
+        parent.sub_tasks.append(child)
+        store.upsert(ScheduledTasks.from_tasks([parent, child, grandchild]))
+
+        tasks = store.find_scheduled_tasks_by_ids(["1"])
+
+        loaded_child = tasks._tasks[0].sub_tasks._tasks[0]
+        assert loaded_child.id.number == "2"
+        assert [t.id.number for t in loaded_child.sub_tasks] == ["5"]
+        assert [t.id.number for t in loaded_child.executed_tasks] == ["11"]
+
+    def test_スキーマバージョンが異なるファイルは削除して作り直すこと(self, tmp_path):
+        save_path = os.path.join(tmp_path, "old.sqlite3")
+        with closing(sqlite3.connect(save_path)) as conn, conn:
+            conn.execute("CREATE TABLE tasks (data BLOB)")
+            conn.execute("INSERT INTO tasks VALUES (?)", (b"old",))
+
+        store = TaskStore(save_path=save_path)
+
+        assert store.count(TaskStore.SCHEDULED) == 0
+        store.upsert(ScheduledTasks.from_tasks([make_scheduled_task("1", "新規")]))
+        assert store.count(TaskStore.SCHEDULED) == 1
+
+    def test_識別マップを共有すると同じタスクは同じインスタンスになること(self, store):
+        parent = make_scheduled_task("1", "親タスク")
+        parent.sub_tasks.append(
+            make_scheduled_task("2", "子タスク", parent_page_id="page_1")
+        )
+        store.upsert(ScheduledTasks.from_tasks([parent]))
+        identity_map = TaskIdentityMap()
+
+        parents = store.find_scheduled_tasks_by_ids(["1"], identity_map=identity_map)
+        children = store.find_scheduled_tasks_by_parent_page_ids(
+            [PageId("page_1")], identity_map=identity_map
+        )
+
+        assert parents._tasks[0].sub_tasks._tasks[0] is children._tasks[0]
+        assert identity_map.get_scheduled_task("2") is children._tasks[0]
+
+    class Test_稼働実績の集計表:
+        @fixture
+        def store(self, tmp_path):
+            store = TaskStore(save_path=os.path.join(tmp_path, "tasks.sqlite3"))
+            store.replace_all(
+                scheduled_tasks=ScheduledTasks.from_empty(),
+                executed_tasks=ExecutedTasks.from_tasks(
+                    [
+                        make_executed_task("11", "1", 1, ["a"], man_hours=1.0),
+                        make_executed_task("12", "1", 15, ["a", "b"], man_hours=2.0),
+                        make_executed_task("13", "1", 31, ["b"], man_hours=4.0),
+                    ]
+                ),
+            )
+            return store
+
+        def test_タグごとに期間内の人時を集計できること(self, store):
+            totals = store.sum_uptime_by_tag(
+                [Tag("a"), Tag("b"), Tag("c")],
+                from_=datetime(2025, 1, 1),
+                to=datetime(2025, 1, 15, 23, 59),
+            )
+
+            assert totals == {
+                Tag("a"): ManHours(3.0),
+                Tag("b"): ManHours(2.0),
+                Tag("c"): ManHours(0),
+            }
+
+        def test_実績タスクの更新を差分で反映すること(self, store):
+            store.upsert(
+                ExecutedTasks.from_tasks(
+                    [make_executed_task("12", "1", 15, ["b"], man_hours=5.0)]
+                )
+            )
+
+            totals = store.sum_uptime_by_tag(
+                [Tag("a"), Tag("b")],
+                from_=datetime(2025, 1, 1),
+                to=datetime(2025, 1, 31),
+            )
+
+            assert totals == {Tag("a"): ManHours(1.0), Tag("b"): ManHours(9.0)}
+
+        def test_マージした実績タスクを反映すること(self, store, tmp_path):
+            other = TaskStore(save_path=os.path.join(tmp_path, "other.sqlite3"))
+            other.upsert(
+                ExecutedTasks.from_tasks(
+                    [make_executed_task("11", "1", 2, ["a"], man_hours=0.5)]
+                )
+            )
+
+            store.merge(other.save_path)
+
+            totals = store.sum_uptime_by_tag(
+                [Tag("a")], from_=datetime(2025, 1, 1), to=datetime(2025, 1, 1)
+            )
+            assert totals == {Tag("a"): ManHours(0)}
+            totals = store.sum_uptime_by_tag(
+                [Tag("a")], from_=datetime(2025, 1, 1), to=datetime(2025, 1, 31)
+            )
+            assert totals == {Tag("a"): ManHours(2.5)}
+
+        def test_集計表の無いファイルは保存済みの実績タスクから作成すること(
+            self, store
+        ):
+            with closing(sqlite3.connect(store.save_path)) as conn, conn:
+                conn.execute("DROP TABLE uptime_cube")
+                conn.execute("DROP TABLE uptime_contributions")
+
+            totals = store.sum_uptime_by_tag(
+                [Tag("b")], from_=datetime(2025, 1, 1), to=datetime(2025, 1, 31)
+            )
+
+            assert totals == {Tag("b"): ManHours(6.0)}
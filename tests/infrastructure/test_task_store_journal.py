@@ -0,0 +1,327 @@
+from datetime import datetime, timedelta, timezone
+import os
+import shutil
+
+from unittest.mock import patch
+
+from google.api_core.exceptions import NotModified, PreconditionFailed
+from pytest import fixture
+
+from notiontaskr.domain.executed_tasks import ExecutedTasks
+from notiontaskr.domain.scheduled_task import ScheduledTask
+from notiontaskr.domain.scheduled_tasks import ScheduledTasks
+from notiontaskr.domain.tags import Tags
+from notiontaskr.domain.task_name import TaskName
+from notiontaskr.domain.value_objects.notion_id import NotionId
+from notiontaskr.domain.value_objects.page_id import PageId
+from notiontaskr.domain.value_objects.status import Status
+from notiontaskr.gcs_handler import GCSHandler
+from notiontaskr.infrastructure.task_store import TaskStore
+from notiontaskr.infrastructure.task_store_journal import TaskStoreJournal
+
+
+class LocalGCSHandler:
+    """GCSの代わりにローカルのディレクトリを使用するテスト用ハンドラー"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, path: str) -> str:
+        return os.path.join(self.root, path.lstrip("/"))
+
+    def upload(self, from_: str, to: str, if_generation_match=None):
+        os.makedirs(os.path.dirname(self._path(to)), exist_ok=True)
+        shutil.copyfile(from_, self._path(to))
+
+    def download(self, from_: str, to: str):
+        os.makedirs(os.path.dirname(to), exist_ok=True)
+        shutil.copyfile(self._path(from_), to)
+
+    def get_generation(self, local_path: str, gcs_path: str):
+        return None
+
+    def list(self, prefix: str) -> list[str]:
+        directory = self._path(prefix)
+        if not os.path.exists(directory):
+            return []
+        return sorted(f"{prefix}{name}" for name in os.listdir(directory))
+
+    def delete(self, path: str):
+        os.remove(self._path(path))
+
+
+class FakeBlob:
+    """世代を持つGCSのファイルのテスト用の代替"""
+
+    def __init__(self, bucket: "FakeBucket", name: str):
+        self.bucket = bucket
+        self.name = name
+        self.generation = None
+        self.md5_hash = None
+
+    def upload_from_filename(self, filename: str, if_generation_match=None):
+        current = self.bucket.objects.get(self.name)
+        if if_generation_match is not None and if_generation_match != (
+            current[1] if current else 0
+        ):
+            raise PreconditionFailed("generation mismatch")
+        with open(filename, "rb") as f:
+            content = f.read()
+        self.bucket.generation += 1
+        self.bucket.objects[self.name] = (content, self.bucket.generation)
+        self.generation = self.bucket.generation
+        self.md5_hash = GCSHandler.compute_md5_hash(filename)
+
+    def download_to_filename(self, filename: str, if_generation_not_match=None):
+        content, generation = self.bucket.objects[self.name]
+        self.bucket.downloads.append((self.name, if_generation_not_match))
+        if generation == if_generation_not_match:
+            raise NotModified("not modified")
+        with open(filename, "wb") as f:
+            f.write(content)
+        self.generation = generation
+        self.md5_hash = GCSHandler.compute_md5_hash(filename)
+
+    def delete(self):
+        del self.bucket.objects[self.name]
+
+
+class FakeBucket:
+    def __init__(self):
+        # GCSのパス -> (内容, 世代)
+        self.objects: dict[str, tuple[bytes, int]] = {}
+        self.generation = 0
+        # (GCSのパス, if_generation_not_match)
+        self.downloads: list[tuple[str, object]] = []
+
+    def blob(self, name: str) -> FakeBlob:
+        return FakeBlob(self, name)
+
+    def list_blobs(self, prefix: str) -> list[FakeBlob]:
+        return [
+            FakeBlob(self, name) for name in self.objects if name.startswith(prefix)
+        ]
+
+
+def make_tasks(*numbers: str) -> ScheduledTasks:
+    return ScheduledTasks.from_tasks(
+        [
+            ScheduledTask(
+                page_id=PageId(f"page_{number}"),
+                name=TaskName(f"タスク{number}"),
+                tags=Tags.from_empty(),
+                id=NotionId(number),
+                status=Status.IN_PROGRESS,
+            )
+            for number in numbers
+        ]
+    )
+
+
+class TestTaskStoreJournal:
+    @fixture
+    def gcs_handler(self, tmp_path):
+        return LocalGCSHandler(root=os.path.join(tmp_path, "bucket"))
+
+    def make_journal(self, tmp_path, gcs_handler, name: str, compaction_deltas=60):
+        return TaskStoreJournal(
+            store=TaskStore(save_path=os.path.join(tmp_path, name, "tasks.sqlite3")),
+            gcs_handler=gcs_handler,
+            bucket_snapshot_path="/cache/tasks.sqlite3",
+            local_snapshot_path=os.path.join(tmp_path, name, "tasks.snapshot.sqlite3"),
+            bucket_delta_dir="/cache/task_deltas/",
+            local_delta_dir=os.path.join(tmp_path, name, "task_deltas"),
+            compaction_deltas=compaction_deltas,
+        )
+
+    def test_スナップショットに差分ファイルを適用して読み込めること(
+        self, tmp_path, gcs_handler
+    ):
+        daily = self.make_journal(tmp_path, gcs_handler, "daily")
+        daily.replace_all(
+            make_tasks("1", "2"),
+            ExecutedTasks.from_empty(),
+            fetched_at=datetime.now(timezone.utc),
+        )
+        regular = self.make_journal(tmp_path, gcs_handler, "regular")
+        regular.load()
+        regular.append(make_tasks("3"), ExecutedTasks.from_empty())
+
+        loader = self.make_journal(tmp_path, gcs_handler, "loader")
+        applied_count = loader.load()
+
+        assert applied_count == 1
+        assert loader.store.count(TaskStore.SCHEDULED) == 3
+        # スナップショットは書き換えずに差分ファイルのみアップロードされる
+        assert len(gcs_handler.list("/cache/task_deltas/")) == 1
+
+    def test_他の実行が差分ファイルを追加すると読み込み後の世代が変わること(
+        self, tmp_path, gcs_handler
+    ):
+        daily = self.make_journal(tmp_path, gcs_handler, "daily")
+        daily.replace_all(
+            make_tasks("1"),
+            ExecutedTasks.from_empty(),
+            fetched_at=datetime.now(timezone.utc),
+        )
+        loader = self.make_journal(tmp_path, gcs_handler, "loader")
+        loader.load()
+        generation = loader.generation
+
+        loader.load()
+        assert loader.generation == generation
+
+        regular = self.make_journal(tmp_path, gcs_handler, "regular")
+        regular.load()
+        regular.append(make_tasks("2"), ExecutedTasks.from_empty())
+        loader.load()
+        assert loader.generation != generation
+
+    def test_スナップショットが変わっていない場合は読み込み直してもダウンロードしないこと(
+        self, tmp_path
+    ):
+        bucket = FakeBucket()
+        with patch("notiontaskr.gcs_handler.storage.Client") as client:
+            client.return_value.bucket.return_value = bucket
+            gcs_handler = GCSHandler(bucket_name="bucket", on_error=lambda e: None)
+        daily = self.make_journal(tmp_path, gcs_handler, "daily")
+        daily.replace_all(
+            make_tasks("1"),
+            ExecutedTasks.from_empty(),
+            fetched_at=datetime.now(timezone.utc),
+        )
+        regular = self.make_journal(tmp_path, gcs_handler, "regular")
+        regular.load()
+        regular.append(make_tasks("2"), ExecutedTasks.from_empty())
+
+        loader = self.make_journal(tmp_path, gcs_handler, "loader")
+        loader.load()
+        bucket.downloads.clear()
+        loader.load()
+
+        snapshot_generation = bucket.objects["/cache/tasks.sqlite3"][1]
+        # 差分ファイルを適用したタスクストアとは別に保持したスナップショットの世代で判定する
+        assert ("/cache/tasks.sqlite3", snapshot_generation) in bucket.downloads
+        assert loader.store.count(TaskStore.SCHEDULED) == 2
+
+    def test_差分ファイルが一定数に達したらスナップショットに統合すること(
+        self, tmp_path, gcs_handler
+    ):
+        daily = self.make_journal(tmp_path, gcs_handler, "daily")
+        daily.replace_all(
+            make_tasks("1"),
+            ExecutedTasks.from_empty(),
+            fetched_at=datetime.now(timezone.utc),
+        )
+        regular = self.make_journal(
+            tmp_path, gcs_handler, "regular", compaction_deltas=2
+        )
+        regular.load()
+        regular.append(make_tasks("2"), ExecutedTasks.from_empty())
+        regular.append(make_tasks("3"), ExecutedTasks.from_empty())
+
+        assert gcs_handler.list("/cache/task_deltas/") == []
+        loader = self.make_journal(tmp_path, gcs_handler, "loader")
+        loader.load()
+        assert loader.store.count(TaskStore.SCHEDULED) == 3
+
+    def test_読み込み後に他の実行が差分ファイルを追加した場合は統合しないこと(
+        self, tmp_path, gcs_handler
+    ):
+        daily = self.make_journal(tmp_path, gcs_handler, "daily")
+        daily.replace_all(
+            make_tasks("1"),
+            ExecutedTasks.from_empty(),
+            fetched_at=datetime.now(timezone.utc),
+        )
+        regular = self.make_journal(
+            tmp_path, gcs_handler, "regular", compaction_deltas=2
+        )
+        regular.load()
+        other = self.make_journal(tmp_path, gcs_handler, "other")
+        other.load()
+        other.append(make_tasks("2"), ExecutedTasks.from_empty())
+
+        # 他の実行の差分ファイルより新しい内容で更新する
+        renamed_tasks = make_tasks("2")
+        renamed_tasks._tasks[0].name = TaskName("新しい名前")
+        regular.append(renamed_tasks, ExecutedTasks.from_empty())
+        regular.append(make_tasks("3"), ExecutedTasks.from_empty())
+
+        assert len(gcs_handler.list("/cache/task_deltas/")) == 3
+        loader = self.make_journal(tmp_path, gcs_handler, "loader")
+        loader.load()
+        assert len(loader.store.find_scheduled_tasks_by_names(["新しい名前"])) == 1
+
+    def test_全件置き換え時は取得日時より前の差分ファイルのみ削除すること(
+        self, tmp_path, gcs_handler
+    ):
+        regular = self.make_journal(tmp_path, gcs_handler, "regular")
+        regular.append(make_tasks("1"), ExecutedTasks.from_empty())
+
+        daily = self.make_journal(tmp_path, gcs_handler, "daily")
+        daily.replace_all(
+            make_tasks("2"),
+            ExecutedTasks.from_empty(),
+            fetched_at=datetime.now(timezone.utc) + timedelta(seconds=1),
+        )
+        assert gcs_handler.list("/cache/task_deltas/") == []
+
+        regular.append(make_tasks("3"), ExecutedTasks.from_empty())
+        daily.replace_all(
+            make_tasks("2"),
+            ExecutedTasks.from_empty(),
+            fetched_at=datetime.now(timezone.utc) - timedelta(seconds=1),
+        )
+        assert len(gcs_handler.list("/cache/task_deltas/")) == 1
+
+    def test_GCSハンドラーが無い場合はローカルのタスクストアのみ更新すること(
+        self, tmp_path
+    ):
+        journal = self.make_journal(tmp_path, None, "local")
+
+        assert journal.load() == 0
+        journal.append(make_tasks("1"), ExecutedTasks.from_empty())
+
+        assert journal.store.count(TaskStore.SCHEDULED) == 1
+
+    def test_アップロードを遅らせた更新はflushで1つの差分ファイルにまとめること(
+        self, tmp_path, gcs_handler
+    ):
+        daily = self.make_journal(tmp_path, gcs_handler, "daily")
+        daily.replace_all(
+            make_tasks("1"),
+            ExecutedTasks.from_empty(),
+            fetched_at=datetime.now(timezone.utc),
+        )
+        regular = self.make_journal(tmp_path, gcs_handler, "regular")
+        regular.load()
+        regular.append(make_tasks("2"), ExecutedTasks.from_empty(), uploads=False)
+        regular.append(make_tasks("2", "3"), ExecutedTasks.from_empty(), uploads=False)
+
+        assert regular.store.count(TaskStore.SCHEDULED) == 3
+        assert gcs_handler.list("/cache/task_deltas/") == []
+
+        assert regular.flush() == 2
+        assert regular.flush() == 0
+        assert len(gcs_handler.list("/cache/task_deltas/")) == 1
+        loader = self.make_journal(tmp_path, gcs_handler, "loader")
+        loader.load()
+        assert loader.store.count(TaskStore.SCHEDULED) == 3
+
+    def test_読み込み直してもアップロードを遅らせた更新は残ること(
+        self, tmp_path, gcs_handler
+    ):
+        daily = self.make_journal(tmp_path, gcs_handler, "daily")
+        daily.replace_all(
+            make_tasks("1"),
+            ExecutedTasks.from_empty(),
+            fetched_at=datetime.now(timezone.utc),
+        )
+        regular = self.make_journal(tmp_path, gcs_handler, "regular")
+        regular.load()
+        regular.append(make_tasks("2"), ExecutedTasks.from_empty(), uploads=False)
+
+        regular.load()
+
+        assert regular.store.count(TaskStore.SCHEDULED) == 2
@@ -0,0 +1,50 @@
+import os
+
+from pytest import fixture
+
+from notiontaskr.infrastructure.written_property_store import WrittenPropertyStore
+
+
+class TestWrittenPropertyStore:
+    @fixture
+    def store(self, tmp_path):
+        return WrittenPropertyStore(
+            save_path=os.path.join(tmp_path, "written_properties.json")
+        )
+
+    def test_記録したプロパティと同じ場合は書き込み済みと判定すること(self, store):
+        store.record("page_1", {"進捗率": {"number": 0.5}}, "2025-01-01T00:00:00.000Z")
+
+        assert store.is_written("page_1", {"進捗率": {"number": 0.5}})
+        assert not store.is_written("page_1", {"進捗率": {"number": 0.6}})
+        assert not store.is_written("page_2", {"進捗率": {"number": 0.5}})
+
+    def test_丸め誤差やキーの順序の違いは同一とみなすこと(self):
+        assert WrittenPropertyStore.compute_hash(
+            {"人時(実)": {"number": 0.1 + 0.2}, "人時(予)": {"number": 2}}
+        ) == WrittenPropertyStore.compute_hash(
+            {"人時(予)": {"number": 2.0}, "人時(実)": {"number": 0.3}}
+        )
+
+    def test_書き込み後に編集されたページの記録を破棄すること(self, store):
+        store.record("page_1", {}, "2025-01-01T00:00:00.000Z")
+        store.record("page_2", {}, "2025-01-01T00:00:00.000Z")
+
+        store.verify({"id": "page_1", "last_edited_time": "2025-01-01T00:05:00.000Z"})
+        store.verify({"id": "page_2", "last_edited_time": "2025-01-01T00:00:00.000Z"})
+
+        assert not store.is_written("page_1", {})
+        assert store.is_written("page_2", {})
+
+    def test_保存した記録を読み込めること(self, store):
+        store.record("page_1", {"進捗率": {"number": 0.5}}, None)
+        store.save()
+
+        loaded_store = WrittenPropertyStore(save_path=store.save_path)
+        loaded_store.load()
+
+        assert loaded_store.is_written("page_1", {"進捗率": {"number": 0.5}})
+
+    def test_ファイルが存在しない場合は空になること(self, store):
+        store.load()
+        assert len(store) == 0
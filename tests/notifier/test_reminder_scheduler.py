@@ -0,0 +1,163 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock
+
+from notiontaskr.domain.task import Task
+from notiontaskr.domain.value_objects.notion_date import NotionDate
+from notiontaskr.domain.value_objects.page_id import PageId
+from notiontaskr.notifier.remind_minutes import RemindMinutes
+from notiontaskr.notifier.reminder_scheduler import ReminderScheduler
+from notiontaskr.notifier.task_remind_info import TaskRemindInfo
+from notiontaskr.notifier.task_reminder import ReminderKind, TaskReminder
+
+NOW = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class FakeClock:
+    def __init__(self, now: datetime = NOW):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def make_task(page_id: str, start: datetime, before_start_minutes: int = 10) -> Task:
+    task = Task(
+        page_id=PageId(page_id),
+        name=Mock(),
+        tags=Mock(),
+        id=Mock(),
+        status=Mock(),
+        remind_info=TaskRemindInfo(
+            before_start_minutes=RemindMinutes(minutes=before_start_minutes),
+            has_before_start=True,
+        ),
+    )
+    task.date = NotionDate(start=start, end=start + timedelta(hours=1))
+    return task
+
+
+def create_scheduler(clock=None):
+    reminder = TaskReminder(notifier=Mock())
+    return ReminderScheduler(reminder=reminder, clock=clock or FakeClock())
+
+
+class TestReminderScheduler:
+    def test_通知日時を過ぎたリマインドを通知日時の順に取り出すこと(self):
+        clock = FakeClock()
+        scheduler = create_scheduler(clock)
+        later = make_task("page_1", NOW + timedelta(minutes=40))
+        earlier = make_task("page_2", NOW + timedelta(minutes=35))
+        scheduler.update_tasks([later, earlier])
+
+        assert scheduler.pop_due() == []
+        assert scheduler.get_next_fire_at() == NOW + timedelta(minutes=25)
+
+        clock.now = NOW + timedelta(minutes=30)
+        assert scheduler.pop_due() == [
+            (earlier, ReminderKind.BEFORE_START),
+            (later, ReminderKind.BEFORE_START),
+        ]
+        assert len(scheduler) == 0
+
+    def test_通知済みのリマインドは登録し直しても通知しないこと(self):
+        clock = FakeClock()
+        scheduler = create_scheduler(clock)
+        task = make_task("page_1", NOW + timedelta(minutes=10))
+        scheduler.update_task(task)
+
+        assert len(scheduler.pop_due()) == 1
+        scheduler.update_task(task)
+
+        assert len(scheduler) == 0
+        assert scheduler.pop_due() == []
+
+    def test_通知日時が変わったタスクは新しい通知日時のみで通知すること(self):
+        clock = FakeClock()
+        scheduler = create_scheduler(clock)
+        task = make_task("page_1", NOW + timedelta(minutes=20))
+        scheduler.update_task(task)
+        moved = make_task("page_1", NOW + timedelta(minutes=60))
+        scheduler.update_task(moved)
+
+        clock.now = NOW + timedelta(minutes=15)
+        assert scheduler.pop_due() == []
+        assert scheduler.get_next_fire_at() == NOW + timedelta(minutes=50)
+
+        clock.now = NOW + timedelta(minutes=50)
+        assert scheduler.pop_due() == [(moved, ReminderKind.BEFORE_START)]
+
+    def test_リマインドが無くなったタスクは通知しないこと(self):
+        clock = FakeClock()
+        scheduler = create_scheduler(clock)
+        task = make_task("page_1", NOW + timedelta(minutes=20))
+        scheduler.update_task(task)
+        task.remind_info = TaskRemindInfo.from_empty()
+        scheduler.update_task(task)
+
+        clock.now = NOW + timedelta(hours=1)
+        assert scheduler.pop_due() == []
+
+    def test_猶予を過ぎたリマインドは通知せずに破棄すること(self):
+        clock = FakeClock()
+        scheduler = create_scheduler(clock)
+        scheduler.update_task(make_task("page_1", NOW - timedelta(hours=1)))
+        assert len(scheduler) == 0
+
+        scheduler.update_task(make_task("page_2", NOW + timedelta(minutes=20)))
+        clock.now = NOW + timedelta(hours=1)
+        assert scheduler.pop_due() == []
+
+    def test_登録エラーはタスクごとに通知すること(self):
+        scheduler = create_scheduler()
+        invalid_task = Mock(page_id=PageId("page_1"), date=Mock(start=None))
+        on_error = Mock()
+
+        scheduler.update_tasks(
+            [invalid_task, make_task("page_2", NOW + timedelta(minutes=20))],
+            on_error=on_error,
+        )
+
+        on_error.assert_called_once()
+        assert len(scheduler) == 1
+
+    def test_通知日時になるまで待ってから通知すること(self):
+        scheduler = ReminderScheduler(reminder=TaskReminder(notifier=Mock()))
+        scheduler.reminder.notifier.notify = AsyncMock()
+        on_success = Mock()
+
+        async def run():
+            runner = asyncio.ensure_future(
+                scheduler.run(on_success=on_success, on_error=Mock())
+            )
+            await asyncio.sleep(0)
+            # 実行中に登録したリマインドも通知する
+            task = make_task(
+                "page_1",
+                datetime.now(timezone.utc) + timedelta(seconds=0.05),
+                before_start_minutes=0,
+            )
+            scheduler.update_task(task)
+            await asyncio.sleep(0.01)
+            notified_early = scheduler.reminder.notifier.notify.await_count
+            await asyncio.sleep(0.1)
+            scheduler.stop()
+            await asyncio.wait_for(runner, timeout=1)
+            return task, notified_early
+
+        task, notified_early = asyncio.run(run())
+
+        assert notified_early == 0
+        scheduler.reminder.notifier.notify.assert_awaited_once()
+        on_success.assert_called_once_with(task)
+
+    def test_起動前の通知日時のリマインドは通知しないこと(self):
+        clock = FakeClock()
+        scheduler = create_scheduler(clock)
+        # 猶予時間内だが、前回の起動で通知済みの可能性がある
+        before_started = make_task("page_1", NOW + timedelta(minutes=5))
+        after_started = make_task("page_2", NOW + timedelta(minutes=15))
+        scheduler.update_tasks([before_started, after_started])
+
+        clock.now = NOW + timedelta(minutes=5)
+        assert scheduler.pop_due() == [(after_started, ReminderKind.BEFORE_START)]
@@ -9,7 +9,7 @@ from notiontaskr.domain.value_objects.notion_date import NotionDate
 from notiontaskr.notifier.notifiable import Notifiable
 from notiontaskr.notifier.remind_minutes import RemindMinutes
 from notiontaskr.notifier.task_remind_info import TaskRemindInfo
-from notiontaskr.notifier.task_reminder import TaskReminder
+from notiontaskr.notifier.task_reminder import ReminderKind, TaskReminder
 
 
 class TestTaskReminder:
@@ -102,6 +102,43 @@ class TestTaskReminder:
 
             on_error.assert_called()
 
+    class Test_期間内のリマインドを実行:
+        def test_リマインド日時が期間内の種類のみリマインドを送ること(
+            self, mock_notifier: Notifiable
+        ):
+            mock_notifier.notify = AsyncMock()
+            reminder = TaskReminder(notifier=mock_notifier)
+            task = Task(
+                page_id=Mock(),
+                name=Mock(),
+                tags=Mock(),
+                id=Mock(),
+                status=Mock(),
+                remind_info=TaskRemindInfo(
+                    before_start_minutes=RemindMinutes(minutes=30),
+                    has_before_start=True,
+                    has_end=True,
+                ),
+            )
+            task.date = NotionDate(
+                start=datetime(2023, 10, 1, 12, 0), end=datetime(2023, 10, 1, 13, 0)
+            )
+            reminder.get_message = Mock(side_effect=lambda task, kind: kind.value)
+            on_success = Mock()
+
+            asyncio.run(
+                reminder.remind_between(
+                    [task],
+                    from_=datetime(2023, 10, 1, 11, 0, tzinfo=timezone.utc),
+                    to=datetime(2023, 10, 1, 12, 0, tzinfo=timezone.utc),
+                    on_success=on_success,
+                    on_error=Mock(),
+                )
+            )
+
+            mock_notifier.notify.assert_awaited_once_with(message="before_start")
+            on_success.assert_called_once_with(task)
+
     class Test_リマインド時刻を取得:
         def test_開始前リマインド日時を取得すること(self):
             task = Task(
@@ -139,6 +176,30 @@ class TestTaskReminder:
                 2023, 10, 1, 11, 30, tzinfo=timezone.utc
             )
 
+        def test_リマインドする種類ごとのリマインド日時を取得すること(self):
+            task = Task(
+                page_id=Mock(),
+                name=Mock(),
+                tags=Mock(),
+                id=Mock(),
+                status=Mock(),
+                remind_info=TaskRemindInfo(
+                    before_start_minutes=RemindMinutes(minutes=30),
+                    has_before_start=True,
+                    has_end=True,
+                ),
+            )
+            task.date = NotionDate(
+                start=datetime(2023, 10, 1, 12, 0), end=datetime(2023, 10, 1, 13, 0)
+            )
+
+            assert TaskReminder.get_remind_dts(task) == {
+                ReminderKind.BEFORE_START: datetime(
+                    2023, 10, 1, 11, 30, tzinfo=timezone.utc
+                ),
+                ReminderKind.END: datetime(2023, 10, 1, 13, 0, tzinfo=timezone.utc),
+            }
+
     class Test_リマインド時刻の判定:
         def test_開始前リマインド時刻が現在のときTrueを返す(self):
             task = Task(
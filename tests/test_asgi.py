@@ -0,0 +1,153 @@
+import asyncio
+from datetime import datetime
+import json
+from unittest.mock import AsyncMock, Mock
+
+from notiontaskr.application.dto.uptime_data import UptimeData, UptimeDataByTag
+from notiontaskr.asgi import AsgiApp
+from notiontaskr.domain.value_objects.tag import Tag
+
+
+async def request_async(
+    app: AsgiApp, path: str, query_string: bytes = b"", method="GET"
+):
+    """ASGIアプリケーションにリクエストを送り、(ステータスコード, 本文)を返す"""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(
+        {
+            "type": "http",
+            "path": path,
+            "method": method,
+            "query_string": query_string,
+        },
+        receive,
+        send,
+    )
+    return messages[0]["status"], messages[1]["body"].decode("utf-8")
+
+
+def request(app: AsgiApp, path: str, query_string: bytes = b"", method="GET"):
+    return asyncio.run(request_async(app, path, query_string, method))
+
+
+class TestAsgiApp:
+    def create_app(self):
+        service = Mock()
+        service.get_uptime = AsyncMock(
+            return_value=UptimeDataByTag.from_data(
+                UptimeData.from_domain(
+                    tag=Tag("tag1"),
+                    uptime=1.5,  # type: ignore
+                    from_=datetime(2024, 12, 1),
+                    to=datetime(2024, 12, 31),
+                )
+            )
+        )
+        service.daily_task = AsyncMock()
+        service_factory = Mock(return_value=service)
+        return AsgiApp(service_factory=service_factory), service, service_factory
+
+    def test_月の稼働実績を取得できること(self):
+        app, service, _ = self.create_app()
+
+        status, body = request(
+            app, "/uptime_from_month", b"tags=tag1&tags=tag2&year=2024&month=12"
+        )
+
+        assert status == 200
+        assert json.loads(body)["tag1"]["合計工数"] == "1.5h"
+        kwargs = service.get_uptime.call_args.kwargs
+        assert [str(tag) for tag in kwargs["tags"]] == ["tag1", "tag2"]
+        assert kwargs["from_"] == datetime(2024, 12, 1)
+        assert kwargs["to"] == datetime(2024, 12, 31, 23, 59)
+
+    def test_開始月から終了月の稼働実績を取得できること(self):
+        app, service, _ = self.create_app()
+
+        status, _ = request(
+            app,
+            "/uptime_from_start_end",
+            b"tags=tag1&start_year=2024&start_month=12&end_year=2025&end_month=1",
+        )
+
+        assert status == 200
+        kwargs = service.get_uptime.call_args.kwargs
+        assert kwargs["from_"] == datetime(2024, 12, 1)
+        assert kwargs["to"] == datetime(2025, 1, 31, 23, 59)
+
+    def test_パラメータが不足している場合は400を返すこと(self):
+        app, service, _ = self.create_app()
+
+        status, _ = request(app, "/uptime_from_month", b"tags=tag1&year=2024")
+
+        assert status == 400
+        service.get_uptime.assert_not_called()
+
+    def test_存在しないパスは404を返すこと(self):
+        app, _, _ = self.create_app()
+
+        status, _ = request(app, "/unknown")
+
+        assert status == 404
+
+    def test_処理に失敗した場合は500を返すこと(self):
+        app, service, _ = self.create_app()
+        service.get_uptime.side_effect = Exception("error")
+
+        status, _ = request(app, "/uptime_from_month", b"tags=tag1&year=2024&month=12")
+
+        assert status == 500
+
+    def test_デイリータスクを開始してジョブの状態を取得できること(self):
+        app, service, _ = self.create_app()
+
+        async def run():
+            # 同じイベントループでジョブを完了させる
+            status, body = await request_async(app, "/run-daily-task")
+            job_id = json.loads(body)["job_id"]
+            await asyncio.sleep(0)
+            return (
+                status,
+                job_id,
+                await request_async(
+                    app, "/daily-task-status", f"job_id={job_id}".encode()
+                ),
+            )
+
+        status, job_id, (status_code, body) = asyncio.run(run())
+
+        assert status == 202
+        assert status_code == 200
+        assert json.loads(body)["job_id"] == job_id
+        assert json.loads(body)["status"] == "succeeded"
+        service.daily_task.assert_awaited_once()
+
+    def test_存在しないジョブの状態は404を返すこと(self):
+        app, _, _ = self.create_app()
+
+        status, _ = request(app, "/daily-task-status", b"job_id=unknown")
+
+        assert status == 404
+
+    def test_サービスはリクエスト間で共有されること(self):
+        app, _, service_factory = self.create_app()
+
+        request(app, "/uptime_from_month", b"tags=tag1&year=2024&month=12")
+        request(app, "/uptime_from_month", b"tags=tag1&year=2024&month=11")
+
+        service_factory.assert_called_once()
+
+    def test_トップページを表示できること(self):
+        app, _, _ = self.create_app()
+
+        status, body = request(app, "/")
+
+        assert status == 200
+        assert "<h1>Notion API</h1>" in body
@@ -0,0 +1,82 @@
+import os
+from unittest.mock import Mock, patch
+
+from google.api_core.exceptions import NotModified
+from pytest import fixture
+
+from notiontaskr.gcs_handler import GCSHandler
+
+
+class TestGCSHandler:
+    @fixture
+    def blob(self):
+        def download_to_filename(filename, **kwargs):
+            with open(filename, "wb") as f:
+                f.write(b"content")
+            blob.generation = 1
+            blob.md5_hash = GCSHandler.compute_md5_hash(filename)
+
+        blob = Mock()
+        blob.download_to_filename = Mock(side_effect=download_to_filename)
+        return blob
+
+    @fixture
+    def handler(self, blob):
+        with patch("notiontaskr.gcs_handler.storage.Client") as client:
+            client.return_value.bucket.return_value.blob.return_value = blob
+            return GCSHandler(bucket_name="bucket", on_error=Mock())
+
+    def test_初期化に失敗した場合は利用できない状態になること(self):
+        on_error = Mock()
+        with patch("notiontaskr.gcs_handler.storage.Client") as client:
+            client.side_effect = Exception("認証エラー")
+            handler = GCSHandler(bucket_name="bucket", on_error=on_error)
+
+        assert handler.is_available is False
+        on_error.assert_called_once()
+
+    def test_初期化に成功した場合は利用できる状態になること(self, handler):
+        assert handler.is_available is True
+
+    def test_ダウンロードしたファイルの世代を記録すること(self, handler, tmp_path):
+        path = os.path.join(tmp_path, "tasks.sqlite3")
+
+        assert handler.download(from_="/cache/tasks.sqlite3", to=path)
+
+        assert handler.get_generation(path, "/cache/tasks.sqlite3") == 1
+
+    def test_GCS上のファイルが変更されていない場合はローカルのファイルを残すこと(
+        self, handler, blob, tmp_path
+    ):
+        path = os.path.join(tmp_path, "tasks.sqlite3")
+        handler.download(from_="/cache/tasks.sqlite3", to=path)
+        blob.download_to_filename = Mock(side_effect=NotModified("not modified"))
+
+        assert not handler.download(from_="/cache/tasks.sqlite3", to=path)
+
+        assert blob.download_to_filename.call_args.kwargs == {
+            "if_generation_not_match": 1
+        }
+        with open(path, "rb") as f:
+            assert f.read() == b"content"
+
+    def test_ローカルのファイルが変更された場合は世代を返さないこと(
+        self, handler, tmp_path
+    ):
+        path = os.path.join(tmp_path, "tasks.sqlite3")
+        handler.download(from_="/cache/tasks.sqlite3", to=path)
+        with open(path, "ab") as f:
+            f.write(b"modified")
+
+        assert handler.get_generation(path, "/cache/tasks.sqlite3") is None
+
+    def test_世代を指定してアップロードできること(self, handler, blob, tmp_path):
+        path = os.path.join(tmp_path, "tasks.sqlite3")
+        with open(path, "wb") as f:
+            f.write(b"content")
+        blob.generation = 4
+        blob.md5_hash = GCSHandler.compute_md5_hash(path)
+
+        handler.upload(from_=path, to="/cache/tasks.sqlite3", if_generation_match=3)
+
+        blob.upload_from_filename.assert_called_once_with(path, if_generation_match=3)
@@ -2,6 +2,7 @@ from datetime import datetime
 
 from notiontaskr.util.converter import (
     dt_to_month_start_end,
+    normalize_task_name,
     remove_variant_selectors,
     timedelta_to_minutes,
     to_isoformat,
@@ -65,3 +66,11 @@ class Test_timedelta_to_minutes:
         td = "30 minutes"
         with pytest.raises(ValueError):
             timedelta_to_minutes(td)  # type: ignore
+
+
+class Test_normalize_task_name:
+    def test_全角半角を統一し空白をまとめること(self):
+        assert normalize_task_name(" ＡＰＩ　設計\t レビュー ") == "API 設計 レビュー"
+
+    def test_半角カナは全角に統一すること(self):
+        assert normalize_task_name("ﾃｽﾄ") == "テスト"